@@ -0,0 +1,72 @@
+import sys
+sys.path.append('.')
+
+import asyncio
+import random
+import time
+import pandas as pd
+from loguru import logger
+from src.api import main as api
+from src.api.coalescer import RequestCoalescer
+from src.api.schemas import PredictionRequest
+
+
+async def burst(submit, n_clients: int, requests_per_client: int) -> list:
+    """Concurrent clients each sending single-series forecasts back to back."""
+    latencies = []
+
+    async def client(seed: int):
+        rng = random.Random(seed)
+        for _ in range(requests_per_client):
+            request = PredictionRequest(
+                last_quantity=rng.uniform(10, 1000), current_month=rng.randint(1, 12), periods=12
+            )
+            start = time.perf_counter()
+            await submit(request)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[client(seed) for seed in range(n_clients)])
+    return latencies
+
+
+def run(model, n_clients: int, requests_per_client: int, max_batch_size: int, window_ms: float) -> dict:
+    coalescer = RequestCoalescer(api.forecast_coalesced, max_batch_size=max_batch_size, max_wait=window_ms / 1000)
+
+    async def submit(request):
+        return await coalescer.submit(model, request)
+
+    start = time.perf_counter()
+    latencies = pd.Series(asyncio.run(burst(submit, n_clients, requests_per_client))) * 1000
+    elapsed = time.perf_counter() - start
+    stats = coalescer.stats()
+    return {
+        'clients': n_clients,
+        'max_batch': max_batch_size,
+        'window_ms': window_ms,
+        'mean_batch': round(stats['mean_batch_size'], 1),
+        'requests_per_s': round(stats['requests'] / elapsed),
+        'p50_ms': round(latencies.quantile(0.5), 2),
+        'p99_ms': round(latencies.quantile(0.99), 2)
+    }
+
+
+def main(requests_per_client: int = 50):
+    """
+    Throughput and latency of single-series forecasts under concurrent load,
+    with the coalescer off (max batch 1) and on, through the API's worker pool
+    but without HTTP, so only the inference path is measured.
+    """
+    logger.remove()
+    model = api.registry.get()
+
+    rows = []
+    for n_clients in (1, 8, 32):
+        for max_batch_size, window_ms in ((1, 0.0), (64, 2.0), (64, 5.0)):
+            rows.append(run(model, n_clients, requests_per_client, max_batch_size, window_ms))
+
+    results_df = pd.DataFrame(rows)
+    print(results_df.to_string(index=False))
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
@@ -0,0 +1,89 @@
+import sys
+sys.path.append('.')
+
+import time
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.model_selection import train_test_split
+from src.data.features import grouped_leads, monthly_leads
+from src.data.loader import read_table
+from src.data.processor import DataProcessor
+from src.models.xgboost_forecaster import XGBoostForecaster
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+STATE_COLUMNS = ['quantity', 'lag_1', 'posting_month', 'rate', 'u_frt']
+
+
+def best_time(func, repeats: int = 5) -> float:
+    """Fastest of ``repeats`` runs, in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(batch_sizes=(1, 64, 1024), periods: int = 12):
+    """
+    Latency of the direct strategy against the recursive one, and the accuracy of each.
+
+    The two strategies predict different quantities: the recursive model the
+    entity's next order quantities, the direct model its total quantity in
+    each following calendar month. Each is scored against its own target,
+    as the MAE per horizon over the origins held out by both ``fit`` and
+    ``fit_direct``, so the two rows are not comparable with each other.
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    processed = DataProcessor().process(read_table(DATA_PATH))
+    model = XGBoostForecaster()
+    start = time.perf_counter()
+    model.fit(processed)
+    recursive_fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    model.fit_direct(processed, periods=periods)
+    direct_fit_s = time.perf_counter() - start
+    print(f"Training: recursive model {recursive_fit_s:.2f}s, direct model with {periods} outputs {direct_fit_s:.2f}s")
+
+    # Accuracy of each strategy against its own target on the shared held-out origins
+    _, test_rows = train_test_split(np.arange(len(processed)), test_size=0.2, random_state=42)
+    keys = ['customer/vendor_code']
+    leads = range(1, periods + 1)
+    targets = {
+        'recursive': ('transaction', grouped_leads(processed, 'quantity', keys, 'posting_date', leads=leads)),
+        'direct': ('month_total', monthly_leads(processed, 'quantity', keys, 'posting_date', leads=leads))
+    }
+    origins = processed.iloc[test_rows]
+    accuracy = []
+    for strategy, (basis, target) in targets.items():
+        actual = target.to_numpy()[test_rows]
+        forecast = model.forecast_future_batch(origins, periods, strategy=strategy)
+        predicted = forecast['predicted_quantity'].to_numpy().reshape(len(origins), periods)
+        error = np.abs(predicted - actual)
+        accuracy.append({'strategy': strategy, 'target': basis, **{
+            f'mae_h{h + 1}': round(float(np.nanmean(error[:, h])), 1) for h in range(periods)
+        }, 'mae': round(float(np.nanmean(error)), 1)})
+    print(pd.DataFrame(accuracy).to_string(index=False))
+
+    rng = np.random.default_rng(0)
+    results = []
+    for n in batch_sizes:
+        states = processed[STATE_COLUMNS].iloc[rng.integers(0, len(processed), n)].reset_index(drop=True)
+        recursive_s = best_time(lambda: model.forecast_future_batch(states, periods))
+        direct_s = best_time(lambda: model.forecast_future_batch(states, periods, strategy='direct'))
+        results.append({
+            'series': n,
+            'recursive_ms': round(recursive_s * 1000, 2),
+            'direct_ms': round(direct_s * 1000, 2),
+            'speedup': round(recursive_s / direct_s, 1)
+        })
+
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
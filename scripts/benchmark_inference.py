@@ -0,0 +1,67 @@
+import sys
+sys.path.append('.')
+
+import time
+import numpy as np
+import pandas as pd
+from loguru import logger
+from src.models.xgboost_forecaster import XGBoostForecaster, FEATURE_COLUMNS
+
+BATCH_SIZES = [1, 8, 64, 1024, 16384]
+
+
+def best_time(func, repeats: int = 20) -> float:
+    """Best wall-clock time of several runs, in seconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def synthetic_features(n_rows: int, seed: int = 42) -> np.ndarray:
+    """Random feature rows in FEATURE_COLUMNS order."""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 1000, n_rows),
+        rng.uniform(0, 1000, n_rows),
+        rng.uniform(0, 1000, n_rows),
+        rng.integers(1, 13, n_rows),
+        rng.uniform(500, 3000, n_rows),
+        rng.uniform(0, 10000, n_rows),
+        rng.integers(1, 5, n_rows),
+        rng.integers(0, 30, n_rows)
+    ]).astype(np.float32)
+
+
+def main(model_path: str = "models/xgboost_model.pkl"):
+    """Compare single-row and batch latency of the inference backends."""
+    forecaster = XGBoostForecaster()
+    forecaster.load(model_path)
+    booster = forecaster.model.get_booster()
+    engine = forecaster.compile()
+    
+    X_all = synthetic_features(max(BATCH_SIZES))
+    parity = np.abs(engine.predict(X_all) - booster.inplace_predict(X_all, validate_features=False)).max()
+    logger.info(f"Max abs difference compiled vs booster: {parity:.2e}")
+    
+    results = []
+    for n_rows in BATCH_SIZES:
+        X = X_all[:n_rows]
+        frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+        repeats = 20 if n_rows <= 1024 else 3
+        results.append({
+            'rows': n_rows,
+            'XGBRegressor.predict (us)': best_time(lambda: forecaster.model.predict(frame), repeats) * 1e6,
+            'inplace_predict (us)': best_time(lambda: booster.inplace_predict(X, validate_features=False), repeats) * 1e6,
+            'compiled (us)': best_time(lambda: engine.predict(X), repeats) * 1e6
+        })
+    
+    results_df = pd.DataFrame(results).set_index('rows').round(1)
+    logger.info(f"Inference latency:\n{results_df.to_string()}")
+    
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
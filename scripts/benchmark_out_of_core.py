@@ -0,0 +1,73 @@
+import sys
+sys.path.append('.')
+
+import json
+import subprocess
+import tempfile
+import pandas as pd
+from loguru import logger
+from src.data.loader import read_table
+from src.data.partitions import write_partitions
+from src.data.processor import DataProcessor
+from src.data.synthetic import scale_export
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+
+# Runs in a fresh interpreter, so peak RSS covers one training mode only
+TRAIN = """
+import json, sys, time
+sys.path.append('.')
+from loguru import logger
+logger.remove()
+import pandas as pd
+from src.models.xgboost_forecaster import XGBoostForecaster
+
+def peak_rss_mb():
+    # VmHWM starts afresh at exec, unlike ru_maxrss, which a child inherits from its parent
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM')) / 1024
+
+mode, directory = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+model = XGBoostForecaster()
+if mode == 'in_memory':
+    metrics = model.fit(pd.read_parquet(directory))
+else:
+    metrics = model.fit_partitions(
+        directory, external_memory=mode == 'external_memory', cache_dir=directory + '/xgboost-cache'
+    )
+print(json.dumps({
+    'mode': mode,
+    'seconds': time.perf_counter() - start,
+    'peak_rss_mb': peak_rss_mb(),
+    'test_mae': metrics['test']['mae']
+}))
+"""
+
+
+def main(scales=(20, 200)):
+    """Peak memory and time of in-memory vs streamed training on synthetic partitioned data."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    base = read_table(DATA_PATH)
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            processed = DataProcessor().process(scale_export(base, scale))
+            n_rows = len(processed)
+            write_partitions(processed, directory, rows_per_file=50_000)
+            del processed
+
+            for mode in ('in_memory', 'quantile', 'external_memory'):
+                output = subprocess.run(
+                    [sys.executable, '-c', TRAIN, mode, directory], capture_output=True, text=True, check=True
+                ).stdout
+                results.append({'rows': n_rows, **json.loads(output.strip().splitlines()[-1])})
+
+    results_df = pd.DataFrame(results)
+    print(results_df.round(2).to_string(index=False))
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
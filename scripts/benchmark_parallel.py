@@ -0,0 +1,51 @@
+import sys
+sys.path.append('.')
+
+import os
+import time
+import pandas as pd
+from loguru import logger
+from src.data.loader import read_table
+from src.data.parallel import ParallelProcessor
+from src.data.processor import DataProcessor
+from src.data.synthetic import scale_export
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+
+
+def main(scales=(10, 100), max_workers: int = None):
+    """Time the partitioned pipeline from 1 to N cores on synthetic exports."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    
+    base = read_table(DATA_PATH)
+    max_workers = max_workers or os.cpu_count() or 1
+    worker_counts = sorted({1, *[2 ** i for i in range(1, max_workers.bit_length())], max_workers})
+    
+    results = []
+    for scale in scales:
+        df = scale_export(base, scale)
+        
+        start = time.perf_counter()
+        DataProcessor().process(df.copy())
+        sequential = time.perf_counter() - start
+        
+        for n_workers in worker_counts:
+            start = time.perf_counter()
+            ParallelProcessor(n_workers=n_workers).process(df.copy())
+            elapsed = time.perf_counter() - start
+            results.append({
+                'scale': scale,
+                'rows': len(df),
+                'workers': n_workers,
+                'seconds': round(elapsed, 2),
+                'speedup': round(sequential / elapsed, 2)
+            })
+    
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+    
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
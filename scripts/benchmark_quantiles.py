@@ -0,0 +1,91 @@
+import sys
+sys.path.append('.')
+
+import time
+import numpy as np
+import pandas as pd
+from loguru import logger
+from src.data.loader import read_table
+from src.data.processor import DataProcessor
+from src.models.xgboost_forecaster import QUANTILES, XGBoostForecaster, quantile_label
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+STATE_COLUMNS = ['quantity', 'lag_1', 'posting_month', 'rate', 'u_frt']
+
+
+def best_time(func, repeats: int = 5) -> float:
+    """Fastest of ``repeats`` runs, in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(batch_sizes=(1, 64, 1024), periods: int = 12):
+    """
+    Cost and interval width of quantile forecasts.
+
+    Compares the point forecast alone, the point forecast with all
+    quantiles from one batched call per step, and the point forecast plus
+    one booster and recursion per quantile.
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    processed = DataProcessor().process(read_table(DATA_PATH))
+    model = XGBoostForecaster()
+    model.fit(processed)
+    start = time.perf_counter()
+    shared_metrics = model.fit_quantiles(processed)
+    shared_fit_s = time.perf_counter() - start
+
+    # Baseline: a separate quantile model per quantile, each recursing on its own predictions
+    separate = {}
+    start = time.perf_counter()
+    for q in QUANTILES:
+        separate[q] = XGBoostForecaster(config={**model.config, 'objective': 'reg:quantileerror', 'quantile_alpha': q})
+        separate[q].fit(processed)
+    separate_fit_s = time.perf_counter() - start
+    print(f"Training: one multi-quantile model {shared_fit_s:.2f}s, one model per quantile {separate_fit_s:.2f}s")
+    print(
+        f"Test interval coverage {shared_metrics['coverage']:.1%} (nominal {shared_metrics['nominal_coverage']:.0%}), "
+        f"mean width {shared_metrics['mean_width']:.1f}, pinball {shared_metrics['pinball']}"
+    )
+
+    rng = np.random.default_rng(0)
+    low, high = quantile_label(QUANTILES[0]), quantile_label(QUANTILES[-1])
+    results = []
+    for n in batch_sizes:
+        states = processed[STATE_COLUMNS].iloc[rng.integers(0, len(processed), n)].reset_index(drop=True)
+
+        point_s = best_time(lambda: model.forecast_future_batch(states, periods))
+        shared_s = best_time(lambda: model.forecast_future_batch(states, periods, quantiles=True))
+        separate_s = best_time(lambda: [model.forecast_future_batch(states, periods)] + [
+            separate[q].forecast_future_batch(states, periods) for q in QUANTILES
+        ])
+
+        shared = model.forecast_future_batch(states, periods, quantiles=True)
+        shared_width = (shared[high] - shared[low]).to_numpy().reshape(n, periods).mean(axis=0)
+        separate_width = (
+            separate[QUANTILES[-1]].forecast_future_batch(states, periods)['predicted_quantity']
+            - separate[QUANTILES[0]].forecast_future_batch(states, periods)['predicted_quantity']
+        ).to_numpy().reshape(n, periods).mean(axis=0)
+
+        results.append({
+            'series': n,
+            'point_ms': round(point_s * 1000, 2),
+            'point_quantiles_ms': round(shared_s * 1000, 2),
+            'point_and_per_quantile_recursions_ms': round(separate_s * 1000, 2),
+            'width_h1': round(float(shared_width[0]), 1),
+            f'width_h{periods}': round(float(shared_width[-1]), 1),
+            f'per_quantile_width_h{periods}': round(float(separate_width[-1]), 1)
+        })
+
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
@@ -0,0 +1,79 @@
+import sys
+sys.path.append('.')
+
+import os
+import subprocess
+import tempfile
+import pandas as pd
+from loguru import logger
+from src.models.xgboost_forecaster import XGBoostForecaster, FEATURE_COLUMNS, manifest_path
+from scripts.benchmark_inference import best_time, synthetic_features
+
+MODEL_PATH = "models/xgboost_model.pkl"
+
+# Fresh interpreter: import cost and load together, as on a cold API worker
+COLD_LOAD = """
+import sys, time
+start = time.perf_counter()
+from src.models.xgboost_forecaster import XGBoostForecaster
+XGBoostForecaster().load(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def cold_load_time(path: str, repeats: int = 3) -> float:
+    """Best time to import the forecaster and load a model in a new process."""
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_LOAD, path],
+            capture_output=True, text=True, check=True, env={**os.environ, 'PYTHONPATH': '.'}
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def large_model() -> XGBoostForecaster:
+    """A deeper, larger ensemble than the shipped model."""
+    X = pd.DataFrame(synthetic_features(50000), columns=FEATURE_COLUMNS)
+    X['quantity'] = X['lag_1'] * 0.7 + X['rate'] * 0.01
+    forecaster = XGBoostForecaster(config={'n_estimators': 1000, 'max_depth': 8, 'random_state': 42})
+    forecaster.fit(X)
+    return forecaster
+
+
+def main(model_path: str = MODEL_PATH):
+    """Compare file size and load time of the pickle and native formats."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    
+    shipped = XGBoostForecaster()
+    shipped.load(model_path)
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, forecaster in [('shipped (100 trees)', shipped), ('large (1000 trees)', large_model())]:
+            pickle_path = os.path.join(tmp_dir, 'model.pkl')
+            native_path = os.path.join(tmp_dir, 'model.ubj')
+            forecaster.save(pickle_path)
+            forecaster.save(native_path)
+            
+            for fmt, path in [('pickle', pickle_path), ('native', native_path)]:
+                size = os.path.getsize(path)
+                if fmt != 'pickle':
+                    size += manifest_path(path).stat().st_size
+                results.append({
+                    'model': label,
+                    'format': fmt,
+                    'size_kb': round(size / 1024),
+                    'load_ms': round(best_time(lambda: XGBoostForecaster().load(path)) * 1000, 2),
+                    'cold_load_ms': round(cold_load_time(path) * 1000, 1)
+                })
+    
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+    
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
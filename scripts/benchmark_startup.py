@@ -0,0 +1,49 @@
+import sys
+sys.path.append('.')
+
+import json
+import subprocess
+import pandas as pd
+
+# Runs in a fresh interpreter, so every measurement is a cold start
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from src.api.main import app
+imported = time.perf_counter() - start
+heavy = [name for name in ('pandas', 'numpy', 'xgboost', 'sklearn') if name in sys.modules]
+
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    bound = time.perf_counter() - start
+    while client.get('/ready').json()['status'] == 'loading':
+        time.sleep(0.01)
+    ready = time.perf_counter() - start
+    client.post('/predict', json={'last_quantity': 150.0, 'current_month': 3})
+    first_prediction = time.perf_counter() - start
+
+print(json.dumps({
+    'import_s': imported, 'accepting_s': bound, 'ready_s': ready,
+    'first_prediction_s': first_prediction, 'heavy_modules_at_import': ','.join(heavy) or '-'
+}))
+"""
+
+
+def main(runs: int = 5):
+    """Measure API import time, time to accept requests, and time to readiness."""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_START], capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    
+    results_df = pd.DataFrame(results)
+    print(results_df.round(3).to_string(index=False))
+    print("\nMedian:")
+    print(results_df.median(numeric_only=True).round(3).to_string())
+    
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
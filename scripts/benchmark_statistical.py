@@ -0,0 +1,67 @@
+import sys
+sys.path.append('.')
+
+import os
+import time
+import pandas as pd
+from loguru import logger
+from src.data.loader import read_table
+from src.data.processor import DataProcessor
+from src.data.synthetic import scale_export
+from src.models.arima_forecaster import ARIMAForecaster
+from src.models.prophet_forecaster import ProphetForecaster
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+
+
+def main(scales=(1, 10), model_classes=(ARIMAForecaster, ProphetForecaster)):
+    """Series fitted per second per core: cold fits, warm starts after a new month, and unchanged refits."""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    base = read_table(DATA_PATH)
+    n_jobs = os.cpu_count() or 1
+    results = []
+    for scale in scales:
+        processed = DataProcessor().process(scale_export(base, scale))
+        last_month = processed['posting_date'].dt.to_period('M').max()
+        earlier = processed[processed['posting_date'].dt.to_period('M') < last_month]
+
+        for model_class in model_classes:
+            forecaster = model_class(n_jobs=n_jobs)
+            try:
+                start = time.perf_counter()
+                metrics = forecaster.fit(earlier)
+                cold_s = time.perf_counter() - start
+            except ImportError as e:
+                logger.warning(f"Skipping {model_class.__name__}: {e}")
+                continue
+            n_series = len(forecaster.series_ids)
+
+            # One more month of data: every series changes, starting from its previous parameters
+            start = time.perf_counter()
+            forecaster.fit(processed)
+            warm_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            forecaster.fit(processed)
+            unchanged_s = time.perf_counter() - start
+
+            results.append({
+                'model': model_class.__name__,
+                'series': n_series,
+                'workers': n_jobs,
+                'cold_s': round(cold_s, 2),
+                'cold_series_per_s_per_core': round(n_series / cold_s / n_jobs, 1),
+                'warm_s': round(warm_s, 2),
+                'warm_series_per_s_per_core': round(len(forecaster.series_ids) / warm_s / n_jobs, 1),
+                'unchanged_s': round(unchanged_s, 3),
+                'fallbacks': n_series - metrics['status'].get('ok', 0)
+            })
+
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+    return results_df
+
+if __name__ == "__main__":
+    results = main()
@@ -0,0 +1,145 @@
+import sys
+sys.path.append('.')
+
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import time
+import httpx
+import numpy as np
+import pandas as pd
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+
+# Concurrent client loops per endpoint
+DEFAULT_MIX = {'health': 8, 'predict': 8, 'batch': 2, 'upload': 2}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app_dir: str, port: int, env: dict = None) -> subprocess.Popen:
+    """Run the API under uvicorn and wait until it reports ready."""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'src.api.main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=app_dir, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        # Servers without a readiness endpoint: fall back to the liveness check
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200 and \
+                    httpx.get(f"http://127.0.0.1:{port}/ready").status_code == 404:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("API did not become ready")
+
+
+async def send_request(client: httpx.AsyncClient, endpoint: str, rng: random.Random, upload: bytes) -> httpx.Response:
+    """One request of the given kind."""
+    if endpoint == 'health':
+        return await client.get('/health')
+    elif endpoint == 'predict':
+        return await client.post('/predict', json={
+            'last_quantity': rng.uniform(10, 1000), 'current_month': rng.randint(1, 12), 'periods': 12
+        })
+    elif endpoint == 'batch':
+        return await client.post('/predict/batch', json={'series': [
+            {'last_quantity': rng.uniform(10, 1000), 'current_month': rng.randint(1, 12), 'periods': 12}
+            for _ in range(2000)
+        ]})
+    else:
+        return await client.post(
+            '/upload-and-predict?periods=6',
+            files={'file': ('export.xlsx', upload, 'application/octet-stream')}
+        )
+
+
+async def client_loop(client: httpx.AsyncClient, endpoint: str, stop_at: float, results: list, upload: bytes):
+    """Send requests of one kind back to back until ``stop_at``."""
+    rng = random.Random()
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            status = (await send_request(client, endpoint, rng, upload)).status_code
+        except httpx.TransportError:
+            # Dropped connections are counted, not fatal, so one bad
+            # socket does not end the run
+            status = 0
+        results.append((endpoint, status, time.perf_counter() - start))
+
+
+async def run_load(base_url: str, duration: float, mix: dict) -> pd.DataFrame:
+    with open(DATA_PATH, 'rb') as f:
+        upload = f.read()
+    results = []
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=sum(mix.values()))
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        await asyncio.gather(*[
+            client_loop(client, endpoint, stop_at, results, upload)
+            for endpoint, n_clients in mix.items() for _ in range(n_clients)
+        ])
+    return pd.DataFrame(results, columns=['endpoint', 'status', 'seconds'])
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    """Request count, status codes and latency percentiles per endpoint."""
+    rows = []
+    for endpoint, group in results.groupby('endpoint'):
+        latency_ms = group['seconds'].to_numpy() * 1000
+        rows.append({
+            'endpoint': endpoint,
+            'requests': len(group),
+            'statuses': ' '.join(f"{code}:{n}" for code, n in group['status'].value_counts().sort_index().items()),
+            'p50_ms': round(np.percentile(latency_ms, 50), 1),
+            'p95_ms': round(np.percentile(latency_ms, 95), 1),
+            'p99_ms': round(np.percentile(latency_ms, 99), 1)
+        })
+    return pd.DataFrame(rows)
+
+
+def main(base_url: str = None, app_dir: str = '.', duration: float = 20.0, mix: dict = None, env: dict = None):
+    """
+    Mixed-traffic load test: /health, /predict, large /predict/batch and
+    xlsx uploads in parallel client loops, reporting p50/p95/p99 per endpoint.
+
+    Without ``base_url`` a uvicorn server is started from ``app_dir``, so a
+    checkout of an older revision can be measured the same way.
+    """
+    mix = mix or DEFAULT_MIX
+    server = None
+    if base_url is None:
+        port = free_port()
+        server = start_server(app_dir, port, env)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        summary = summarize(asyncio.run(run_load(base_url, duration, mix)))
+        coalescer = httpx.get(f"{base_url}/coalescer/stats")
+        if coalescer.status_code == 200:
+            print(f"Coalescer: {coalescer.json()}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    
+    print(summary.to_string(index=False))
+    return summary
+
+if __name__ == "__main__":
+    app_dir = sys.argv[1] if len(sys.argv) > 1 else '.'
+    summary = main(app_dir=app_dir)
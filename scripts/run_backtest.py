@@ -0,0 +1,28 @@
+import sys
+sys.path.append('.')
+
+from loguru import logger
+from src.data.loader import read_table
+from src.data.processor import DataProcessor
+from src.models.backtest import WalkForwardBacktester
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+
+
+def main(n_folds: int = 6, horizon: int = 3, n_workers: int = None):
+    """Walk-forward backtest of the XGBoost model on the raw export."""
+    logger.info("Loading and processing data...")
+    df = DataProcessor().process(read_table(DATA_PATH))
+    
+    backtester = WalkForwardBacktester(n_folds=n_folds, horizon=horizon, n_workers=n_workers)
+    results = backtester.run(df)
+    
+    print("\nMetrics per cutoff and horizon:")
+    print(results['folds'].round(2).to_string(index=False))
+    print("\nMetrics per horizon:")
+    print(results['horizons'].round(2).to_string(index=False))
+    
+    return results
+
+if __name__ == "__main__":
+    results = main()
@@ -1,54 +1,117 @@
 import sys
 sys.path.append('.')
 
+import json
+import os
 import pandas as pd
 from loguru import logger
+from src.data.cache import PipelineCache
 from src.data.processor import DataProcessor
+from src.models.arima_forecaster import ARIMAForecaster
+from src.models.hierarchy import HierarchicalForecaster
+from src.models.prophet_forecaster import ProphetForecaster
 from src.models.xgboost_forecaster import XGBoostForecaster
 from pathlib import Path
 
-def main():
-    """Train and save the demand forecasting model."""
+def main(partitions_dir: str = None):
+    """
+    Train and save the demand forecasting model.
+    
+    Args:
+        partitions_dir: Directory of processed Parquet partitions; when given,
+            one global model is trained from it out of core
+    """
     
     logger.info("Starting model training pipeline")
     
+    config = load_config()
+    if partitions_dir:
+        model = XGBoostForecaster(config=config)
+        metrics = model.fit_partitions(partitions_dir)
+        log_metrics(metrics)
+        save_model(model)
+        logger.info("Model training complete!")
+        return metrics
+    
     # Load data
     data_path = "data/raw/DOC-20241224-WA0017..xlsx"  
     logger.info(f"Loading data from {data_path}")
-    df = pd.read_excel(data_path)
+    cache = PipelineCache(os.getenv("PIPELINE_CACHE_DIR", "data/cache"))
+    df = cache.read_raw(data_path)
     
-    # Process data
+    # Process data, reusing cached stages whose inputs and code are unchanged
     processor = DataProcessor()
-    processed_df = processor.process(df)
+    processed_df = processor.process(df, cache=cache)
     logger.info(f"Data processed: {processed_df.shape}")
     
-    # Train model
-    model = XGBoostForecaster(config={
+    model = XGBoostForecaster(config=config)
+    
+    metrics = model.fit(processed_df)
+    log_metrics(metrics)
+    
+    # P10 / P50 / P90 for /predict with "quantiles": true
+    quantile_metrics = model.fit_quantiles(processed_df)
+    logger.info(f"  Quantile interval coverage: {quantile_metrics['coverage']:.1%}")
+    
+    # One output per horizon for /predict with "strategy": "direct"
+    direct_metrics = model.fit_direct(processed_df, periods=12)
+    logger.info(f"  Direct test MAE over 12 horizons: {direct_metrics['test']['mae']:.2f}")
+    save_model(model)
+    
+    # One model for every region / LOB / customer series, served by /hierarchy/forecast
+    hierarchical = HierarchicalForecaster()
+    hierarchical_metrics = hierarchical.fit(processed_df)
+    logger.info(f"  Hierarchical test MAE: {hierarchical_metrics['test']['mae']:.2f}")
+    hierarchical.save("models/hierarchical_model.pkl")
+    
+    # Per-customer statistical models, served by /series/forecast
+    for name, forecaster_class in (("arima", ARIMAForecaster), ("prophet", ProphetForecaster)):
+        try:
+            forecaster = forecaster_class()
+            series_metrics = forecaster.fit(processed_df)
+        except ImportError as e:
+            logger.warning(f"Skipping {name}: {e}")
+            continue
+        logger.info(f"  {name} test MAE: {series_metrics['test']['mae']:.2f} ({series_metrics['status']})")
+        forecaster.save(f"models/{name}_model.pkl")
+    
+    logger.info("Model training complete!")
+    
+    return metrics
+
+def load_config():
+    """Default config, or the one from scripts/tune_model.py when present."""
+    config = {
         'n_estimators': 100,
         'max_depth': 5,
         'learning_rate': 0.1,
         'subsample': 0.8,
         'random_state': 42
-    })
-    
-    metrics = model.fit(processed_df)
-    
-    # Log metrics
+    }
+    config_path = Path("models/xgboost_config.json")
+    if config_path.exists():
+        with open(config_path) as f:
+            config = json.load(f)
+        logger.info(f"Using tuned config from {config_path}")
+    return config
+
+def log_metrics(metrics):
+    """Log train and test metrics."""
     logger.info("Training Metrics:")
     logger.info(f"  Train MAE: {metrics['train']['mae']:.2f}")
     logger.info(f"  Train RMSE: {metrics['train']['rmse']:.2f}")
     logger.info(f"  Test MAE: {metrics['test']['mae']:.2f}")
     logger.info(f"  Test RMSE: {metrics['test']['rmse']:.2f}")
     logger.info(f"  Test MAPE: {metrics['test']['mape']:.2f}%")
-    
-    # Save model
+
+def save_model(model):
+    """Save the model as a pickle and in the native format."""
     model_path = Path("models/xgboost_model.pkl")
     model_path.parent.mkdir(parents=True, exist_ok=True)
     model.save(str(model_path))
     
-    logger.info("Model training complete!")
-    
-    return metrics
+    # Native format (UBJSON booster + JSON manifest), preferred by the API
+    model.save(str(model_path.with_suffix(".ubj")))
 
 if __name__ == "__main__":
-    metrics = main()
\ No newline at end of file
+    metrics = main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -0,0 +1,39 @@
+import sys
+sys.path.append('.')
+
+import json
+import os
+from pathlib import Path
+from loguru import logger
+from src.data.cache import PipelineCache
+from src.data.processor import DataProcessor
+from src.models.tuning import HyperparameterSearch
+
+DATA_PATH = "data/raw/DOC-20241224-WA0017..xlsx"
+CONFIG_PATH = Path("models/xgboost_config.json")
+
+
+def main(n_trials: int = 40, method: str = "halving", n_workers: int = None):
+    """Search XGBoost hyperparameters and save the best config for training."""
+    cache = PipelineCache(os.getenv("PIPELINE_CACHE_DIR", "data/cache"))
+    df = DataProcessor().process(cache.read_raw(DATA_PATH), cache=cache)
+    
+    search = HyperparameterSearch(
+        n_trials=n_trials,
+        method=method,
+        n_workers=n_workers,
+        cache_dir=str(cache.cache_dir / "tuning")
+    )
+    results = search.run(df)
+    print(results.head(10).round(4).to_string(index=False))
+    
+    # scripts/train_models.py picks this config up
+    CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CONFIG_PATH, 'w') as f:
+        json.dump(search.best_config, f, indent=2)
+    logger.info(f"Best config saved to {CONFIG_PATH}")
+    
+    return search.best_config
+
+if __name__ == "__main__":
+    best_config = main()
@@ -0,0 +1,100 @@
+"""In-process cache of forecast results."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Optional, Tuple
+from .schemas import PredictionRequest
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ForecastCache:
+    """
+    Bounded LRU cache of forecast quantities with TTL expiry.
+
+    Entries are keyed on the canonicalized request inputs (everything but
+    ``periods``) and the model version, and hold the predicted quantities
+    only, so dates are always rebuilt for the current month. A cached
+    forecast answers any request for the same inputs with an equal or
+    shorter horizon.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[float, np.ndarray]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(request: PredictionRequest, model_version: Optional[str]) -> Tuple:
+        """Canonical cache key for a prediction request."""
+        def canonical(value):
+            return None if value is None else float(value) + 0.0
+
+        return (
+            model_version,
+            canonical(request.last_quantity),
+            int(request.current_month),
+            canonical(request.rate),
+            canonical(request.freight_cost),
+            request.strategy
+        )
+
+    def get(self, key: Hashable, periods: int) -> Optional['np.ndarray']:
+        """Return the first ``periods`` cached predictions, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is None or len(entry[1]) < periods:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1][:periods].copy()
+
+    def put(self, key: Hashable, predictions: 'np.ndarray'):
+        """Store predictions, keeping the longer horizon if one is cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and len(entry[1]) > len(predictions):
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = (self._clock(), predictions.copy())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
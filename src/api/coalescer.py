@@ -0,0 +1,131 @@
+"""Micro-batching of concurrent single-series forecasts."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Hashable, List, Tuple
+from ..monitoring.metrics import COALESCED_BATCH_SIZE
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class RequestCoalescer:
+    """
+    Gather requests arriving close together and run them as one batch.
+
+    The first request for a key opens a batch and starts a ``max_wait``
+    timer; the batch is run when the timer fires or as soon as it holds
+    ``max_batch_size`` requests, whichever comes first. ``run_batch`` gets
+    the key and the batched items and returns one result per item, which
+    is handed back to each waiting caller; if it raises, every caller in
+    the batch gets the exception.
+
+    Everything here runs on the event loop, so no locks are needed; the
+    batch itself should be offloaded by ``run_batch``.
+    """
+
+    def __init__(self, run_batch: Callable[[Hashable, List], Awaitable[List]],
+                 max_batch_size: int = 64, max_wait: float = 0.002,
+                 history: int = 1024, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            run_batch: Coroutine function computing the results of one batch
+            max_batch_size: Most requests per batch
+            max_wait: Seconds the first request of a batch waits for others
+            history: Number of recent request latencies kept for percentiles
+            clock: Time source
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._clock = clock
+        self._pending: Dict[Hashable, List[Tuple[object, asyncio.Future, float]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running = set()
+        self._latencies = deque(maxlen=history)
+        self._started_at = None
+        self.requests = 0
+        self.batches = 0
+
+    async def submit(self, key: Hashable, item):
+        """
+        Add one item to the open batch for ``key`` and await its result.
+
+        Args:
+            key: Items are only batched with items of the same key
+            item: Input passed to ``run_batch``
+
+        Returns:
+            The result ``run_batch`` produced for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        now = self._clock()
+        if self._started_at is None:
+            self._started_at = now
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future, now))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Hashable):
+        """Close the open batch for ``key`` and start running it."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        # Keep a reference, so the task is not garbage collected mid-run
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[object, asyncio.Future, float]]):
+        try:
+            results = await self.run_batch(key, [item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.requests += len(batch)
+            self.batches += 1
+            COALESCED_BATCH_SIZE.observe(len(batch))
+
+        now = self._clock()
+        for (_, future, submitted_at), result in zip(batch, results):
+            # Callers that went away (e.g. client disconnects) are skipped
+            if not future.done():
+                future.set_result(result)
+            self._latencies.append(now - submitted_at)
+
+    def stats(self) -> Dict:
+        """Batch sizes, throughput and recent request latencies."""
+        latencies = sorted(self._latencies)
+        elapsed = self._clock() - self._started_at if self._started_at is not None else 0.0
+        return {
+            'max_batch_size': self.max_batch_size,
+            'window_ms': self.max_wait * 1000,
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'throughput_rps': self.requests / elapsed if elapsed > 0 else 0.0,
+            'latency_p50_ms': _percentile(latencies, 50) * 1000,
+            'latency_p95_ms': _percentile(latencies, 95) * 1000,
+            'latency_p99_ms': _percentile(latencies, 99) * 1000
+        }
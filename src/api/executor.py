@@ -0,0 +1,72 @@
+"""Bounded worker pool for CPU-bound request work."""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from ..monitoring.metrics import POOL_PENDING, POOL_REJECTED, POOL_TIMEOUTS
+
+
+class PoolFullError(RuntimeError):
+    """Raised when the pool's queue is full and work is refused."""
+
+
+class WorkTimeoutError(TimeoutError):
+    """Raised when submitted work does not finish within its timeout."""
+
+
+class WorkerPool:
+    """
+    Thread pool with admission control, for running inference off the event loop.
+
+    At most ``max_workers`` jobs run and ``max_queue`` more wait; further
+    submissions fail fast with ``PoolFullError`` instead of queueing without
+    bound, so latency stays bounded under overload. A job counts against
+    the limit until its thread is actually done: a job that times out while
+    running keeps its slot until it finishes, because threads cannot be
+    interrupted; one that times out while still queued is cancelled.
+
+    Threads rather than processes: the model and processor are shared
+    in memory, and XGBoost prediction and most pandas work release the GIL.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 32, timeout: float = 30.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='inference')
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Jobs running or queued."""
+        return self._pending
+
+    def _release(self, _: Future):
+        with self._lock:
+            self._pending -= 1
+            POOL_PENDING.set(self._pending)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run ``func(*args)`` on the pool and await its result.
+
+        Raises:
+            PoolFullError: If ``max_workers + max_queue`` jobs are already pending
+            WorkTimeoutError: If the job takes longer than the timeout
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                POOL_REJECTED.inc()
+                raise PoolFullError(f"{self._pending} jobs pending")
+            self._pending += 1
+            POOL_PENDING.set(self._pending)
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise WorkTimeoutError(f"Work did not finish within {timeout or self.timeout:.1f}s")
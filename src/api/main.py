@@ -1,18 +1,67 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-import pandas as pd
-import io
-from typing import List
+from fastapi.responses import JSONResponse, Response
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 from loguru import logger
-from .schemas import PredictionRequest, PredictionResponse, HealthResponse
-from ..models.xgboost_forecaster import XGBoostForecaster
-from ..data.processor import DataProcessor
+from .schemas import (
+    PredictionRequest, PredictionResponse, HealthResponse,
+    BatchPredictionRequest, BatchPredictionResponse, CacheStatsResponse,
+    CoalescerStatsResponse, HierarchyForecastResponse, ModelsResponse, SeriesForecastResponse
+)
+from .cache import ForecastCache
+from .registry import ModelRegistry, load_artifact
+from .instrumentation import MetricsMiddleware
+from .coalescer import RequestCoalescer
+from .executor import PoolFullError, WorkerPool, WorkTimeoutError
+from ..monitoring.metrics import CONTENT_TYPE, REGISTRY as METRICS
+
+# pandas, xgboost and scikit-learn are imported by the startup warm-up (or
+# the first request), not at import time, so the server binds quickly
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from ..data.processor import DataProcessor
+    from ..models.base import BaseForecaster
+
+# Startup state reported by /ready: loading, ready or failed
+readiness = {"status": "loading", "message": "Model is loading"}
+
+def warm_up():
+    """Import the inference stack and load the default model."""
+    import pandas  # noqa: F401
+    get_processor()
+    registry.get()
+
+async def load_on_startup():
+    """Run the warm-up off the event loop and record the outcome."""
+    try:
+        await run_in_threadpool(warm_up)
+        readiness.update(status="ready", message="Model loaded")
+        logger.info("Model loaded successfully")
+    except Exception as e:
+        readiness.update(status="failed", message=f"Could not load model: {e}")
+        logger.warning(f"Could not load model: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start loading the model without delaying the server from accepting requests."""
+    task = asyncio.create_task(load_on_startup())
+    yield
+    task.cancel()
 
 # Initialize app
 app = FastAPI(
     title="Demand Forecasting API",
     description="API for wooden pallet demand forecasting",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -24,16 +73,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency, status and in-flight metrics for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Upload spooling: bytes held in memory at once, and the largest accepted file
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "200")) * 1024 * 1024
+
+def load_model(name: str, path: Path) -> 'BaseForecaster':
+    """Load an artifact, compiling it when the compiled backend is selected."""
+    forecaster = load_artifact(name, path)
+    if name != "xgboost":
+        return forecaster
+    if os.getenv("INFERENCE_BACKEND", "xgboost") == "compiled":
+        forecaster.compile()
+    table_points = int(os.getenv("FORECAST_TABLE_POINTS", "0"))
+    if table_points > 0:
+        forecaster.precompute(
+            max_points=table_points,
+            max_cells=int(os.getenv("FORECAST_TABLE_MAX_CELLS", "2000000"))
+        )
+    return forecaster
+
+@lru_cache(maxsize=None)
+def get_processor() -> 'DataProcessor':
+    """Shared data processor, created on first use."""
+    from ..data.processor import DataProcessor
+    return DataProcessor()
+
 # Initialize components
-processor = DataProcessor()
-model = XGBoostForecaster()
+registry = ModelRegistry(
+    model_dir=os.getenv("MODEL_DIR", "models"),
+    max_loaded=int(os.getenv("MAX_LOADED_MODELS", "4")),
+    refresh_interval=float(os.getenv("MODEL_REFRESH_INTERVAL", "30")),
+    loader=load_model
+)
+forecast_cache = ForecastCache(
+    max_size=int(os.getenv("FORECAST_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("FORECAST_CACHE_TTL", "3600"))
+)
+
+# CPU-bound inference runs here, never on the event loop
+work_pool = WorkerPool(
+    max_workers=int(os.getenv("INFERENCE_THREADS", "4")),
+    max_queue=int(os.getenv("INFERENCE_QUEUE_SIZE", "32")),
+    timeout=float(os.getenv("INFERENCE_TIMEOUT", "30"))
+)
+
+async def offload(func, *args):
+    """Run CPU-bound work on the pool: 503 when its queue is full, 504 on timeout."""
+    try:
+        return await work_pool.run(func, *args)
+    except PoolFullError:
+        raise HTTPException(status_code=503, detail="Server busy, retry later", headers={"Retry-After": "1"})
+    except WorkTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
-# Load pre-trained model
-try:
-    model.load("models/xgboost_model.pkl")
-    logger.info("Model loaded successfully")
-except Exception as e:
-    logger.warning(f"Could not load model: {e}")
+async def resolve_model(name: Optional[str], version: Optional[str]) -> 'BaseForecaster':
+    """Look up a model, loading it off the event loop on first use."""
+    try:
+        model = registry.get_loaded(name, version)
+        if model is None:
+            model = await run_in_threadpool(registry.get, name, version)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return model
 
 @app.get("/", response_model=HealthResponse)
 async def root():
@@ -46,36 +150,155 @@ async def root():
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check: the process is up, whether or not the model is loaded."""
     return {
         "status": "healthy",
         "message": "API is operational",
         "version": "1.0.0"
     }
 
+@app.get("/ready", response_model=HealthResponse, responses={503: {"model": HealthResponse}})
+async def readiness_check():
+    """Readiness check: 200 once the default model is loaded, 503 before."""
+    if readiness["status"] != "ready" and registry.get_loaded() is not None:
+        readiness.update(status="ready", message="Model loaded")
+    content = {**readiness, "version": "1.0.0"}
+    if readiness["status"] != "ready":
+        return JSONResponse(status_code=503, content=content)
+    return content
+
+def forecast_matrix(model: 'BaseForecaster', requests: List[PredictionRequest], quantiles: bool = False):
+    """
+    Forecast many requests at once, one row each (CPU-bound).
+
+    Rows are forecast together per strategy. With ``quantiles``, also
+    returns quantile forecasts of shape (n, periods, n_quantiles), NaN for
+    rows forecast directly.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    # Create last known data, one row per series
+    last_known = pd.DataFrame({
+        'quantity': [item.last_quantity for item in requests],
+        'lag_1': [item.last_quantity for item in requests],
+        'posting_month': [item.current_month for item in requests],
+        'rate': [item.rate for item in requests],
+        'u_frt': [item.freight_cost for item in requests]
+    })
+    
+    # Advance every series to the longest requested horizon at once
+    from ..models.xgboost_forecaster import quantile_label
+    max_periods = max(item.periods for item in requests)
+    labels = [quantile_label(q) for q in model.quantiles] if quantiles else []
+    quantities = np.empty((len(requests), max_periods))
+    quantile_predictions = np.full((len(requests), max_periods, len(labels)), np.nan)
+    strategies = np.array([item.strategy for item in requests])
+    for strategy in np.unique(strategies):
+        rows = np.flatnonzero(strategies == strategy)
+        with_quantiles = quantiles and strategy == 'recursive'
+        forecast = model.forecast_future_batch(
+            last_known if len(rows) == len(requests) else last_known.iloc[rows],
+            periods=max_periods, quantiles=with_quantiles, strategy=strategy
+        )
+        quantities[rows] = forecast['predicted_quantity'].to_numpy().reshape(len(rows), max_periods)
+        if with_quantiles:
+            quantile_predictions[rows] = forecast[labels].to_numpy().reshape(len(rows), max_periods, len(labels))
+    if not quantiles:
+        return quantities
+    return quantities, quantile_predictions
+
+def require_quantiles(model: 'BaseForecaster'):
+    """400 unless the model was trained with ``fit_quantiles``."""
+    if getattr(model, 'quantile_model', None) is None:
+        raise HTTPException(status_code=400, detail="Model has no quantile forecasts; train it with fit_quantiles()")
+
+# What predicted_quantity measures under each multi-step strategy: the recursive
+# model is trained on single orders, the direct one on calendar-month totals
+QUANTITY_BASIS = {"recursive": "transaction", "direct": "month_total"}
+
+def require_strategy(model: 'BaseForecaster', requests: List[PredictionRequest]):
+    """400 unless the model can serve every direct request."""
+    direct = [item for item in requests if item.strategy == 'direct']
+    if not direct:
+        return
+    if any(item.quantiles for item in direct):
+        raise HTTPException(status_code=400, detail="Quantile forecasts are only available with the recursive strategy")
+    if getattr(model, 'direct_booster', None) is None:
+        raise HTTPException(status_code=400, detail="Model has no direct forecasts; train it with fit_direct()")
+    if max(item.periods for item in direct) > model.direct_periods:
+        raise HTTPException(status_code=400, detail=f"The direct model forecasts at most {model.direct_periods} periods")
+
+def quantile_values(model: 'BaseForecaster', values: 'np.ndarray') -> Dict[str, float]:
+    """Quantile forecasts of one step keyed by label, e.g. ``p10``."""
+    from ..models.xgboost_forecaster import quantile_label
+    return {quantile_label(q): float(value) for q, value in zip(model.quantiles, values)}
+
+async def forecast_coalesced(model: 'BaseForecaster', requests: List[PredictionRequest]) -> List['np.ndarray']:
+    """Run a coalesced batch of /predict requests as one job on the pool."""
+    quantities = await offload(forecast_matrix, model, requests)
+    return [quantities[i, :item.periods] for i, item in enumerate(requests)]
+
+# Concurrent /predict requests for the same model arriving within the window
+# share one recursive forecast: one booster call per step for the whole batch
+coalescer = RequestCoalescer(
+    forecast_coalesced,
+    max_batch_size=int(os.getenv("PREDICT_MAX_BATCH", "64")),
+    max_wait=float(os.getenv("PREDICT_BATCH_WINDOW_MS", "2")) / 1000
+)
+
+def lookup_table(model: 'BaseForecaster', request: PredictionRequest) -> Optional['np.ndarray']:
+    """Answer from the model's precomputed forecast table, if it has one covering the request."""
+    table = getattr(model, 'table', None)
+    if table is None:
+        return None
+    return table.lookup(
+        request.current_month, request.last_quantity, request.rate, request.freight_cost, request.periods
+    )
+
 @app.post("/predict", response_model=List[PredictionResponse])
 async def predict(request: PredictionRequest):
     """Generate demand forecast."""
+    model = await resolve_model(request.model, request.version)
+    if not hasattr(model, 'forecast_future_batch'):
+        raise HTTPException(status_code=400, detail=f"Model '{request.model}' has its own forecast endpoint")
+    if request.quantiles:
+        require_quantiles(model)
+    require_strategy(model, [request])
     try:
         logger.info(f"Prediction request for {request.periods} periods")
         
-        # Create last known data
-        last_known = pd.Series({
-            'quantity': request.last_quantity,
-            'lag_1': request.last_quantity,
-            'posting_month': request.current_month,
-            'rate': request.rate,
-            'u_frt': request.freight_cost
-        })
+        # Quantiles come with their own booster call per step, outside the cache and coalescer
+        if request.quantiles:
+            quantities, quantile_predictions = await offload(forecast_matrix, model, [request], True)
+            forecast = model.to_forecast_frame(quantities[0, :request.periods])
+            return [
+                PredictionResponse(
+                    date=row['date'].strftime('%Y-%m-%d'),
+                    predicted_quantity=float(row['predicted_quantity']),
+                    quantity_basis=QUANTITY_BASIS[request.strategy],
+                    model='XGBoost',
+                    quantiles=quantile_values(model, quantile_predictions[0, j])
+                )
+                for j, row in forecast.iterrows()
+            ]
         
-        # Generate forecast
-        forecast = model.forecast_future(last_known, periods=request.periods)
+        # Generate forecast, reusing any cached horizon at least as long
+        cache_key = forecast_cache.make_key(request, model.version)
+        predictions = forecast_cache.get(cache_key, request.periods)
+        if predictions is None and not request.exact and request.strategy == 'recursive':
+            predictions = lookup_table(model, request)
+        if predictions is None:
+            predictions = await coalescer.submit(model, request)
+            forecast_cache.put(cache_key, predictions)
+        forecast = model.to_forecast_frame(predictions)
         
         # Convert to response format
         response = [
             PredictionResponse(
                 date=row['date'].strftime('%Y-%m-%d'),
                 predicted_quantity=float(row['predicted_quantity']),
+                quantity_basis=QUANTITY_BASIS[request.strategy],
                 model='XGBoost'
             )
             for _, row in forecast.iterrows()
@@ -83,44 +306,233 @@ async def predict(request: PredictionRequest):
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/upload-and-predict")
-async def upload_and_predict(file: UploadFile = File(...), periods: int = 6):
-    """Upload data file and generate predictions."""
+def forecast_batch(model: 'BaseForecaster', request: BatchPredictionRequest) -> List[BatchPredictionResponse]:
+    """Batch forecast and response assembly (CPU-bound)."""
+    quantile_predictions = None
+    if any(item.quantiles for item in request.series):
+        quantities, quantile_predictions = forecast_matrix(model, request.series, quantiles=True)
+    else:
+        quantities = forecast_matrix(model, request.series)
+    dates = model.to_forecast_frame(quantities[0])['date'].dt.strftime('%Y-%m-%d').to_numpy()
+    
+    # Convert to response format, trimming each series to its own horizon
+    return [
+        BatchPredictionResponse(
+            series=i,
+            forecast=[
+                PredictionResponse(
+                    date=dates[j],
+                    predicted_quantity=float(quantities[i, j]),
+                    quantity_basis=QUANTITY_BASIS[item.strategy],
+                    model='XGBoost',
+                    quantiles=quantile_values(model, quantile_predictions[i, j]) if item.quantiles else None
+                )
+                for j in range(item.periods)
+            ]
+        )
+        for i, item in enumerate(request.series)
+    ]
+
+@app.post("/predict/batch", response_model=List[BatchPredictionResponse])
+async def predict_batch(request: BatchPredictionRequest):
+    """Generate demand forecasts for many series in one pass."""
+    model = await resolve_model(request.model, request.version)
+    if not hasattr(model, 'forecast_future_batch'):
+        raise HTTPException(status_code=400, detail=f"Model '{request.model}' has its own forecast endpoint")
+    if any(item.quantiles for item in request.series):
+        require_quantiles(model)
+    require_strategy(model, request.series)
     try:
-        # Read uploaded file
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
+        logger.info(f"Batch prediction request for {len(request.series)} series")
+        return await offload(forecast_batch, model, request)
         
-        # Process data
-        processed_df = processor.process(df)
-        
-        # Get last known values
-        last_row = processed_df.iloc[-1]
-        
-        # Generate forecast
-        forecast = model.forecast_future(last_row, periods=periods)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def spool_upload(file: UploadFile, suffix: str) -> str:
+    """Copy an upload to a temporary file one chunk at a time."""
+    written = 0
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+                    )
+                spool.write(chunk)
+        except BaseException:
+            os.unlink(spool.name)
+            raise
+    return spool.name
+
+def forecast_from_file(model: 'BaseForecaster', path: str, file_format: str, periods: int) -> 'pd.DataFrame':
+    """Parse, process and forecast an uploaded file (CPU-bound)."""
+    from ..data.loader import read_table
+    
+    df = read_table(path, file_format)
+    
+    # Process data
+    processed_df = get_processor().process(df)
+    
+    # Get last known values
+    last_row = processed_df.iloc[-1]
+    
+    # Generate forecast
+    return model.forecast_future(last_row, periods=periods)
+
+@app.post("/upload-and-predict")
+async def upload_and_predict(file: UploadFile = File(...), periods: int = Query(default=6, ge=1, le=12),
+                             model: Optional[str] = None, version: Optional[str] = None):
+    """Upload an xlsx, CSV or Parquet file and generate predictions."""
+    from ..data.loader import detect_format
+    
+    try:
+        file_format = detect_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    forecaster = await resolve_model(model, version)
+    if not hasattr(forecaster, 'forecast_future'):
+        raise HTTPException(status_code=400, detail=f"Model '{model}' has its own forecast endpoint")
+    
+    # Spool to disk without holding the whole upload in memory
+    path = await spool_upload(file, os.path.splitext(file.filename)[1])
+    
+    try:
+        # Parse and forecast on the inference pool
+        forecast = await offload(forecast_from_file, forecaster, path, file_format, periods)
         
         return {
             "status": "success",
             "forecast": forecast.to_dict(orient='records')
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload and predict error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.unlink(path)
+
+def forecast_hierarchy_node(model: 'BaseForecaster', node: str, periods: int, method: str) -> HierarchyForecastResponse:
+    """Reconciled node forecast; reconciles the whole hierarchy on first use of a method (CPU-bound)."""
+    forecast = model.forecast_node(node, periods=periods, method=method)
+    return HierarchyForecastResponse(
+        node=node,
+        level=model.level_of(node),
+        method=method,
+        children=model.children(node),
+        forecast=[
+            PredictionResponse(
+                date=row['date'].strftime('%Y-%m-%d'),
+                predicted_quantity=float(row['predicted_quantity']),
+                quantity_basis='month_total',
+                model='XGBoost-Hierarchical'
+            )
+            for _, row in forecast.iterrows()
+        ]
+    )
+
+@app.get("/hierarchy/forecast", response_model=HierarchyForecastResponse)
+async def hierarchy_forecast(node: str = "total", periods: int = Query(default=6, ge=1, le=12),
+                             method: str = Query(default="mint", pattern="^(bottom_up|ols|structural|mint)$"),
+                             version: Optional[str] = None):
+    """Forecast any node of the region / LOB / customer hierarchy, reconciled across levels."""
+    model = await resolve_model("hierarchical", version)
+    try:
+        return await offload(forecast_hierarchy_node, model, node, periods, method)
+        
+    except HTTPException:
+        raise
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Hierarchy forecast error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/models")
+# Display name of the per-series statistical models in responses
+SERIES_MODELS = {"arima": "ARIMA", "prophet": "Prophet"}
+
+def forecast_one_series(model: 'BaseForecaster', name: str, series: str, periods: int) -> SeriesForecastResponse:
+    """Forecast of one series from a per-series model's precomputed forecasts."""
+    forecast = model.forecast_series(series, periods=periods)
+    return SeriesForecastResponse(
+        series=series,
+        status=model.fits[series].status,
+        forecast=[
+            PredictionResponse(
+                date=row['date'].strftime('%Y-%m-%d'),
+                predicted_quantity=float(row['predicted_quantity']),
+                quantity_basis='month_total',
+                model=SERIES_MODELS[name]
+            )
+            for _, row in forecast.iterrows()
+        ]
+    )
+
+@app.get("/series/forecast", response_model=SeriesForecastResponse)
+async def series_forecast(series: str, periods: int = Query(default=6, ge=1, le=12),
+                          model: str = Query(default="arima", pattern="^(arima|prophet)$"),
+                          version: Optional[str] = None):
+    """Forecast one customer series with its own ARIMA or Prophet model."""
+    forecaster = await resolve_model(model, version)
+    try:
+        return await offload(forecast_one_series, forecaster, model, series, periods)
+        
+    except HTTPException:
+        raise
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Series forecast error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats():
+    """Forecast cache hit/miss counters."""
+    return forecast_cache.stats()
+
+@app.get("/coalescer/stats", response_model=CoalescerStatsResponse)
+async def coalescer_stats():
+    """Micro-batching of /predict: batch sizes, throughput and latency."""
+    return coalescer.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Request, pipeline stage and inference metrics in the Prometheus text format."""
+    return Response(content=METRICS.render(), media_type=CONTENT_TYPE)
+
+@app.get("/models", response_model=ModelsResponse)
 async def list_models():
-    """List available models."""
+    """List model artifacts and the models currently in memory."""
+    available = await run_in_threadpool(registry.available)
     return {
-        "available_models": ["XGBoost", "Prophet", "ARIMA"],
-        "default_model": "XGBoost"
+        "available_models": available,
+        "default_model": registry.default_model,
+        "loaded_models": registry.loaded()
     }
 
+@app.post("/models/reload", response_model=ModelsResponse)
+async def reload_models():
+    """Rescan the model directory now and hot swap any new latest versions."""
+    await run_in_threadpool(registry.refresh, True)
+    return await list_models()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,262 @@
+"""Registry of versioned model artifacts."""
+
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+if TYPE_CHECKING:
+    from ..models.base import BaseForecaster
+
+# Forecaster class for each model name, imported when first loaded so the
+# API starts without pulling in xgboost and scikit-learn
+MODEL_TYPES = {
+    'xgboost': ('..models.xgboost_forecaster', 'XGBoostForecaster'),
+    'hierarchical': ('..models.hierarchy', 'HierarchicalForecaster'),
+    'arima': ('..models.arima_forecaster', 'ARIMAForecaster'),
+    'prophet': ('..models.prophet_forecaster', 'ProphetForecaster')
+}
+# Artifact formats, preferred first when a version exists in both
+ARTIFACT_SUFFIXES = ('.ubj', '.pkl')
+# Written last by XGBoostForecaster.save_native; a .ubj without one is incomplete
+MANIFEST_SUFFIX = '.manifest.json'
+LEGACY_VERSION = 'default'
+
+
+def load_artifact(name: str, path: Path) -> 'BaseForecaster':
+    """Load one artifact into a new forecaster of its model type."""
+    module_name, class_name = MODEL_TYPES[name]
+    forecaster_class = getattr(importlib.import_module(module_name, __package__), class_name)
+    forecaster = forecaster_class()
+    forecaster.load(str(path))
+    return forecaster
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, versioned forecasters from a model directory.
+
+    Artifacts are laid out as ``<model_dir>/<name>/<version>.ubj`` (native,
+    with its manifest) or ``.pkl``; a flat ``<model_dir>/<name>_model.ubj``
+    or ``.pkl`` is registered as version ``default``. The native file wins
+    when a version exists in both formats. A native file is only
+    registered once its manifest exists, since the manifest is written last.
+    Versions of a model are ordered by modification time and the newest one
+    is served when no version is requested.
+
+    Models are loaded on first use and kept in an LRU of at most
+    ``max_loaded`` entries; the model currently served as latest is never
+    evicted. The directory is rescanned at most every ``refresh_interval``
+    seconds: when a newer artifact appears it is loaded on a background
+    thread and swapped in with a single reference assignment, so requests
+    keep being served by the previous model until the new one is ready,
+    and requests already holding it finish on it.
+    """
+
+    def __init__(self, model_dir: str = "models", max_loaded: int = 4,
+                 refresh_interval: float = 30.0, default_model: str = 'xgboost',
+                 loader: Callable[[str, Path], 'BaseForecaster'] = load_artifact,
+                 clock: Callable[[], float] = time.monotonic):
+        self.model_dir = Path(model_dir)
+        self.max_loaded = max_loaded
+        self.refresh_interval = refresh_interval
+        self.default_model = default_model
+        self._loader = loader
+        self._clock = clock
+        self._artifacts: Dict[str, Dict[str, Path]] = {}
+        self._scanned_at = None
+        self._loaded: 'OrderedDict[Tuple[str, str], BaseForecaster]' = OrderedDict()
+        self._latest: Dict[str, Tuple[str, 'BaseForecaster']] = {}
+        self._swapping = set()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def scan(self) -> Dict[str, Dict[str, Path]]:
+        """Artifacts per model name, versions ordered oldest to newest."""
+        found = {}
+        if self.model_dir.is_dir():
+            # Least preferred format first, so preferred files overwrite it
+            for suffix in reversed(ARTIFACT_SUFFIXES):
+                for path in self.model_dir.glob(f"*_model{suffix}"):
+                    if self._complete(path):
+                        found[(path.name[:-len(f"_model{suffix}")], LEGACY_VERSION)] = path
+                for path in self.model_dir.glob(f"*/*{suffix}"):
+                    if self._complete(path):
+                        found[(path.parent.name, path.stem)] = path
+
+        artifacts = {}
+        for (name, version), path in sorted(found.items(), key=lambda item: (item[1].stat().st_mtime, item[0])):
+            if name in MODEL_TYPES:
+                artifacts.setdefault(name, {})[version] = path
+        return artifacts
+
+    @staticmethod
+    def _complete(path: Path) -> bool:
+        """Whether an artifact is fully written: a native file needs its manifest."""
+        return path.suffix != '.ubj' or path.with_name(path.stem + MANIFEST_SUFFIX).exists()
+
+    def available(self) -> Dict[str, List[str]]:
+        """Versions of every model, oldest to newest."""
+        self.refresh()
+        with self._lock:
+            return {name: list(versions) for name, versions in self._artifacts.items()}
+
+    def loaded(self) -> List[str]:
+        """Loaded models as ``name:version``, least recently used first."""
+        with self._lock:
+            return [f"{name}:{version}" for name, version in self._loaded]
+
+    def refresh(self, force: bool = False, block: bool = False):
+        """
+        Rescan the directory and hot swap models whose latest version changed.
+
+        Args:
+            force: Rescan even if ``refresh_interval`` has not elapsed
+            block: Load new latest versions on this thread instead of in the background
+        """
+        if self._due(force):
+            self._rescan(block)
+
+    def _due(self, force: bool = False) -> bool:
+        """Claim the next rescan if ``refresh_interval`` has elapsed since the last one."""
+        now = self._clock()
+        with self._lock:
+            if not force and self._scanned_at is not None and now - self._scanned_at < self.refresh_interval:
+                return False
+            self._scanned_at = now
+            return True
+
+    def _rescan(self, block: bool = False):
+        artifacts = self.scan()
+        with self._lock:
+            self._artifacts = artifacts
+
+        for name, versions in artifacts.items():
+            newest = next(reversed(versions))
+            with self._lock:
+                current = self._latest.get(name)
+                if current is None or current[0] == newest or name in self._swapping:
+                    continue
+                self._swapping.add(name)
+            logger.info(f"New {name} artifact {newest}; swapping in")
+            if block:
+                self._swap(name, newest)
+            else:
+                threading.Thread(target=self._swap, args=(name, newest), daemon=True).start()
+
+    def _swap(self, name: str, version: str):
+        try:
+            model = self._load(name, version)
+            with self._lock:
+                self._latest[name] = (version, model)
+            self._evict()
+        except Exception as e:
+            logger.error(f"Could not load {name} version {version}: {e}")
+        finally:
+            with self._lock:
+                self._swapping.discard(name)
+
+    def get_loaded(self, name: Optional[str] = None, version: Optional[str] = None) -> Optional['BaseForecaster']:
+        """
+        Return a model if it is already in memory, without touching disk.
+
+        When a rescan is due it runs on a background thread, so new
+        versions are swapped in for later calls without delaying this one.
+        The first scan is left to ``get``, which needs its result.
+        """
+        name = name or self.default_model
+        with self._lock:
+            scanned = self._scanned_at is not None
+        if scanned and self._due():
+            threading.Thread(target=self._rescan, daemon=True).start()
+        with self._lock:
+            if version is None:
+                latest = self._latest.get(name)
+                if latest is None:
+                    return None
+                version, model = latest
+            else:
+                model = self._loaded.get((name, version))
+                if model is None:
+                    return None
+            if (name, version) in self._loaded:
+                self._loaded.move_to_end((name, version))
+            return model
+
+    def get(self, name: Optional[str] = None, version: Optional[str] = None) -> 'BaseForecaster':
+        """
+        Return a model, loading it on first use.
+
+        Args:
+            name: Model name; the default model when omitted
+            version: Artifact version; the latest when omitted
+
+        Returns:
+            Loaded forecaster
+
+        Raises:
+            LookupError: If no matching artifact exists
+        """
+        name = name or self.default_model
+        self.refresh()
+
+        model = self.get_loaded(name, version)
+        if model is not None:
+            return model
+
+        with self._lock:
+            versions = self._artifacts.get(name)
+        if not versions:
+            raise LookupError(f"No artifacts for model '{name}'")
+        if version is None:
+            latest_version = next(reversed(versions))
+            model = self._load(name, latest_version)
+            with self._lock:
+                self._latest.setdefault(name, (latest_version, model))
+                model = self._latest[name][1]
+        elif version not in versions:
+            raise LookupError(f"Model '{name}' has no version '{version}'")
+        else:
+            model = self._load(name, version)
+
+        self._evict()
+        return model
+
+    def _load(self, name: str, version: str) -> 'BaseForecaster':
+        """Load an artifact once, even under concurrent first requests."""
+        key = (name, version)
+        with self._lock:
+            lock = self._load_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                if key in self._loaded:
+                    self._loaded.move_to_end(key)
+                    return self._loaded[key]
+
+                path = self._artifacts[name][version]
+            logger.info(f"Loading {name} version {version} from {path}")
+            try:
+                model = self._loader(name, path)
+            except Exception:
+                with self._lock:
+                    self._load_locks.pop(key, None)
+                raise
+
+            with self._lock:
+                self._loaded[key] = model
+            return model
+
+    def _evict(self):
+        """Drop least recently used models beyond ``max_loaded``."""
+        with self._lock:
+            pinned = {(name, version) for name, (version, _) in self._latest.items()}
+            for key in list(self._loaded):
+                if len(self._loaded) <= self.max_loaded:
+                    break
+                if key not in pinned:
+                    del self._loaded[key]
+                    self._load_locks.pop(key, None)
+                    logger.info(f"Evicted {key[0]} version {key[1]}")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 
 class PredictionRequest(BaseModel):
     """Request schema for predictions."""
@@ -8,15 +8,75 @@ class PredictionRequest(BaseModel):
     current_month: int = Field(..., ge=1, le=12, description="Current month")
     rate: Optional[float] = Field(default=0.0, description="Current rate")
     freight_cost: Optional[float] = Field(default=0.0, description="Freight cost")
+    model: Optional[str] = Field(default=None, description="Model name; the default model when omitted")
+    version: Optional[str] = Field(default=None, description="Model version; the latest when omitted")
+    exact: bool = Field(default=False, description="Evaluate the model even when the precomputed table covers the request")
+    quantiles: bool = Field(default=False, description="Also return one-step conditional forecast quantiles (P10/P50/P90)")
+    strategy: str = Field(default="recursive", pattern="^(recursive|direct)$", description="Multi-step strategy: recursive, or direct (one model output per horizon)")
 
 class PredictionResponse(BaseModel):
     """Response schema for predictions."""
     date: str
     predicted_quantity: float
+    quantity_basis: str = Field(..., description="What predicted_quantity measures: 'transaction' (the quantity of one order, recursive strategy) or 'month_total' (all orders in the dated month)")
     model: str
+    quantiles: Optional[Dict[str, float]] = Field(default=None, description="Forecast quantiles, e.g. p10, p50, p90")
+
+class BatchPredictionRequest(BaseModel):
+    """Request schema for batch predictions."""
+    series: List[PredictionRequest] = Field(..., min_length=1, max_length=10000, description="Starting state of each series")
+    model: Optional[str] = Field(default=None, description="Model name for the whole batch")
+    version: Optional[str] = Field(default=None, description="Model version for the whole batch")
+
+class BatchPredictionResponse(BaseModel):
+    """Response schema for one series of a batch prediction."""
+    series: int
+    forecast: List[PredictionResponse]
+
+class HierarchyForecastResponse(BaseModel):
+    """Reconciled forecast of one node of the hierarchy."""
+    node: str
+    level: str
+    method: str
+    children: List[str]
+    forecast: List[PredictionResponse]
+
+class SeriesForecastResponse(BaseModel):
+    """Forecast of one series by a per-series statistical model."""
+    series: str
+    status: str
+    forecast: List[PredictionResponse]
 
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
     message: str
-    version: str
\ No newline at end of file
+    version: str
+
+class CacheStatsResponse(BaseModel):
+    """Forecast cache statistics."""
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+class CoalescerStatsResponse(BaseModel):
+    """Micro-batching statistics of /predict."""
+    max_batch_size: int
+    window_ms: float
+    requests: int
+    batches: int
+    mean_batch_size: float
+    throughput_rps: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+
+class ModelsResponse(BaseModel):
+    """Model registry contents."""
+    available_models: Dict[str, List[str]]
+    default_model: str
+    loaded_models: List[str]
@@ -0,0 +1,213 @@
+"""Content-addressed Parquet cache for data pipeline stages."""
+
+import hashlib
+import inspect
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from loguru import logger
+from .loader import read_table
+from ..monitoring.metrics import STAGE_DURATION
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class PipelineCache:
+    """
+    Parquet store of pipeline stage outputs.
+
+    Each stage output is keyed on the hash of its input and a code version
+    (the stage's source plus the processor settings), chained from the
+    hash of the raw input. A rerun loads the latest stage whose key is
+    unchanged and only executes the stages after it.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """Hash a file's contents."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def frame_hash(df: pd.DataFrame) -> str:
+        """Hash a DataFrame's values, index, column names and dtypes."""
+        digest = hashlib.sha256()
+        digest.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def code_version(func: Callable) -> str:
+        """
+        Hash the source of a stage function and the package code it calls.
+
+        Functions, classes and modules referenced by the stage (including
+        inside nested functions and comprehensions), and methods of the
+        same object, are followed recursively as long as they belong to the
+        stage's top-level package. A class contributes its whole source and
+        its methods are followed in turn; a module contributes its source.
+        """
+        owner = getattr(func, '__self__', None)
+        package = getattr(func, '__func__', func).__module__.split('.')[0]
+        sources = []
+        seen = set()
+        pending = [getattr(func, '__func__', func)]
+        while pending:
+            current = pending.pop()
+            if id(current) in seen:
+                continue
+            seen.add(id(current))
+            sources.append(inspect.getsource(current))
+            if inspect.ismodule(current):
+                continue
+            if inspect.isclass(current):
+                for member in vars(current).values():
+                    member = getattr(member, '__func__', getattr(member, 'fget', member))
+                    if inspect.isfunction(member):
+                        pending.append(member)
+                continue
+            for name in PipelineCache._referenced_names(current.__code__):
+                helper = current.__globals__.get(name)
+                if helper is None and owner is not None:
+                    helper = getattr(type(owner), name, None)
+                    helper = getattr(helper, '__func__', helper)
+                if PipelineCache._in_package(helper, package):
+                    pending.append(helper)
+        return hashlib.sha256('\0'.join(sources).encode()).hexdigest()
+
+    @staticmethod
+    def _referenced_names(code) -> List[str]:
+        """Global and attribute names used by a code object and the code objects nested in it."""
+        names = list(code.co_names)
+        for const in code.co_consts:
+            if inspect.iscode(const):
+                names.extend(PipelineCache._referenced_names(const))
+        return names
+
+    @staticmethod
+    def _in_package(obj, package: str) -> bool:
+        if inspect.ismodule(obj):
+            module = obj.__name__
+        elif inspect.isfunction(obj) or inspect.isclass(obj):
+            module = obj.__module__
+        else:
+            return False
+        return module.split('.')[0] == package
+
+    def stage_key(self, input_key: str, name: str, func: Callable, params: str = '') -> str:
+        """Key for a stage's output given its input key."""
+        parts = [input_key, name, self.code_version(func), params]
+        return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+    def _path(self, name: str, key: str) -> Path:
+        return self.cache_dir / f"{name}-{key[:32]}.parquet"
+
+    def load(self, name: str, key: str) -> Optional[pd.DataFrame]:
+        """Return a cached stage output, or None if absent."""
+        path = self._path(name, key)
+        if not path.exists():
+            return None
+        return pd.read_parquet(path)
+
+    @staticmethod
+    def storable(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Make a DataFrame representable in Parquet.
+
+        Object columns mixing strings and numbers are converted to strings;
+        everything else is returned untouched.
+        """
+        mixed = [
+            col for col in df.columns
+            if df[col].dtype == object
+            and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed')
+        ]
+        if not mixed:
+            return df
+
+        logger.warning(f"Storing mixed-type columns as strings: {mixed}")
+        df = df.copy()
+        for col in mixed:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return df
+
+    def store(self, name: str, key: str, df: pd.DataFrame) -> bool:
+        """
+        Write a stage output atomically.
+
+        Returns:
+            True if the output was cached
+        """
+        path = self._path(name, key)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            self.storable(df).to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except (pa.ArrowException, OSError) as e:
+            logger.warning(f"Could not cache stage '{name}': {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    def read_raw(self, path: str) -> pd.DataFrame:
+        """Read a raw export, reusing a cached copy when the file is unchanged."""
+        key = self.stage_key(self.file_hash(path), 'raw', read_table)
+        df = self.load('raw', key)
+        if df is not None:
+            logger.info(f"Loaded cached raw data for {path}")
+            return df
+
+        # Normalize up front so a fresh read matches later cached reads
+        df = self.storable(read_table(path))
+        self.store('raw', key, df)
+        return df
+
+    def run(self, stages: List[Tuple[str, Callable]], df: pd.DataFrame, params: str = '') -> pd.DataFrame:
+        """
+        Run pipeline stages, skipping those with a cached output.
+
+        Every executed stage is timed in ``STAGE_DURATION`` under its name,
+        and a reused output under ``<name>_cached``.
+
+        Args:
+            stages: Ordered (name, function) pairs, each DataFrame -> DataFrame
+            df: Input to the first stage
+            params: Settings that change stage behaviour, folded into every key
+
+        Returns:
+            Output of the last stage
+        """
+        keys = []
+        key = self.frame_hash(df)
+        for name, func in stages:
+            key = self.stage_key(key, name, func, params)
+            keys.append(key)
+
+        start = 0
+        for i in reversed(range(len(stages))):
+            load_start = time.perf_counter()
+            cached = self.load(stages[i][0], keys[i])
+            if cached is not None:
+                logger.info(f"Reusing cached output of stage '{stages[i][0]}'")
+                STAGE_DURATION.observe(time.perf_counter() - load_start, stage=f'{stages[i][0]}_cached')
+                df = cached
+                start = i + 1
+                break
+
+        # Outputs are normalized as they are stored, so cold and warm runs agree
+        for (name, func), key in zip(stages[start:], keys[start:]):
+            with STAGE_DURATION.time(stage=name):
+                df = self.storable(func(df))
+            self.store(name, key, df)
+
+        return df
@@ -0,0 +1,75 @@
+"""Processed data stored as Parquet partitions and read back in batches."""
+
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+from loguru import logger
+from .cache import PipelineCache
+
+
+def write_partitions(df: pd.DataFrame, directory: str, rows_per_file: int = 250_000,
+                     prefix: str = 'part') -> List[Path]:
+    """
+    Write processed data as Parquet files of at most ``rows_per_file`` rows.
+
+    Calling this once per chunk of a large dataset, with a different
+    ``prefix`` each time, builds a dataset that never has to fit in memory
+    as a whole. Each file is written atomically.
+
+    Args:
+        df: Processed data
+        directory: Output directory
+        rows_per_file: Largest number of rows per file
+        prefix: File name prefix
+
+    Returns:
+        Paths of the written files
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    df = PipelineCache.storable(df)
+
+    paths = []
+    for i, start in enumerate(range(0, len(df), rows_per_file)):
+        path = directory / f"{prefix}-{i:05d}.parquet"
+        tmp_path = path.with_suffix('.tmp')
+        df.iloc[start:start + rows_per_file].to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        paths.append(path)
+
+    logger.info(f"Wrote {len(df)} rows to {len(paths)} partitions in {directory}")
+    return paths
+
+
+def partition_paths(source: Union[str, Sequence[str]]) -> List[Path]:
+    """Parquet files of a partition directory, or the given list of files, in sorted order."""
+    if isinstance(source, (str, Path)) and Path(source).is_dir():
+        paths = sorted(Path(source).glob('*.parquet'))
+    elif isinstance(source, (str, Path)):
+        paths = [Path(source)]
+    else:
+        paths = sorted(Path(path) for path in source)
+    if not paths:
+        raise ValueError(f"No Parquet partitions found in {source}")
+    return paths
+
+
+def partition_columns(paths: Sequence[Path]) -> List[str]:
+    """Column names of a partitioned dataset, from the first file's schema."""
+    return pq.read_schema(paths[0]).names
+
+
+def iter_batches(paths: Sequence[Path], columns: Optional[Sequence[str]] = None,
+                 batch_size: int = 65_536) -> Iterator[pd.DataFrame]:
+    """
+    Stream partitions as DataFrames of at most ``batch_size`` rows.
+
+    Only the requested columns are decoded, and one batch is held at a
+    time, so memory is bounded by ``batch_size`` rather than the dataset.
+    """
+    for path in paths:
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
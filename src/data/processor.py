@@ -1,13 +1,46 @@
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from typing import Callable, List, Optional, Sequence, Tuple
 from loguru import logger
+from .cache import PipelineCache
+from .features import grouped_lag_features
+from .volatility import StreamingMoments
+from ..monitoring.metrics import STAGE_DURATION
 
 class DataProcessor:
     """Process and prepare data for forecasting models."""
     
-    def __init__(self):
+    # Quantity lags and rolling mean windows built by engineer_features
+    LAGS = (1, 2)
+    ROLLING_WINDOWS = (3,)
+    
+    # Rows per chunk when aggregating volatility statistics
+    VOLATILITY_CHUNK_SIZE = 1_000_000
+    
+    # Columns always stored as categoricals
+    CATEGORICAL_COLUMNS = ('lob', 'region', 'bp_type', 'product_category')
+    
+    # Compact mode: text columns with at most this share of distinct values
+    # become categoricals
+    CATEGORY_MAX_RATIO = 0.5
+    
+    def __init__(self, entity_columns: Tuple[str, ...] = ('customer/vendor_code',),
+                 volatility_thresholds: Sequence[float] = (0.5,),
+                 compact: bool = False):
+        """
+        Args:
+            entity_columns: Columns identifying one series for lag features,
+                e.g. ``('customer/vendor_code', 'itemcode')``. Columns absent
+                from the data are ignored.
+            volatility_thresholds: Coefficient-of-variation cut-offs; the
+                volatility flag counts how many a customer exceeds
+            compact: Use memory-compact dtypes (downcast numerics,
+                categorical text, integer day-of-week codes)
+        """
         self.feature_columns = None
+        self.entity_columns = tuple(entity_columns)
+        self.volatility_thresholds = tuple(sorted(volatility_thresholds))
+        self.compact = compact
         
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean raw data."""
@@ -21,7 +54,7 @@ class DataProcessor:
         df = df.drop(columns=columns_to_drop, errors='ignore')
         
         # Clean column names
-        df.columns = df.columns.str.strip().str.replace(' ', '_').str.lower()
+        df.columns = self.normalize_columns(df.columns)
         
         # Remove duplicates
         df = df.drop_duplicates()
@@ -29,6 +62,11 @@ class DataProcessor:
         logger.info(f"Cleaned data shape: {df.shape}")
         return df
     
+    @staticmethod
+    def normalize_columns(columns: pd.Index) -> pd.Index:
+        """Snake-case raw column names."""
+        return columns.str.strip().str.replace(' ', '_').str.lower()
+    
     def convert_datatypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """Convert columns to appropriate data types."""
         logger.info("Converting data types")
@@ -47,11 +85,13 @@ class DataProcessor:
             df['rate'] = df['rate'].astype(float)
         
         # Categorical columns
-        categorical_cols = ['lob', 'region', 'bp_type', 'product_category']
-        for col in categorical_cols:
+        for col in self.CATEGORICAL_COLUMNS:
             if col in df.columns:
                 df[col] = df[col].astype('category')
         
+        if self.compact:
+            df = self.compact_columns(df)
+        
         return df
     
     def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -60,7 +100,10 @@ class DataProcessor:
         
         # Time-based features
         if 'posting_date' in df.columns:
-            df['posting_day_of_week'] = df['posting_date'].dt.day_name()
+            if self.compact:
+                df['posting_day_of_week'] = df['posting_date'].dt.dayofweek
+            else:
+                df['posting_day_of_week'] = df['posting_date'].dt.day_name()
             df['posting_month'] = df['posting_date'].dt.month
             df['posting_year'] = df['posting_date'].dt.year
             df['posting_quarter'] = df['posting_date'].dt.quarter
@@ -71,14 +114,58 @@ class DataProcessor:
         if 'so_due_date' in df.columns and 'so_creation_date' in df.columns:
             df['lead_time'] = (df['so_due_date'] - df['so_creation_date']).dt.days
         
-        # Lag features for time series
+        # Lag features per entity, in posting order
         if 'quantity' in df.columns:
-            df['lag_1'] = df['quantity'].shift(1)
-            df['lag_2'] = df['quantity'].shift(2)
-            df['rolling_mean_3'] = df['quantity'].rolling(window=3).mean()
+            lag_features = self.lag_features(df)
+            for col in lag_features.columns:
+                df[col] = lag_features[col]
+        
+        if self.compact:
+            df = self.compact_columns(df)
+        
+        return df
+    
+    def compact_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast numeric columns and turn low-cardinality text into categoricals.
+        
+        Integers shrink to the smallest type holding their range and floats
+        become float32, except integral floats beyond 2**24 (IDs stored as
+        floats), which float32 cannot hold exactly. Boolean, datetime and
+        categorical columns are left as they are.
+        """
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_integer_dtype(series):
+                df[col] = pd.to_numeric(series, downcast='integer')
+            elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+                values = series.to_numpy()
+                finite = values[np.isfinite(values)]
+                is_large_id = len(finite) > 0 and np.abs(finite).max() > 2 ** 24 and (finite % 1 == 0).all()
+                if not is_large_id:
+                    df[col] = series.astype(np.float32)
+            elif series.dtype == object and series.nunique() <= self.CATEGORY_MAX_RATIO * len(series):
+                df[col] = series.astype('category')
         
         return df
     
+    def entity_keys(self, df: pd.DataFrame) -> List[str]:
+        """Entity columns present in the data."""
+        return [col for col in self.entity_columns if col in df.columns]
+    
+    def lag_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Per-entity quantity lags and rolling means, aligned to ``df``."""
+        return grouped_lag_features(
+            df,
+            value_column='quantity',
+            group_columns=self.entity_keys(df),
+            order_column='posting_date' if 'posting_date' in df.columns else None,
+            lags=self.LAGS,
+            windows=self.ROLLING_WINDOWS
+        )
+    
     def add_volatility_flag(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add customer volatility indicator."""
         logger.info("Calculating volatility flags")
@@ -86,35 +173,72 @@ class DataProcessor:
         if 'customer/vendor_code' not in df.columns or 'quantity' not in df.columns:
             return df
         
-        volatility_df = df.groupby('customer/vendor_code')['quantity'].agg(
-            ['mean', 'std']
-        ).reset_index()
+        # Aggregate chunk by chunk, then look the flag up per row
+        moments = StreamingMoments()
+        for start in range(0, len(df), self.VOLATILITY_CHUNK_SIZE):
+            chunk = df.iloc[start:start + self.VOLATILITY_CHUNK_SIZE]
+            moments.update(chunk['customer/vendor_code'], chunk['quantity'])
         
-        volatility_df['cv'] = volatility_df['std'] / volatility_df['mean']
-        volatility_df['volatility_flag'] = (volatility_df['cv'] > 0.5).astype(int)
-        
-        df = df.merge(
-            volatility_df[['customer/vendor_code', 'volatility_flag']], 
-            on='customer/vendor_code', 
-            how='left'
+        df['volatility_flag'] = df['customer/vendor_code'].map(
+            moments.flags(self.volatility_thresholds)
         )
         
         return df
     
-    def process(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Full processing pipeline."""
-        df = self.clean_data(df)
-        df = self.convert_datatypes(df)
-        df = self.engineer_features(df)
-        df = self.add_volatility_flag(df)
-        
+    def drop_incomplete(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows missing the target or posting date."""
         # Drop rows with NaN in target or critical features only
         # Don't drop all NaN values as lag features will have some NaN
         critical_columns = ['quantity']
         if 'posting_date' in df.columns:
             critical_columns.append('posting_date')
         
-        df = df.dropna(subset=critical_columns)
+        return df.dropna(subset=critical_columns)
+    
+    def stages(self) -> List[Tuple[str, Callable[[pd.DataFrame], pd.DataFrame]]]:
+        """Ordered processing stages."""
+        return [
+            ('clean', self.clean_data),
+            ('dtypes', self.convert_datatypes),
+            ('features', self.engineer_features),
+            ('volatility', self.add_volatility_flag)
+        ]
+    
+    def cache_params(self) -> str:
+        """Processor settings that change stage outputs, for cache keys."""
+        return repr(sorted(
+            (name, value) for name, value in vars(self).items()
+            if name != 'feature_columns'
+        ))
+    
+    def process(self, df: pd.DataFrame, cache: Optional[PipelineCache] = None) -> pd.DataFrame:
+        """
+        Full processing pipeline.
+        
+        Args:
+            df: Raw data
+            cache: Optional stage cache; unchanged stages are loaded from it
+            
+        Returns:
+            Processed data
+        """
+        if self.compact:
+            input_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        
+        if cache is None:
+            for name, stage in self.stages():
+                with STAGE_DURATION.time(stage=name):
+                    df = stage(df)
+        else:
+            df = cache.run(self.stages(), df, params=self.cache_params())
+        
+        if self.compact and 'volatility_flag' in df.columns:
+            df['volatility_flag'] = pd.to_numeric(df['volatility_flag'], downcast='integer')
+        
+        df = self.drop_incomplete(df)
         
         logger.info(f"Final processed data shape: {df.shape}")
+        if self.compact:
+            output_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+            logger.info(f"Memory usage: {input_mb:.2f} MB raw -> {output_mb:.2f} MB processed (compact)")
         return df
\ No newline at end of file
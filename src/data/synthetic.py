@@ -0,0 +1,38 @@
+"""Synthetic transaction exports for benchmarks."""
+
+import numpy as np
+import pandas as pd
+
+
+def scale_export(df: pd.DataFrame, scale: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Enlarge a raw export by replicating it with new customers.
+
+    Each replica gets its own customer codes, jittered quantities and
+    shifted posting dates, so the result has ``scale`` times as many rows
+    and entities with the same column layout and value distributions.
+
+    Args:
+        df: Raw export with the original column names
+        scale: Number of replicas
+        seed: Random seed
+
+    Returns:
+        Synthetic raw export
+    """
+    rng = np.random.default_rng(seed)
+    replicas = []
+    for i in range(scale):
+        replica = df.copy()
+        if 'Customer/Vendor Code' in replica.columns:
+            replica['Customer/Vendor Code'] = replica['Customer/Vendor Code'] + i * 10 ** 9
+        if 'QUANTITY' in replica.columns:
+            jitter = rng.normal(1.0, 0.1, len(replica)).clip(0.5, 1.5)
+            replica['QUANTITY'] = (replica['QUANTITY'] * jitter).round().astype(int)
+        if 'POSTING DATE' in replica.columns:
+            replica['POSTING DATE'] = replica['POSTING DATE'] + pd.to_timedelta(
+                rng.integers(-3, 4, len(replica)), unit='D'
+            )
+        replicas.append(replica)
+
+    return pd.concat(replicas, ignore_index=True)
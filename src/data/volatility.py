@@ -0,0 +1,85 @@
+"""Streaming per-key mean/variance aggregation."""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence
+
+
+class StreamingMoments:
+    """
+    Per-key count, mean and sum of squared deviations, updated chunk by chunk.
+
+    Each chunk is reduced with ``np.bincount`` and folded into the running
+    state with Chan et al.'s parallel form of Welford's update, so memory is
+    bounded by the chunk size plus one row per key, and the result does not
+    depend on how the data was chunked (up to rounding).
+    """
+
+    def __init__(self):
+        self.state: Optional[pd.DataFrame] = None
+
+    def update(self, keys: pd.Series, values: pd.Series) -> 'StreamingMoments':
+        """
+        Fold one chunk into the running statistics.
+
+        Args:
+            keys: Group key of each row; missing keys are skipped
+            values: Value of each row
+
+        Returns:
+            self
+        """
+        codes, uniques = pd.factorize(keys)
+        values = np.asarray(values, dtype=float)
+        valid = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[valid], values[valid]
+        if len(codes) == 0:
+            return self
+
+        count = np.bincount(codes, minlength=len(uniques)).astype(float)
+        mean = np.bincount(codes, weights=values, minlength=len(uniques)) / np.maximum(count, 1)
+        m2 = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=len(uniques))
+
+        present = count > 0
+        batch = pd.DataFrame(
+            {'count': count[present], 'mean': mean[present], 'm2': m2[present]},
+            index=pd.Index(uniques[present], name=keys.name)
+        )
+        self.state = batch if self.state is None else self.combine(self.state, batch)
+        return self
+
+    @staticmethod
+    def combine(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+        """Merge two sets of per-key moments."""
+        index = a.index.union(b.index)
+        a = a.reindex(index, fill_value=0.0)
+        b = b.reindex(index, fill_value=0.0)
+
+        count = a['count'] + b['count']
+        delta = b['mean'] - a['mean']
+        return pd.DataFrame({
+            'count': count,
+            'mean': a['mean'] + delta * b['count'] / count,
+            'm2': a['m2'] + b['m2'] + delta ** 2 * a['count'] * b['count'] / count
+        }, index=index)
+
+    def std(self) -> pd.Series:
+        """Sample standard deviation per key (NaN for single observations)."""
+        count = self.state['count']
+        return np.sqrt(self.state['m2'] / (count - 1)).where(count > 1)
+
+    def cv(self) -> pd.Series:
+        """Coefficient of variation per key."""
+        return self.std() / self.state['mean']
+
+    def flags(self, thresholds: Sequence[float] = (0.5,)) -> pd.Series:
+        """
+        Volatility level per key: how many CV thresholds are exceeded.
+
+        With a single threshold this is a 0/1 flag.
+        """
+        if self.state is None:
+            return pd.Series(dtype=int, name='volatility_flag')
+        cv = self.cv().to_numpy()[:, None]
+        levels = (cv > np.asarray(thresholds, dtype=float)[None, :]).sum(axis=1)
+        return pd.Series(levels, index=self.state.index, name='volatility_flag')
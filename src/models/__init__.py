@@ -2,5 +2,10 @@
 
 from .base import BaseForecaster
 from .xgboost_forecaster import XGBoostForecaster
+from .backtest import WalkForwardBacktester
+from .hierarchy import HierarchicalForecaster
+from .arima_forecaster import ARIMAForecaster
+from .prophet_forecaster import ProphetForecaster
 
-__all__ = ['BaseForecaster', 'XGBoostForecaster']
+__all__ = ['BaseForecaster', 'XGBoostForecaster', 'WalkForwardBacktester', 'HierarchicalForecaster',
+           'ARIMAForecaster', 'ProphetForecaster']
@@ -0,0 +1,47 @@
+"""ARIMA forecaster for demand forecasting."""
+
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+from .statistical import StatisticalForecaster
+
+
+def fit_arima(values: np.ndarray, config: Dict, start_params: Optional[np.ndarray],
+              periods: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a (seasonal) ARIMA model to one monthly series.
+
+    Args:
+        values: Monthly quantities
+        config: ``order``, ``seasonal_order`` and ``trend`` of the model
+        start_params: Parameters to start the optimizer from, if any
+        periods: Months to forecast
+
+    Returns:
+        Fitted parameters, in-sample one-step predictions and the forecast
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    model = ARIMA(
+        values, order=tuple(config['order']), seasonal_order=tuple(config['seasonal_order']),
+        trend=config['trend']
+    )
+    if start_params is not None and len(start_params) != len(model.param_names):
+        start_params = None
+    result = model.fit(start_params=start_params)
+    return result.params, result.fittedvalues, result.forecast(periods)
+
+
+class ARIMAForecaster(StatisticalForecaster):
+    """ARIMA model per customer series, fitted in parallel with statsmodels."""
+
+    @staticmethod
+    def default_config() -> Dict:
+        return {
+            'order': (1, 1, 1),
+            'seasonal_order': (0, 0, 0, 0),
+            'trend': None
+        }
+
+    @staticmethod
+    def fit_function() -> Callable:
+        return fit_arima
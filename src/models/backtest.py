@@ -0,0 +1,205 @@
+"""Walk-forward (rolling-origin) backtesting."""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from loguru import logger
+from . import shared
+from .xgboost_forecaster import FEATURE_COLUMNS, XGBoostForecaster
+
+
+def _fit_fold(config: Dict, feature_columns: List[str], train: Tuple[int, int], origins: Tuple[int, int],
+              horizon: int) -> np.ndarray:
+    """Fit on one contiguous training window and forecast ``horizon`` steps from its origin states."""
+    X, y, states = shared.arrays['X'], shared.arrays['y'], shared.arrays['states']
+    forecaster = XGBoostForecaster(config=config)
+    forecaster.model.fit(X[train[0]:train[1]], y[train[0]:train[1]])
+    forecaster.feature_columns = feature_columns
+    return forecaster._recursive_forecast(states[origins[0]:origins[1]].copy(), horizon)
+
+
+class WalkForwardBacktester:
+    """
+    Rolling-origin evaluation of ``XGBoostForecaster`` over monthly cutoffs.
+
+    Rows are sorted by posting date once, so each fold's training window is
+    a contiguous slice ending before its cutoff and its test window is the
+    slice covering the following ``horizon`` months. Folds are fitted in
+    parallel on a process pool; the feature matrix is placed in shared
+    memory and every worker maps it instead of receiving a copy.
+
+    Each fold forecasts recursively from every entity's last row before
+    the cutoff, as ``forecast_future_batch`` would at that date, so no
+    post-cutoff value reaches the model. Metrics are reported per horizon:
+    horizon ``h`` compares the test rows posted in the ``h``-th month after
+    the cutoff with step ``h`` of their entity's forecast. Test rows of
+    entities without history before the cutoff are not scored.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, n_folds: int = 6, horizon: int = 3,
+                 window_months: Optional[int] = None, min_train_rows: int = 50,
+                 n_workers: Optional[int] = None):
+        """
+        Args:
+            config: XGBoost parameters, as for ``XGBoostForecaster``
+            n_folds: Number of cutoffs, one month apart
+            horizon: Months evaluated after each cutoff
+            window_months: Training window length; expanding when None
+            min_train_rows: Folds with fewer training rows are skipped
+            n_workers: Worker processes; defaults to the CPU count
+        """
+        self.config = config or XGBoostForecaster().config
+        self.n_folds = n_folds
+        self.horizon = horizon
+        self.window_months = window_months
+        self.min_train_rows = min_train_rows
+        self.n_workers = n_workers or os.cpu_count() or 1
+
+    def cutoffs(self, dates: pd.Series) -> List[pd.Timestamp]:
+        """Month-start cutoffs, the last one leaving ``horizon`` months of data."""
+        last_month = dates.max().to_period('M').to_timestamp()
+        first = last_month - pd.DateOffset(months=self.horizon + self.n_folds - 2)
+        return list(pd.date_range(first, periods=self.n_folds, freq='MS'))
+
+    def _fold_slices(self, dates: np.ndarray) -> List[Dict]:
+        """Contiguous train/test row ranges of every fold over sorted dates."""
+        folds = []
+        for cutoff in self.cutoffs(pd.Series(dates)):
+            train_start = 0
+            if self.window_months is not None:
+                window_start = cutoff - pd.DateOffset(months=self.window_months)
+                train_start = int(np.searchsorted(dates, np.datetime64(window_start)))
+            train_end = int(np.searchsorted(dates, np.datetime64(cutoff)))
+            test_end = int(np.searchsorted(dates, np.datetime64(cutoff + pd.DateOffset(months=self.horizon))))
+
+            if train_end - train_start < self.min_train_rows or test_end == train_end:
+                logger.warning(f"Skipping fold at {cutoff.date()}: not enough data")
+                continue
+            folds.append({
+                'cutoff': cutoff,
+                'train': (train_start, train_end),
+                'test': (train_end, test_end)
+            })
+        return folds
+
+    def _worker_config(self) -> Dict:
+        """Model config with xgboost threads split across worker processes."""
+        config = dict(self.config)
+        config.setdefault('n_jobs', max(1, (os.cpu_count() or 1) // self.n_workers))
+        return config
+
+    def _fold_origins(self, df: pd.DataFrame, folds: List[Dict], codes: np.ndarray,
+                      date_column: str) -> np.ndarray:
+        """
+        Forecast origins of every fold, stacked into one state matrix.
+
+        Sets each fold's ``origins`` (its slice of the matrix), and for
+        every test row the index of its entity's origin (-1 without one)
+        and its month step after the cutoff.
+        """
+        months = pd.DatetimeIndex(df[date_column]).to_period('M')
+        frames, offset = [], 0
+        for fold in folds:
+            train_end = fold['train'][1]
+            start, end = fold['test']
+            # Last row of every entity before the cutoff, whatever the training window
+            last_rows = pd.Series(np.arange(train_end)).groupby(codes[:train_end]).last()
+            origin_of = last_rows.index.get_indexer(codes[start:end])
+            origins = df.iloc[last_rows.to_numpy()].copy()
+            # Step 1 is the cutoff month
+            origins['posting_month'] = (fold['cutoff'].month - 2) % 12 + 1
+            frames.append(origins)
+
+            cutoff_month = fold['cutoff'].to_period('M')
+            fold['origins'] = (offset, offset + len(origins))
+            fold['origin_of'] = origin_of
+            fold['steps'] = np.asarray([(m - cutoff_month).n + 1 for m in months[start:end]])
+            offset += len(origins)
+
+        if not frames:
+            return np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32)
+        return np.ascontiguousarray(XGBoostForecaster()._batch_state(pd.concat(frames)))
+
+    def run(self, df: pd.DataFrame, date_column: str = 'posting_date',
+            entity_columns: Sequence[str] = ('customer/vendor_code',)) -> Dict[str, pd.DataFrame]:
+        """
+        Backtest on processed data.
+
+        Args:
+            df: Processed data with features, ``quantity`` and the date column
+            date_column: Column defining time order
+            entity_columns: Columns identifying a series; absent ones are ignored
+
+        Returns:
+            Dictionary with ``folds`` (metrics per cutoff and horizon) and
+            ``horizons`` (metrics per horizon pooled over folds)
+        """
+        df = df.dropna(subset=[date_column, 'quantity']).sort_values(date_column, kind='stable')
+        evaluator = XGBoostForecaster()
+        X_frame, y_series = evaluator.prepare_features(df)
+        X = np.ascontiguousarray(X_frame.to_numpy(dtype=np.float32))
+        y = y_series.to_numpy(dtype=np.float32)
+        dates = df[date_column].to_numpy(dtype='datetime64[ns]')
+        keys = [col for col in entity_columns if col in df.columns]
+        if keys:
+            codes = df.groupby(keys, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+        else:
+            codes = np.zeros(len(df), dtype=np.int64)
+
+        folds = self._fold_slices(dates)
+        states = self._fold_origins(df, folds, codes, date_column)
+        logger.info(f"Backtesting {len(folds)} folds on {self.n_workers} workers")
+        forecasts = self._fit_folds(folds, X, y, states, evaluator.feature_columns)
+
+        records, pooled = [], {}
+        for fold, forecast in zip(folds, forecasts):
+            start, end = fold['test']
+            origin_of, steps = fold['origin_of'], fold['steps']
+            for h in range(1, self.horizon + 1):
+                mask = (steps == h) & (origin_of >= 0)
+                if mask.sum() < 2:
+                    continue
+                y_true_h, y_pred_h = y[start:end][mask], forecast[origin_of[mask], h - 1]
+                pooled.setdefault(h, ([], []))
+                pooled[h][0].append(y_true_h)
+                pooled[h][1].append(y_pred_h)
+                records.append({
+                    'cutoff': fold['cutoff'],
+                    'horizon': h,
+                    'n_train': fold['train'][1] - fold['train'][0],
+                    'n_test': int(mask.sum()),
+                    **evaluator.calculate_metrics(y_true_h, y_pred_h)
+                })
+
+        horizons = pd.DataFrame([
+            {
+                'horizon': h,
+                'n_test': int(sum(len(part) for part in y_true)),
+                **evaluator.calculate_metrics(np.concatenate(y_true), np.concatenate(y_pred))
+            }
+            for h, (y_true, y_pred) in sorted(pooled.items())
+        ])
+
+        return {'folds': pd.DataFrame(records), 'horizons': horizons}
+
+    def _fit_folds(self, folds: List[Dict], X: np.ndarray, y: np.ndarray, states: np.ndarray,
+                   feature_columns: List[str]) -> List[np.ndarray]:
+        """Fit and forecast every fold, on a process pool when more than one worker is used."""
+        config = self._worker_config()
+        arrays = {'X': X, 'y': y, 'states': states}
+
+        if self.n_workers == 1 or len(folds) <= 1:
+            with shared.local(arrays):
+                return [_fit_fold(config, feature_columns, fold['train'], fold['origins'], self.horizon) for fold in folds]
+
+        with shared.publish(arrays) as specs:
+            with ProcessPoolExecutor(
+                max_workers=self.n_workers, initializer=shared.attach, initargs=(specs,)
+            ) as executor:
+                futures = [
+                    executor.submit(_fit_fold, config, feature_columns, fold['train'], fold['origins'], self.horizon)
+                    for fold in folds
+                ]
+                return [future.result() for future in futures]
@@ -0,0 +1,58 @@
+"""Direct multi-horizon forecasting: one multi-output booster over all horizon steps."""
+
+import numpy as np
+import xgboost
+from typing import Callable, Dict, Tuple
+from xgboost import Booster, DMatrix, XGBRegressor
+
+
+def masked_squared_error(known: np.ndarray) -> Callable[[np.ndarray, DMatrix], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Squared-error objective that ignores unknown targets.
+
+    XGBoost rejects NaN labels, so unknown targets are filled in the
+    DMatrix and given zero gradient and hessian here: they add nothing
+    to any split or leaf of their horizon's trees.
+
+    Args:
+        known: Mask of known targets, shape (n_rows, n_horizons)
+    """
+    hess = known.astype(np.float32).ravel()
+
+    def objective(predt: np.ndarray, dtrain: DMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        grad = (predt.reshape(known.shape) - dtrain.get_label().reshape(known.shape)).ravel()
+        return grad * hess, hess
+
+    return objective
+
+
+def fit_multi_output(config: Dict, X: np.ndarray, Y: np.ndarray) -> Booster:
+    """
+    Fit one booster with an output per column of ``Y``.
+
+    With ``one_output_per_tree``, every round grows one tree per horizon
+    from that horizon's own gradients, so each output is trained as a
+    separate booster would be, while a single ``inplace_predict`` returns
+    all horizons as columns.
+
+    Args:
+        config: XGBRegressor parameters
+        X: Float32 training inputs
+        Y: Targets, one column per horizon, NaN where unknown
+
+    Returns:
+        Booster with one output per horizon
+    """
+    known = np.isfinite(Y)
+    regressor = XGBRegressor(**config)
+    params = {key: value for key, value in regressor.get_xgb_params().items() if value is not None}
+    params.update({
+        'objective': 'reg:squarederror',
+        'multi_strategy': 'one_output_per_tree',
+        'tree_method': params.get('tree_method', 'hist'),
+        'base_score': float(Y[known].mean())
+    })
+    dtrain = DMatrix(X, label=np.where(known, Y, 0.0))
+    return xgboost.train(
+        params, dtrain, num_boost_round=regressor.get_num_boosting_rounds(), obj=masked_squared_error(known)
+    )
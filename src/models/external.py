@@ -0,0 +1,120 @@
+"""Out-of-core training inputs for XGBoost."""
+
+import hashlib
+import numpy as np
+import xgboost
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+from ..data.partitions import iter_batches
+
+TARGET_COLUMN = 'quantity'
+
+
+def split_mask(n_rows: int, test_size: float, seed: int, file_index: int, batch_index: int) -> np.ndarray:
+    """
+    Rows of one batch assigned to the test split.
+
+    The assignment depends only on the seed and the batch's position, so
+    every pass over the partitions sees the same split.
+    """
+    rng = np.random.default_rng([seed, file_index, batch_index])
+    return rng.random(n_rows) < test_size
+
+
+def iter_split(paths: Sequence[Path], feature_columns: List[str], test_size: float, seed: int,
+               batch_size: int) -> Iterator[tuple]:
+    """Yield ``(X, y, is_test)`` for every batch of labelled rows."""
+    columns = feature_columns + [TARGET_COLUMN]
+    for file_index, path in enumerate(paths):
+        for batch_index, batch in enumerate(iter_batches([path], columns, batch_size)):
+            X = batch[feature_columns].to_numpy(dtype=np.float32)
+            y = batch[TARGET_COLUMN].to_numpy(dtype=np.float32)
+            is_test = split_mask(len(batch), test_size, seed, file_index, batch_index)
+            labelled = np.isfinite(y)
+            yield X[labelled], y[labelled], is_test[labelled]
+
+
+class PartitionIter(xgboost.DataIter):
+    """
+    Feeds one split of Parquet partitions to XGBoost a batch at a time.
+
+    Used with ``QuantileDMatrix``, only the quantized matrix is kept (about
+    one byte per value); with a ``cache_prefix``, XGBoost's external memory
+    mode pages even that to disk. Either way the DataFrame is never
+    materialized. A digest of every batch, both splits included, is taken
+    on the first pass.
+    """
+
+    def __init__(self, paths: Sequence[Path], feature_columns: List[str], test_size: float = 0.2,
+                 seed: int = 42, batch_size: int = 65_536, cache_prefix: Optional[str] = None):
+        self.paths = list(paths)
+        self.feature_columns = list(feature_columns)
+        self.test_size = test_size
+        self.seed = seed
+        self.batch_size = batch_size
+        self.n_rows = 0
+        self._batches = None
+        self._digest = hashlib.sha256()
+        self._first_pass = True
+        self.data_hash = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> int:
+        if self._batches is None:
+            self._batches = iter_split(
+                self.paths, self.feature_columns, self.test_size, self.seed, self.batch_size
+            )
+        for X, y, is_test in self._batches:
+            if self._first_pass:
+                self._digest.update(X.tobytes())
+                self._digest.update(y.tobytes())
+            train = ~is_test
+            if train.any():
+                if self._first_pass:
+                    self.n_rows += int(train.sum())
+                input_data(data=X[train], label=y[train])
+                return 1
+
+        if self._first_pass:
+            self.data_hash = self._digest.hexdigest()
+            self._first_pass = False
+        return 0
+
+    def reset(self):
+        self._batches = None
+
+
+class StreamingMetrics:
+    """MAE, RMSE, MAPE and R2 accumulated batch by batch, as in ``calculate_metrics``."""
+
+    def __init__(self):
+        self.n = 0
+        self.abs_error = 0.0
+        self.squared_error = 0.0
+        self.total = 0.0
+        self.total_squared = 0.0
+        self.pct_error = 0.0
+        self.n_nonzero = 0
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        y_true = y_true.astype(np.float64)
+        error = y_true - y_pred
+        nonzero = y_true != 0
+        self.n += len(y_true)
+        self.abs_error += np.abs(error).sum()
+        self.squared_error += (error ** 2).sum()
+        self.total += y_true.sum()
+        self.total_squared += (y_true ** 2).sum()
+        self.pct_error += np.abs(error[nonzero] / y_true[nonzero]).sum()
+        self.n_nonzero += int(nonzero.sum())
+
+    def result(self) -> Dict:
+        if self.n == 0:
+            return {'mae': np.nan, 'rmse': np.nan, 'mape': np.nan, 'r2': np.nan}
+        total_variance = self.total_squared - self.total ** 2 / self.n
+        return {
+            'mae': self.abs_error / self.n,
+            'rmse': np.sqrt(self.squared_error / self.n),
+            'mape': self.pct_error / self.n_nonzero * 100 if self.n_nonzero else 0.0,
+            'r2': 1 - self.squared_error / total_variance if total_variance > 0 else np.nan
+        }
@@ -0,0 +1,204 @@
+"""Precomputed forecast lookup table for the API's single-series requests."""
+
+import numpy as np
+from typing import TYPE_CHECKING, Dict, Optional
+from loguru import logger
+from .tree_engine import CompiledTreeEnsemble
+
+if TYPE_CHECKING:
+    from .xgboost_forecaster import XGBoostForecaster
+
+# Features the table's quantity axis feeds at the first step: the API
+# starts every series with lag_1 = lag_2 = rolling_mean_3 = quantity
+QUANTITY_FEATURES = ('lag_1', 'lag_2', 'rolling_mean_3')
+MONTHS = 12
+# Cells of the default table: 2M cells of 12 float32 periods is about 96 MB
+DEFAULT_MAX_CELLS = 2_000_000
+
+
+def _cell_edges(thresholds: np.ndarray, max_points: int) -> np.ndarray:
+    """Sorted unique split thresholds, thinned to at most ``max_points``."""
+    edges = np.unique(thresholds.astype(np.float32))
+    if len(edges) > max_points:
+        edges = np.unique(edges[np.linspace(0, len(edges) - 1, max_points).round().astype(int)])
+    return edges
+
+
+def _representatives(edges: np.ndarray) -> np.ndarray:
+    """One input value inside each cell: below the first edge, then each edge."""
+    below = edges[0] - max(1.0, abs(float(edges[0]))) if len(edges) else 0.0
+    return np.concatenate([[below], edges]).astype(np.float32)
+
+
+class ForecastTable:
+    """
+    Dense table of recursive forecasts over (month, quantity, rate, freight).
+
+    A tree ensemble is piecewise constant: between two consecutive split
+    thresholds of a feature its prediction does not change. The table's
+    axes are those thresholds, so each cell holds the forecast of every
+    input inside it, and a lookup is one binary search per axis plus an
+    index. Later horizon steps only depend on earlier predictions, which
+    are constant within a cell too, so with every threshold kept the table
+    reproduces ``forecast_future`` exactly. Axes with more than
+    ``max_points`` thresholds are thinned, and so is the longest axis
+    until the grid fits in ``max_cells``; either makes lookups
+    approximate, and ``evaluate`` measures by how much. The cell budget is
+    applied before anything is allocated. Building and evaluating the
+    table do not count towards the serving metrics.
+
+    The table assumes the API's starting state: ``lag_1`` equal to the last
+    quantity and the default lead time.
+    """
+
+    def __init__(self, quantity_edges: np.ndarray, rate_edges: np.ndarray,
+                 freight_edges: np.ndarray, values: np.ndarray, lead_time: float = 7):
+        self.quantity_edges = quantity_edges
+        self.rate_edges = rate_edges
+        self.freight_edges = freight_edges
+        self.values = values
+        self.lead_time = lead_time
+        self.error_bounds = None
+
+    @classmethod
+    def build(cls, forecaster: 'XGBoostForecaster', periods: int = 12, max_points: int = 512,
+              lead_time: float = 7, max_cells: int = DEFAULT_MAX_CELLS) -> 'ForecastTable':
+        """
+        Forecast every cell of the grid with the trained model.
+
+        Args:
+            forecaster: Trained XGBoost forecaster
+            periods: Longest horizon answered from the table
+            max_points: Most thresholds kept per axis
+            lead_time: Lead time of the starting state
+            max_cells: Most grid cells; each holds ``periods`` forecasts
+
+        Returns:
+            Forecast table
+        """
+        if forecaster.feature_columns is None:
+            raise ValueError("Model not trained. Call fit() first.")
+        if max_cells < MONTHS:
+            raise ValueError(f"max_cells must be at least {MONTHS}")
+
+        ensemble = CompiledTreeEnsemble.from_booster(
+            forecaster.model.get_booster(), iteration_range=forecaster._iteration_range()
+        )
+        is_split = np.isfinite(ensemble.threshold)
+        split_names = np.asarray(forecaster.feature_columns)[ensemble.feature[is_split]]
+        split_thresholds = ensemble.threshold[is_split]
+
+        def edges(names) -> np.ndarray:
+            return _cell_edges(split_thresholds[np.isin(split_names, names)], max_points)
+
+        axes = [edges(QUANTITY_FEATURES), edges(('rate',)), edges(('u_frt',))]
+
+        # Halve the longest axis until the grid fits the cell budget
+        def n_cells() -> int:
+            return MONTHS * int(np.prod([len(axis) + 1 for axis in axes]))
+
+        full_cells = n_cells()
+        while n_cells() > max_cells:
+            longest = int(np.argmax([len(axis) for axis in axes]))
+            axes[longest] = _cell_edges(axes[longest], len(axes[longest]) // 2)
+        if n_cells() < full_cells:
+            logger.warning(
+                f"Thinned forecast table from {full_cells} to {n_cells()} cells "
+                f"to stay within {max_cells}"
+            )
+        quantity_edges, rate_edges, freight_edges = axes
+
+        # Every combination of month and cell representatives, month-major
+        month, quantity, rate, freight = np.meshgrid(
+            np.arange(1, MONTHS + 1, dtype=np.float32), _representatives(quantity_edges),
+            _representatives(rate_edges), _representatives(freight_edges), indexing='ij'
+        )
+        state = forecaster._initial_state(
+            quantity=quantity.ravel(), lag_1=quantity.ravel(), posting_month=month.ravel(),
+            rate=rate.ravel(), u_frt=freight.ravel(), lead_time=lead_time
+        )
+        values = forecaster._recursive_forecast(state, periods, record=False).reshape(month.shape + (periods,))
+
+        table = cls(quantity_edges, rate_edges, freight_edges, values, lead_time)
+        logger.info(
+            f"Precomputed {values[..., 0].size} forecast cells "
+            f"({values.nbytes / 1e6:.1f} MB, {periods} periods)"
+        )
+        return table
+
+    @property
+    def periods(self) -> int:
+        """Longest horizon in the table."""
+        return self.values.shape[-1]
+
+    def lookup(self, month: int, quantity: float, rate: float, freight: float,
+               periods: int) -> Optional[np.ndarray]:
+        """
+        Forecast from the table.
+
+        Returns:
+            The first ``periods`` predicted quantities, or None when the
+            request is outside the table (longer horizon, month outside
+            1-12 or a missing input) and the model has to be evaluated
+        """
+        if periods > self.periods or not 1 <= month <= MONTHS or None in (quantity, rate, freight):
+            return None
+        point = np.asarray([quantity, rate, freight], dtype=np.float32)
+        if not np.isfinite(point).all():
+            return None
+
+        # A value equal to a threshold goes right in the trees, as here
+        return self.values[
+            int(month) - 1,
+            np.searchsorted(self.quantity_edges, point[0], side='right'),
+            np.searchsorted(self.rate_edges, point[1], side='right'),
+            np.searchsorted(self.freight_edges, point[2], side='right'),
+            :periods
+        ].copy()
+
+    def evaluate(self, forecaster: 'XGBoostForecaster', n_samples: int = 2000,
+                 seed: int = 42) -> Dict:
+        """
+        Error of table lookups against exact inference on random requests.
+
+        Requests are drawn uniformly over each axis's threshold range,
+        widened by a tenth on both sides. The result is also stored in
+        ``error_bounds``.
+
+        Returns:
+            Max, p99 and mean absolute error, max relative error, and the
+            share of requests answered exactly
+        """
+        rng = np.random.default_rng(seed)
+
+        def sample(edges: np.ndarray) -> np.ndarray:
+            low, high = (float(edges[0]), float(edges[-1])) if len(edges) else (0.0, 1.0)
+            margin = (high - low) / 10 or 1.0
+            return rng.uniform(low - margin, high + margin, n_samples).astype(np.float32)
+
+        month = rng.integers(1, MONTHS + 1, n_samples)
+        quantity = sample(self.quantity_edges)
+        rate = sample(self.rate_edges)
+        freight = sample(self.freight_edges)
+
+        state = forecaster._initial_state(
+            quantity=quantity, lag_1=quantity, posting_month=month,
+            rate=rate, u_frt=freight, lead_time=self.lead_time
+        )
+        exact = forecaster._recursive_forecast(state, self.periods, record=False)
+        table = np.stack([
+            self.lookup(month[i], quantity[i], rate[i], freight[i], self.periods)
+            for i in range(n_samples)
+        ])
+
+        error = np.abs(table.astype(np.float64) - exact)
+        relative = error / np.maximum(np.abs(exact), 1e-6)
+        self.error_bounds = {
+            'n_samples': n_samples,
+            'max_abs_error': float(error.max()),
+            'p99_abs_error': float(np.percentile(error, 99)),
+            'mean_abs_error': float(error.mean()),
+            'max_rel_error': float(relative.max()),
+            'exact_fraction': float((error.max(axis=1) == 0).mean())
+        }
+        return self.error_bounds
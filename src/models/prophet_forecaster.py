@@ -0,0 +1,70 @@
+"""Prophet forecaster for demand forecasting."""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Tuple
+from .statistical import StatisticalForecaster
+
+# Prophet only needs a date axis; one month-start per value
+ORIGIN = pd.Timestamp('2000-01-01')
+
+
+def fit_prophet(values: np.ndarray, config: Dict, start_params: Optional[Dict],
+                periods: int) -> Tuple[Dict, np.ndarray, np.ndarray]:
+    """
+    Fit a Prophet model to one monthly series.
+
+    Args:
+        values: Monthly quantities
+        config: Prophet constructor arguments
+        start_params: Stan parameters of an earlier fit, used to initialize this one
+        periods: Months to forecast
+
+    Returns:
+        Stan parameters, in-sample predictions and the forecast
+    """
+    from prophet import Prophet
+
+    history = pd.DataFrame({
+        'ds': pd.date_range(ORIGIN, periods=len(values), freq='MS'),
+        'y': values
+    })
+    model = Prophet(**config)
+    if start_params is not None and len(start_params['delta']) != model.n_changepoints:
+        start_params = None
+    model.fit(history, init=start_params)
+    params = {name: np.asarray(value).ravel()[0] if name in ('k', 'm', 'sigma_obs') else np.asarray(value).ravel()
+              for name, value in model.params.items() if name in ('k', 'm', 'sigma_obs', 'delta', 'beta')}
+
+    future = model.make_future_dataframe(periods=periods, freq='MS')
+    prediction = model.predict(future)['yhat'].to_numpy()
+    return params, prediction[:len(values)], prediction[len(values):]
+
+
+class ProphetForecaster(StatisticalForecaster):
+    """
+    Prophet model per customer series, fitted in parallel.
+
+    Requires the optional ``prophet`` package (see requirements.txt).
+    """
+
+    @staticmethod
+    def default_config() -> Dict:
+        return {
+            'yearly_seasonality': True,
+            'weekly_seasonality': False,
+            'daily_seasonality': False,
+            'n_changepoints': 5,
+            'uncertainty_samples': 0
+        }
+
+    @staticmethod
+    def fit_function() -> Callable:
+        return fit_prophet
+
+    def fit(self, df: pd.DataFrame, test_size: float = 0.2, warm_start: bool = True) -> Dict:
+        try:
+            import prophet  # noqa: F401
+        except ImportError:
+            raise ImportError("ProphetForecaster needs the prophet package: pip install prophet")
+        return super().fit(df, test_size=test_size, warm_start=warm_start)
@@ -0,0 +1,52 @@
+"""Read-only arrays shared with pool workers through shared memory."""
+
+import numpy as np
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Tuple
+
+ArraySpecs = Dict[str, Tuple[str, tuple, str]]
+
+# Arrays visible to fold/trial functions, in workers and in-process runs
+arrays: Dict[str, np.ndarray] = {}
+_handles: List[shared_memory.SharedMemory] = []
+
+
+def attach(specs: ArraySpecs):
+    """Pool initializer: map the parent's shared arrays without copying."""
+    for name, (shm_name, shape, dtype) in specs.items():
+        handle = shared_memory.SharedMemory(name=shm_name)
+        _handles.append(handle)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=handle.buf)
+
+
+@contextmanager
+def local(named_arrays: Dict[str, np.ndarray]) -> Iterator[None]:
+    """Expose arrays to the worker functions when running in-process."""
+    arrays.update(named_arrays)
+    try:
+        yield
+    finally:
+        arrays.clear()
+
+
+@contextmanager
+def publish(named_arrays: Dict[str, np.ndarray]) -> Iterator[ArraySpecs]:
+    """
+    Copy arrays into shared memory segments for the lifetime of the block.
+
+    Yields:
+        Specs to pass to ``attach`` as the pool initializer argument
+    """
+    handles, specs = [], {}
+    try:
+        for name, array in named_arrays.items():
+            handle = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            handles.append(handle)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=handle.buf)[...] = array
+            specs[name] = (handle.name, array.shape, array.dtype.str)
+        yield specs
+    finally:
+        for handle in handles:
+            handle.close()
+            handle.unlink()
@@ -0,0 +1,393 @@
+"""Per-series statistical forecasters fitted in parallel."""
+
+import hashlib
+import multiprocessing
+import os
+import queue
+import signal
+import time
+import warnings
+import joblib
+import numpy as np
+import pandas as pd
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from loguru import logger
+from .base import BaseForecaster
+
+SERIES_COLUMN = 'customer/vendor_code'
+# Months averaged by the fallback forecast
+NAIVE_WINDOW = 3
+
+
+class SeriesFit(NamedTuple):
+    """Fitted state of one series, reused while its history is unchanged."""
+    history_hash: str
+    params: Optional[object]
+    fitted: np.ndarray
+    holdout: np.ndarray
+    forecast: np.ndarray
+    status: str
+    seconds: float
+
+
+def naive_forecast(values: np.ndarray, periods: int) -> np.ndarray:
+    """Mean of the last ``NAIVE_WINDOW`` months, repeated."""
+    level = values[-NAIVE_WINDOW:].mean() if len(values) else 0.0
+    return np.full(periods, level)
+
+
+def history_hash(values: np.ndarray, config: Dict, *params) -> str:
+    """Digest of a series, the model config and every other parameter it is fitted with."""
+    digest = hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    digest.update(repr((sorted(config.items()), params)).encode())
+    return digest.hexdigest()[:16]
+
+
+def naive_fit(task: Tuple, status: str, seconds: float) -> SeriesFit:
+    """Fallback state of a series that is too short, failed or timed out."""
+    _, values, _, _, n_test, periods, _, digest = task
+    train = values[:-n_test]
+    fitted = np.array([naive_forecast(train[:i], 1)[0] for i in range(len(train))])
+    return SeriesFit(
+        digest, None, fitted, naive_forecast(train, n_test), naive_forecast(values, periods), status, seconds
+    )
+
+
+def fit_task(task: Tuple) -> SeriesFit:
+    """
+    Fit one series twice, in a pool worker or in process.
+
+    The model is first fitted without the last ``n_test`` months to score
+    the holdout, then refitted on the whole series starting from those
+    parameters. Series shorter than ``min_months`` and fits that fail
+    fall back to ``naive_forecast``.
+
+    Args:
+        task: ``(fit_series, values, config, start_params, n_test, periods, min_months, digest)``
+            where ``fit_series(values, config, start_params, periods)``
+            returns ``(params, fitted, forecast)``
+
+    Returns:
+        Fitted state of the series
+    """
+    fit_series, values, config, start_params, n_test, periods, min_months, digest = task
+    start = time.perf_counter()
+    train = values[:-n_test]
+    if len(train) < min_months:
+        return naive_fit(task, 'short', time.perf_counter() - start)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            params, fitted, holdout = fit_series(train, config, start_params, n_test)
+            params, _, forecast = fit_series(values, config, params, periods)
+        fitted = np.asarray(fitted, dtype=float)
+        holdout = np.maximum(np.asarray(holdout, dtype=float), 0)
+        forecast = np.maximum(np.asarray(forecast, dtype=float), 0)
+    except Exception:
+        return naive_fit(task, 'failed', time.perf_counter() - start)
+    if not (np.isfinite(holdout).all() and np.isfinite(forecast).all()):
+        return naive_fit(task, 'failed', time.perf_counter() - start)
+    return SeriesFit(digest, params, fitted, holdout, forecast, 'ok', time.perf_counter() - start)
+
+
+def start_worker(pids):
+    """
+    Pool worker initializer: lead a new process group and report its id.
+
+    Processes the fit starts (e.g. Prophet's cmdstan) join the group, so
+    killing the group stops them along with the worker.
+    """
+    os.setpgrp()
+    pids.put(os.getpid())
+
+
+def kill_workers(pids):
+    """Kill the process group of every worker that reported to ``pids``."""
+    while True:
+        try:
+            pid = pids.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class StatisticalForecaster(BaseForecaster):
+    """
+    One statistical model per series, fitted across a process pool.
+
+    Transactions are summed into a monthly series per ``series_column``
+    value, starting at its first order. Each series is fitted in a pool
+    worker under a per-series ``timeout``: a series that hangs or fails
+    falls back to a naive forecast instead of stalling the whole fit, and
+    the workers are replaced so a hung fit cannot hold one. Fitted parameters
+    are kept per series with a digest of its history; refitting skips
+    series whose history is unchanged and starts the optimizer from the
+    previous parameters for the others.
+
+    Forecasts of every series are computed for ``max_periods`` months at
+    fit time and served from memory.
+    """
+
+    # Fewest months of training history a series needs
+    min_months = 6
+
+    def __init__(self, config: Dict = None, series_column: str = SERIES_COLUMN, max_periods: int = 12,
+                 n_jobs: Optional[int] = None, timeout: Optional[float] = 10.0):
+        """
+        Args:
+            config: Model parameters, shared by all series
+            series_column: Column identifying a series
+            max_periods: Longest horizon served
+            n_jobs: Worker processes; all cores when omitted, in process when
+                1 and ``timeout`` is None
+            timeout: Seconds allowed per series, or None for no limit
+        """
+        super().__init__()
+        self.config = {**self.default_config(), **(config or {})}
+        self.series_column = series_column
+        self.max_periods = max_periods
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.series_ids = None
+        self.months = None
+        self.fits: Dict[str, SeriesFit] = {}
+        self.metrics = None
+        self.version = None
+        self._series_index = None
+
+    @staticmethod
+    @abstractmethod
+    def default_config() -> Dict:
+        """Model parameters used when not given."""
+
+    @staticmethod
+    @abstractmethod
+    def fit_function() -> Callable:
+        """Module-level ``fit_series(values, config, start_params, periods)`` run in the workers."""
+
+    def build(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Monthly history of every series.
+
+        Args:
+            df: Processed data with ``posting_date``, ``quantity`` and ``series_column``
+
+        Returns:
+            Series id to monthly quantities from its first order to the last month of the data
+        """
+        if self.series_column not in df.columns:
+            raise ValueError(f"Series column '{self.series_column}' not in data")
+        df = df.dropna(subset=['posting_date', 'quantity', self.series_column])
+        period = df['posting_date'].dt.year * 12 + df['posting_date'].dt.month - 1
+        first = int(period.min())
+        month_index = (period - first).to_numpy()
+        n_months = int(month_index.max()) + 1
+        self.months = pd.period_range(
+            pd.Period(year=first // 12, month=first % 12 + 1, freq='M'), periods=n_months, freq='M'
+        )
+
+        keys = df[self.series_column].astype(str)
+        codes, series_ids = pd.factorize(keys, sort=True)
+        history = np.bincount(
+            codes * n_months + month_index, weights=df['quantity'].to_numpy(dtype=float),
+            minlength=len(series_ids) * n_months
+        ).reshape(len(series_ids), n_months)
+        starts = (history > 0).argmax(axis=1)
+        return {series: history[i, starts[i]:] for i, series in enumerate(series_ids)}
+
+    def fit(self, df: pd.DataFrame, test_size: float = 0.2, warm_start: bool = True) -> Dict:
+        """
+        Fit every series; the latest ``test_size`` of each series' months is held out.
+
+        Args:
+            df: Processed training data
+            test_size: Proportion of each series' months used for testing
+            warm_start: Reuse fits of unchanged series and start the others
+                from their previous parameters
+
+        Returns:
+            Dictionary containing training metrics, pooled over series
+        """
+        series = self.build(df)
+        previous = self.fits if warm_start else {}
+        fit_series = self.fit_function()
+
+        fits, keys, tasks = {}, [], []
+        for key, values in series.items():
+            n_test = max(1, int(round(len(values) * test_size)))
+            digest = history_hash(values, self.config, n_test, self.max_periods, self.min_months, self.timeout)
+            cached = previous.get(key)
+            if cached is not None and cached.history_hash == digest:
+                fits[key] = cached
+                continue
+            start_params = cached.params if cached is not None else None
+            keys.append(key)
+            tasks.append((
+                fit_series, values, self.config, start_params, n_test, self.max_periods, self.min_months, digest
+            ))
+        logger.info(f"Fitting {len(tasks)} of {len(series)} series ({len(fits)} unchanged) on {self.n_jobs} workers")
+
+        fits.update(zip(keys, self._run(tasks)))
+
+        self.series_ids = list(series)
+        self._series_index = {key: i for i, key in enumerate(self.series_ids)}
+        self.fits = {key: fits[key] for key in self.series_ids}
+
+        statuses = pd.Series([fit.status for fit in self.fits.values()]).value_counts().to_dict()
+        logger.info(f"Series fit status: {statuses}")
+
+        y_train, y_fitted, y_test, y_holdout = [], [], [], []
+        for key, values in series.items():
+            fit = self.fits[key]
+            n_test = len(fit.holdout)
+            y_train.append(values[:-n_test])
+            y_fitted.append(fit.fitted)
+            y_test.append(values[-n_test:])
+            y_holdout.append(fit.holdout)
+
+        self.metrics = {
+            'train': self.calculate_metrics(np.concatenate(y_train), np.concatenate(y_fitted)),
+            'test': self.calculate_metrics(np.concatenate(y_test), np.concatenate(y_holdout)),
+            'status': statuses
+        }
+        logger.info(f"Training complete. Test MAE: {self.metrics['test']['mae']:.2f}")
+        return self.metrics
+
+    def _run(self, tasks: List[Tuple]) -> List[SeriesFit]:
+        """Run fit tasks in process, or across worker pools replaced after each timeout."""
+        if self.n_jobs == 1 and self.timeout is None:
+            return [fit_task(task) for task in tasks]
+        results = [None] * len(tasks)
+        waiting = deque(range(len(tasks)))
+        while waiting:
+            self._run_pool(tasks, waiting, results)
+        return results
+
+    def _run_pool(self, tasks: List[Tuple], waiting: deque, results: List):
+        """
+        Run waiting tasks on a new pool until one of them times out.
+
+        At most ``n_jobs`` tasks are in flight, so each starts when it is
+        submitted and its time limit counts from then. A task past the
+        limit gets the naive fallback and the pool is killed with its
+        workers' child processes; the other tasks in flight go back to
+        ``waiting`` for the next pool.
+        """
+        context = multiprocessing.get_context()
+        pids = context.Queue()
+        executor = ProcessPoolExecutor(
+            max_workers=self.n_jobs, mp_context=context, initializer=start_worker, initargs=(pids,)
+        )
+        running = {}
+        try:
+            while waiting or running:
+                while waiting and len(running) < self.n_jobs:
+                    i = waiting.popleft()
+                    running[executor.submit(fit_task, tasks[i])] = (i, time.monotonic())
+                timeout = None
+                if self.timeout:
+                    oldest = min(start for _, start in running.values())
+                    timeout = max(0.0, oldest + self.timeout - time.monotonic())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, _ = running.pop(future)
+                    results[i] = future.result()
+                now = time.monotonic()
+                expired = [i for i, start in running.values() if self.timeout and now - start >= self.timeout]
+                if expired:
+                    for i in expired:
+                        results[i] = naive_fit(tasks[i], 'timeout', self.timeout)
+                    waiting.extendleft(reversed([i for i, _ in running.values() if i not in expired]))
+                    running.clear()
+                    kill_workers(pids)
+                    return
+        finally:
+            if running:
+                kill_workers(pids)
+            executor.shutdown(wait=True, cancel_futures=True)
+            pids.close()
+
+    def forecasts(self) -> np.ndarray:
+        """Forecasts of every series for ``max_periods`` months, shape (n_series, max_periods)."""
+        if not self.fits:
+            raise ValueError("Model not trained. Call fit() first.")
+        return np.vstack([self.fits[key].forecast for key in self.series_ids])
+
+    def forecast_dates(self, periods: int) -> pd.DatetimeIndex:
+        """Month-start dates after the last month of history."""
+        return pd.date_range(self.months[-1].to_timestamp() + pd.offsets.MonthBegin(1), periods=periods, freq='MS')
+
+    def forecast_series(self, series: str, periods: int = 6) -> pd.DataFrame:
+        """
+        Forecast of one series.
+
+        Args:
+            series: Series id
+            periods: Number of months
+
+        Returns:
+            DataFrame with ``date`` and ``predicted_quantity``
+
+        Raises:
+            KeyError: If the series was not in the training data
+        """
+        if series not in self.fits:
+            raise KeyError(f"Unknown series '{series}'")
+        if periods > self.max_periods:
+            raise ValueError(f"At most {self.max_periods} periods can be forecast")
+        return pd.DataFrame({
+            'date': self.forecast_dates(periods),
+            'predicted_quantity': self.fits[series].forecast[:periods]
+        })
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Forecasts for rows of ``series_column`` and ``posting_date``.
+
+        Each row's month must be one of the ``max_periods`` months after
+        the training data.
+        """
+        if not self.fits:
+            raise ValueError("Model not trained. Call fit() first.")
+        last = self.months[-1]
+        horizon = (
+            (df['posting_date'].dt.year - last.year) * 12 + df['posting_date'].dt.month - last.month
+        ).to_numpy()
+        if ((horizon < 1) | (horizon > self.max_periods)).any():
+            raise ValueError(f"Dates must be within {self.max_periods} months after {last}")
+        unknown = set(df[self.series_column].astype(str)) - set(self.fits)
+        if unknown:
+            raise ValueError(f"Unknown series: {sorted(unknown)[:5]}")
+        index = df[self.series_column].astype(str).map(self._series_index).to_numpy()
+        return self.forecasts()[index, horizon - 1]
+
+    def save(self, path: str):
+        """Save per-series fits to disk."""
+        model_data = {
+            'config': self.config,
+            'series_column': self.series_column,
+            'max_periods': self.max_periods,
+            'series_ids': self.series_ids,
+            'months': self.months,
+            'fits': {key: tuple(fit) for key, fit in self.fits.items()},
+            'metrics': self.metrics
+        }
+        joblib.dump(model_data, path)
+        logger.info(f"Model saved to {path}")
+
+    def load(self, path: str):
+        """Load per-series fits from disk."""
+        model_data = joblib.load(path)
+        model_data['fits'] = {key: SeriesFit(*fit) for key, fit in model_data['fits'].items()}
+        for name, value in model_data.items():
+            setattr(self, name, value)
+        self._series_index = {key: i for i, key in enumerate(self.series_ids)}
+        self.version = hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+        logger.info(f"Model loaded from {path}")
@@ -0,0 +1,164 @@
+"""Array-backed tree inference engine for trained XGBoost boosters."""
+
+import json
+import numpy as np
+from typing import Tuple
+from xgboost import Booster
+
+# Objectives whose prediction is the raw margin (identity link)
+IDENTITY_OBJECTIVES = {
+    'reg:squarederror',
+    'reg:absoluteerror',
+    'reg:pseudohubererror',
+    'reg:quantileerror',
+}
+
+
+class CompiledTreeEnsemble:
+    """
+    Flat, NumPy-evaluated copy of an XGBoost tree ensemble.
+
+    Every node of every tree is stored in a set of parallel arrays
+    (children, split feature, threshold, default direction, leaf value).
+    Leaves point back to themselves, so a batch is evaluated by walking all
+    rows through all trees for ``max_depth`` vectorized steps, without the
+    DMatrix construction and wrapper checks of ``XGBRegressor.predict``.
+    """
+
+    # Rows evaluated per traversal pass, bounding the (rows x trees) index arrays
+    chunk_size = 4096
+
+    def __init__(self, left: np.ndarray, right: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray, default_left: np.ndarray, value: np.ndarray,
+                 roots: np.ndarray, max_depth: int, base_score: float,
+                 num_feature: int, missing: float = np.nan):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_score = base_score
+        self.num_feature = num_feature
+        self.missing = missing
+
+    @classmethod
+    def from_booster(cls, booster: Booster, iteration_range: Tuple[int, int] = (0, 0),
+                     missing: float = np.nan) -> 'CompiledTreeEnsemble':
+        """
+        Export a booster into flat node arrays.
+
+        Args:
+            booster: Trained XGBoost booster
+            iteration_range: Boosting rounds to keep, as in ``Booster.predict``
+            missing: Value treated as missing in the input matrix
+
+        Returns:
+            Compiled ensemble
+        """
+        learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+        model_param = learner['learner_model_param']
+        gbm = learner['gradient_booster']
+
+        if gbm['name'] != 'gbtree':
+            raise ValueError(f"Unsupported booster type: {gbm['name']}")
+        if learner['objective']['name'] not in IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported objective: {learner['objective']['name']}")
+        if int(model_param.get('num_target', 1)) > 1:
+            raise ValueError("Multi-target models are not supported")
+
+        trees = gbm['model']['trees']
+        indptr = gbm['model'].get('iteration_indptr')
+        start, end = iteration_range
+        if indptr is not None and end > 0:
+            trees = trees[indptr[start]:indptr[end]]
+
+        left, right, feature, threshold, default_left, value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            if tree['categories_nodes']:
+                raise ValueError("Categorical splits are not supported")
+
+            tree_left = np.asarray(tree['left_children'], dtype=np.int32)
+            tree_right = np.asarray(tree['right_children'], dtype=np.int32)
+            is_leaf = tree_left == -1
+            node_ids = np.arange(len(tree_left), dtype=np.int32)
+
+            # Leaves loop back to themselves so extra traversal steps are no-ops
+            tree_left = np.where(is_leaf, node_ids, tree_left)
+            tree_right = np.where(is_leaf, node_ids, tree_right)
+
+            # Children always have larger ids than their parent
+            depth = np.zeros(len(tree_left), dtype=np.int32)
+            for node in np.flatnonzero(~is_leaf):
+                depth[tree_left[node]] = depth[tree_right[node]] = depth[node] + 1
+            max_depth = max(max_depth, int(depth.max()))
+
+            conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+            left.append(tree_left + offset)
+            right.append(tree_right + offset)
+            feature.append(np.where(is_leaf, 0, tree['split_indices']).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.float32(np.inf), conditions))
+            default_left.append(np.asarray(tree['default_left'], dtype=bool))
+            value.append(np.where(is_leaf, conditions, np.float32(0)))
+            roots.append(offset)
+            offset += len(tree_left)
+
+        return cls(
+            left=np.concatenate(left),
+            right=np.concatenate(right),
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold).astype(np.float32),
+            default_left=np.concatenate(default_left),
+            value=np.concatenate(value).astype(np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            base_score=float(model_param['base_score']),
+            num_feature=int(model_param['num_feature']),
+            missing=missing
+        )
+
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the ensemble."""
+        return len(self.roots)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the ensemble on a feature matrix.
+
+        Args:
+            X: Array of shape (n_rows, num_feature)
+
+        Returns:
+            Float32 array of predictions
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.num_feature:
+            raise ValueError(f"Expected {self.num_feature} features, got shape {X.shape}")
+
+        predictions = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), self.chunk_size):
+            chunk = X[start:start + self.chunk_size]
+            predictions[start:start + len(chunk)] = self._predict_chunk(chunk)
+
+        return predictions
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        """Walk every row through every tree in lockstep."""
+        if not np.isnan(self.missing):
+            X = np.where(X == self.missing, np.float32(np.nan), X)
+
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = np.where(np.isnan(x), self.default_left[node], x < self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        margin = self.value[node].sum(axis=1, dtype=np.float64) + self.base_score
+        return margin.astype(np.float32)
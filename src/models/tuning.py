@@ -0,0 +1,272 @@
+"""Parallel hyperparameter search for the XGBoost forecaster."""
+
+import hashlib
+import json
+import math
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+from xgboost import XGBRegressor
+from loguru import logger
+from . import shared
+from .xgboost_forecaster import XGBoostForecaster
+
+# Lists are sampled as choices, (low, high) tuples uniformly; integer
+# bounds give integer samples
+DEFAULT_SPACE = {
+    'max_depth': [3, 4, 5, 6, 8],
+    'learning_rate': (0.02, 0.3),
+    'subsample': (0.6, 1.0),
+    'colsample_bytree': (0.6, 1.0),
+    'min_child_weight': [1, 3, 5, 10],
+    'reg_lambda': (0.0, 10.0)
+}
+
+
+def _evaluate_trial(config: Dict, n_estimators: int, early_stopping_rounds: int) -> Dict:
+    """Fit one config on the training slice, early-stopped on the validation slice."""
+    model = XGBRegressor(**{
+        **config, 'n_estimators': n_estimators, 'early_stopping_rounds': early_stopping_rounds
+    })
+    model.fit(
+        shared.arrays['X_train'], shared.arrays['y_train'],
+        eval_set=[(shared.arrays['X_val'], shared.arrays['y_val'])], verbose=False
+    )
+    y_pred = model.predict(shared.arrays['X_val'])
+    metrics = XGBoostForecaster().calculate_metrics(shared.arrays['y_val'], y_pred)
+    return {
+        'best_n_estimators': int(model.best_iteration) + 1,
+        **{name: float(value) for name, value in metrics.items()}
+    }
+
+
+class HyperparameterSearch:
+    """
+    Random or successive-halving search over ``XGBoostForecaster`` configs.
+
+    The last ``validation_fraction`` of rows in posting order is held out
+    and every trial is early-stopped on it, so each config is scored on
+    data later than its training rows. Trials run concurrently on a
+    process pool over training and validation arrays placed in shared
+    memory, with xgboost's ``n_jobs`` capped to the cores per worker.
+
+    With ``method='halving'``, all sampled configs start with a small tree
+    budget and the best ``1 / reduction_factor`` advance to the next rung,
+    whose budget is ``reduction_factor`` times larger, up to
+    ``max_estimators``.
+
+    Every finished trial is written to ``cache_dir``, keyed on the config,
+    budget and a hash of the data, so an interrupted or repeated search
+    with the same seed only evaluates trials it has not seen.
+    """
+
+    METHODS = ('random', 'halving')
+
+    def __init__(self, space: Optional[Dict] = None, n_trials: int = 20, method: str = 'random',
+                 n_workers: Optional[int] = None, min_estimators: int = 50, max_estimators: int = 400,
+                 reduction_factor: int = 3, early_stopping_rounds: int = 20,
+                 validation_fraction: float = 0.2, base_config: Optional[Dict] = None,
+                 cache_dir: Optional[str] = "data/cache/tuning", seed: int = 42):
+        """
+        Args:
+            space: Parameter space; see ``DEFAULT_SPACE``
+            n_trials: Number of sampled configs
+            method: 'random' or 'halving'
+            n_workers: Worker processes; defaults to the CPU count
+            min_estimators: Tree budget of the first halving rung
+            max_estimators: Tree budget of the last rung and of random search
+            reduction_factor: Halving keeps the best 1/reduction_factor per rung
+            early_stopping_rounds: Rounds without validation improvement before stopping
+            validation_fraction: Share of the latest rows held out for validation
+            base_config: Fixed parameters merged into every config
+            cache_dir: Directory of trial results; None disables caching
+            seed: Seed for config sampling
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown search method '{method}'. Use one of {self.METHODS}")
+        if not 0 < validation_fraction < 1:
+            raise ValueError("validation_fraction must be between 0 and 1")
+
+        self.space = space or DEFAULT_SPACE
+        self.n_trials = n_trials
+        self.method = method
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.min_estimators = min_estimators
+        self.max_estimators = max_estimators
+        self.reduction_factor = reduction_factor
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_fraction = validation_fraction
+        self.base_config = base_config or {'random_state': 42}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.seed = seed
+        self.best_config = None
+
+    def sample_configs(self) -> List[Dict]:
+        """Draw ``n_trials`` configs from the space."""
+        rng = np.random.default_rng(self.seed)
+        configs = []
+        for _ in range(self.n_trials):
+            config = dict(self.base_config)
+            for name, values in self.space.items():
+                if isinstance(values, tuple):
+                    low, high = values
+                    if isinstance(low, int) and isinstance(high, int):
+                        config[name] = int(rng.integers(low, high + 1))
+                    else:
+                        config[name] = round(float(rng.uniform(low, high)), 6)
+                else:
+                    config[name] = values[rng.integers(len(values))]
+                    if isinstance(config[name], np.generic):
+                        config[name] = config[name].item()
+            configs.append(config)
+        return configs
+
+    def budgets(self) -> List[int]:
+        """Tree budget of each rung."""
+        if self.method == 'random':
+            return [self.max_estimators]
+        budgets = [self.min_estimators]
+        while budgets[-1] < self.max_estimators:
+            budgets.append(min(budgets[-1] * self.reduction_factor, self.max_estimators))
+        return budgets
+
+    def split(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Time-ordered training and validation arrays."""
+        if 'posting_date' in df.columns:
+            df = df.sort_values('posting_date', kind='stable')
+        df = df.dropna(subset=['quantity'])
+        X_frame, y_series = XGBoostForecaster().prepare_features(df)
+        X = np.ascontiguousarray(X_frame.to_numpy(dtype=np.float32))
+        y = y_series.to_numpy(dtype=np.float32)
+
+        n_val = max(1, int(len(X) * self.validation_fraction))
+        return {
+            'X_train': X[:-n_val], 'y_train': y[:-n_val],
+            'X_val': X[-n_val:], 'y_val': y[-n_val:]
+        }
+
+    @staticmethod
+    def data_hash(arrays: Dict[str, np.ndarray]) -> str:
+        """Hash of the training and validation arrays."""
+        digest = hashlib.sha256()
+        for name in sorted(arrays):
+            digest.update(name.encode())
+            digest.update(repr(arrays[name].shape).encode())
+            digest.update(arrays[name].tobytes())
+        return digest.hexdigest()
+
+    def trial_key(self, config: Dict, n_estimators: int, data_hash: str) -> str:
+        """Cache key of one trial."""
+        spec = json.dumps({
+            'config': config,
+            'n_estimators': n_estimators,
+            'early_stopping_rounds': self.early_stopping_rounds
+        }, sort_keys=True)
+        return hashlib.sha256(f"{data_hash}\0{spec}".encode()).hexdigest()
+
+    def _load_result(self, key: str) -> Optional[Dict]:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"trial-{key[:32]}.json"
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _store_result(self, key: str, result: Dict):
+        """Write a trial result atomically."""
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"trial-{key[:32]}.json"
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+    def _worker_config(self, config: Dict) -> Dict:
+        """Config with xgboost threads split across worker processes."""
+        return {**config, 'n_jobs': max(1, (os.cpu_count() or 1) // self.n_workers)}
+
+    def _evaluate(self, configs: List[Dict], n_estimators: int, arrays: Dict[str, np.ndarray],
+                  data_hash: str) -> List[Dict]:
+        """Score configs at one budget, skipping cached trials."""
+        keys = [self.trial_key(config, n_estimators, data_hash) for config in configs]
+        results = [self._load_result(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        logger.info(
+            f"Evaluating {len(pending)} configs at {n_estimators} trees "
+            f"({len(configs) - len(pending)} cached)"
+        )
+
+        def record(i: int, result: Dict):
+            results[i] = result
+            self._store_result(keys[i], result)
+
+        if self.n_workers == 1 or len(pending) <= 1:
+            with shared.local(arrays):
+                for i in pending:
+                    record(i, _evaluate_trial(
+                        self._worker_config(configs[i]), n_estimators, self.early_stopping_rounds
+                    ))
+        elif pending:
+            with shared.publish(arrays) as specs:
+                with ProcessPoolExecutor(
+                    max_workers=self.n_workers, initializer=shared.attach, initargs=(specs,)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            _evaluate_trial, self._worker_config(configs[i]),
+                            n_estimators, self.early_stopping_rounds
+                        ): i
+                        for i in pending
+                    }
+                    # Store as trials finish, so an interrupted rung resumes
+                    for future in as_completed(futures):
+                        record(futures[future], future.result())
+
+        return [
+            {'trial': i, 'n_estimators': n_estimators, **config, **result}
+            for i, (config, result) in enumerate(zip(configs, results))
+        ]
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Search the space on processed data.
+
+        Args:
+            df: Processed data with features and ``quantity``
+
+        Returns:
+            One row per evaluated trial and rung, best validation MAE first.
+            The winning config, with ``n_estimators`` set to its early-stopped
+            tree count, is stored in ``best_config``.
+        """
+        arrays = self.split(df)
+        data_hash = self.data_hash(arrays)
+        configs = self.sample_configs()
+        trials = list(range(len(configs)))
+
+        rows = []
+        budgets = self.budgets()
+        for rung, n_estimators in enumerate(budgets):
+            results = self._evaluate([configs[i] for i in trials], n_estimators, arrays, data_hash)
+            for i, result in zip(trials, results):
+                result.update({'trial': i, 'rung': rung})
+            rows.extend(results)
+
+            if rung < len(budgets) - 1:
+                n_keep = max(1, math.ceil(len(trials) / self.reduction_factor))
+                ranked = sorted(results, key=lambda result: result['mae'])
+                trials = [result['trial'] for result in ranked[:n_keep]]
+
+        results_df = pd.DataFrame(rows)
+        final = results_df[results_df['rung'] == len(budgets) - 1].sort_values('mae')
+        best = final.iloc[0]
+        self.best_config = {**configs[int(best['trial'])], 'n_estimators': int(best['best_n_estimators'])}
+        logger.info(f"Best validation MAE {best['mae']:.2f} with {self.best_config}")
+
+        return results_df.sort_values(['rung', 'mae'], ascending=[False, True]).reset_index(drop=True)
@@ -1,15 +1,98 @@
 import pandas as pd
 import numpy as np
-from xgboost import XGBRegressor
+import xgboost
+from xgboost import Booster, XGBRegressor
 from sklearn.model_selection import train_test_split
 import joblib
-from typing import Dict, Tuple
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
 from loguru import logger
 from .base import BaseForecaster
+from .tree_engine import CompiledTreeEnsemble
+from .forecast_table import DEFAULT_MAX_CELLS, ForecastTable
+from .direct import fit_multi_output
+from .external import PartitionIter, StreamingMetrics, iter_split
+from ..data.features import monthly_leads
+from ..data.partitions import partition_columns, partition_paths
+from ..monitoring.metrics import FORECAST_STEP_DURATION, INFERENCE_CALLS, INFERENCE_ROWS
+
+# Model input layout used by the recursive forecast state
+FEATURE_COLUMNS = [
+    'lag_1', 'lag_2', 'rolling_mean_3', 
+    'posting_month', 'rate', 'u_frt', 
+    'posting_quarter', 'lead_time'
+]
+(LAG_1, LAG_2, ROLLING_MEAN_3, POSTING_MONTH,
+ RATE, U_FRT, POSTING_QUARTER, LEAD_TIME) = range(len(FEATURE_COLUMNS))
+
+# Native artifact: the booster as UBJSON plus a JSON manifest beside it
+NATIVE_SUFFIX = '.ubj'
+MANIFEST_SUFFIX = '.manifest.json'
+# Quantile and direct boosters beside it; not matched by the registry's *.ubj scan
+QUANTILE_SUFFIX = '.quantiles.ubjson'
+DIRECT_SUFFIX = '.direct.ubjson'
+FORMAT_VERSION = 1
+
+# Default forecast quantiles: P10 / P50 / P90
+QUANTILES = (0.1, 0.5, 0.9)
+# Multi-step strategies: feed predictions back, or one model output per horizon
+STRATEGIES = ('recursive', 'direct')
+
+
+def quantile_label(quantile: float) -> str:
+    """Column and response name of a quantile, e.g. ``p10``."""
+    return f"p{round(quantile * 100)}"
+
+
+def manifest_path(path: str) -> Path:
+    """Manifest file belonging to a native model file."""
+    path = Path(path)
+    return path.with_name(path.stem + MANIFEST_SUFFIX)
+
+
+def quantile_path(path: str) -> Path:
+    """Quantile booster file belonging to a native model file."""
+    path = Path(path)
+    return path.with_name(path.stem + QUANTILE_SUFFIX)
+
+
+def direct_path(path: str) -> Path:
+    """Direct booster file belonging to a native model file."""
+    path = Path(path)
+    return path.with_name(path.stem + DIRECT_SUFFIX)
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _read_raw(path: str) -> Tuple[bytearray, str]:
+    """Read a UBJSON model file and the SHA-256 of its bytes."""
+    raw = bytearray(Path(path).read_bytes())
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def _read_booster(path: str, n_jobs=None) -> Tuple[Booster, str]:
+    """Load a UBJSON booster and the SHA-256 of its bytes."""
+    booster = Booster({'nthread': n_jobs} if n_jobs else None)
+    raw, digest = _read_raw(path)
+    booster.load_model(raw)
+    return booster, digest
+
 
 class XGBoostForecaster(BaseForecaster):
     """XGBoost-based demand forecasting model."""
     
+    # Largest batch routed to the compiled engine; anything bigger is
+    # faster on XGBoost's multithreaded predictor
+    compiled_max_rows = 1
+    
     def __init__(self, config: Dict = None):
         super().__init__()
         self.config = config or {
@@ -21,17 +104,22 @@ class XGBoostForecaster(BaseForecaster):
         }
         self.model = XGBRegressor(**self.config)
         self.feature_columns = None
+        self.engine = None
+        self.table = None
+        self.version = None
+        self.data_hash = None
+        self.metrics = None
+        self.quantile_model = None
+        self.quantiles = None
+        self.quantile_metrics = None
+        self.direct_booster = None
+        self.direct_periods = None
+        self.direct_metrics = None
         
     def prepare_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
         """Prepare features and target for training."""
-        feature_cols = [
-            'lag_1', 'lag_2', 'rolling_mean_3', 
-            'posting_month', 'rate', 'u_frt', 
-            'posting_quarter', 'lead_time'
-        ]
-        
         # Filter available columns
-        available_features = [col for col in feature_cols if col in df.columns]
+        available_features = [col for col in FEATURE_COLUMNS if col in df.columns]
         self.feature_columns = available_features
         
         X = df[available_features]
@@ -44,6 +132,7 @@ class XGBoostForecaster(BaseForecaster):
         logger.info("Training XGBoost model")
         
         X, y = self.prepare_features(df)
+        self.data_hash = self.training_data_hash(X, y)
         
         # Train-test split
         X_train, X_test, y_train, y_test = train_test_split(
@@ -52,6 +141,11 @@ class XGBoostForecaster(BaseForecaster):
         
         # Train model
         self.model.fit(X_train, y_train)
+        self.engine = None
+        self.table = None
+        self.quantile_model = None
+        self.direct_booster = None
+        self.version = hashlib.sha256(self.model.get_booster().save_raw(raw_format='ubj')).hexdigest()[:16]
         
         # Evaluate
         train_pred = self.model.predict(X_train)
@@ -62,10 +156,200 @@ class XGBoostForecaster(BaseForecaster):
             'test': self.calculate_metrics(y_test, test_pred)
         }
         
+        self.metrics = metrics
+        logger.info(f"Training complete. Test MAE: {metrics['test']['mae']:.2f}")
+        
+        return metrics
+    
+    def fit_partitions(self, source: Union[str, Sequence[str]], test_size: float = 0.2,
+                       batch_size: int = 65_536, external_memory: bool = False,
+                       cache_dir: Optional[str] = "data/cache/xgboost") -> Dict:
+        """
+        Train one global model from Parquet partitions without loading them whole.
+
+        Batches are streamed into a ``QuantileDMatrix``, which keeps only the
+        quantized features, or with ``external_memory`` into an on-disk
+        external memory ``DMatrix``. Rows are assigned to the test split
+        per batch with a fixed seed, and metrics are accumulated in a second
+        streaming pass, so peak memory depends on ``batch_size`` rather than
+        the number of rows.
+
+        Args:
+            source: Directory of ``.parquet`` files, or a list of files
+            test_size: Proportion of rows held out for testing
+            batch_size: Rows decoded at a time
+            external_memory: Page the training matrix to ``cache_dir``
+            cache_dir: Directory for external memory pages
+
+        Returns:
+            Dictionary containing training metrics
+        """
+        paths = partition_paths(source)
+        columns = partition_columns(paths)
+        self.feature_columns = [col for col in FEATURE_COLUMNS if col in columns]
+        logger.info(f"Training XGBoost model from {len(paths)} partitions")
+        
+        cache_prefix = None
+        if external_memory:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            cache_prefix = str(Path(cache_dir) / 'train')
+        train_iter = PartitionIter(
+            paths, self.feature_columns, test_size=test_size, batch_size=batch_size, cache_prefix=cache_prefix
+        )
+        if external_memory:
+            dtrain = xgboost.DMatrix(train_iter, missing=np.nan)
+        else:
+            dtrain = xgboost.QuantileDMatrix(train_iter, max_bin=self.config.get('max_bin', 256))
+        
+        # Same booster parameters XGBRegressor.fit would use
+        self.model = XGBRegressor(**self.config)
+        params = {key: value for key, value in self.model.get_xgb_params().items() if value is not None}
+        if external_memory:
+            params['tree_method'] = 'hist'
+        booster = xgboost.train(params, dtrain, num_boost_round=self.model.get_num_boosting_rounds())
+        self.model.load_model(booster.save_raw(raw_format='ubj'))
+        self.engine = None
+        self.table = None
+        self.quantile_model = None
+        self.direct_booster = None
+        self.data_hash = train_iter.data_hash
+        self.version = hashlib.sha256(booster.save_raw(raw_format='ubj')).hexdigest()[:16]
+        logger.info(f"Trained on {train_iter.n_rows} rows")
+        
+        # Evaluate
+        train_metrics, test_metrics = StreamingMetrics(), StreamingMetrics()
+        for X, y, is_test in iter_split(paths, self.feature_columns, test_size, train_iter.seed, batch_size):
+            pred = booster.inplace_predict(X, missing=np.nan, validate_features=False)
+            train_metrics.update(y[~is_test], pred[~is_test])
+            test_metrics.update(y[is_test], pred[is_test])
+        
+        metrics = {'train': train_metrics.result(), 'test': test_metrics.result()}
+        
+        self.metrics = metrics
         logger.info(f"Training complete. Test MAE: {metrics['test']['mae']:.2f}")
         
         return metrics
     
+    def fit_quantiles(self, df: pd.DataFrame, quantiles: Sequence[float] = QUANTILES,
+                      test_size: float = 0.2) -> Dict:
+        """
+        Train a quantile model beside the point model.
+
+        One booster with the multi-quantile objective predicts every
+        quantile in a single call, so forecasting them costs one extra
+        booster call per horizon step however many quantiles there are.
+        It is trained on the point model's feature columns, and rows are
+        split as in ``fit``, so the held-out rows are the same.
+
+        Args:
+            df: Training data
+            quantiles: Quantiles to predict, between 0 and 1
+            test_size: Proportion of data to use for testing
+
+        Returns:
+            Test pinball loss per quantile, and coverage and mean width of
+            the interval between the lowest and highest quantile
+        """
+        quantiles = tuple(sorted(quantiles))
+        if not quantiles or not all(0 < q < 1 for q in quantiles):
+            raise ValueError(f"Quantiles must be between 0 and 1, got {quantiles}")
+        if self.feature_columns is None:
+            raise ValueError("Model not trained. Call fit() first.")
+        missing = [col for col in self.feature_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature columns of the point model: {missing}")
+        logger.info(f"Training XGBoost quantile model for {quantiles}")
+        
+        X, y = df[self.feature_columns], df['quantity']
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=42
+        )
+        
+        config = {**self.config, 'objective': 'reg:quantileerror', 'quantile_alpha': list(quantiles)}
+        self.quantile_model = XGBRegressor(**config)
+        self.quantile_model.fit(X_train, y_train)
+        self.quantiles = quantiles
+        
+        # Evaluate
+        pred = np.sort(self.quantile_model.predict(X_test).reshape(len(X_test), -1), axis=1)
+        y_test = y_test.to_numpy()[:, None]
+        errors = y_test - pred
+        pinball = np.maximum(np.asarray(quantiles) * errors, (np.asarray(quantiles) - 1) * errors).mean(axis=0)
+        inside = (y_test[:, 0] >= pred[:, 0]) & (y_test[:, 0] <= pred[:, -1])
+        
+        metrics = {
+            'pinball': {quantile_label(q): float(loss) for q, loss in zip(quantiles, pinball)},
+            'coverage': float(inside.mean()),
+            'nominal_coverage': quantiles[-1] - quantiles[0],
+            'mean_width': float((pred[:, -1] - pred[:, 0]).mean())
+        }
+        
+        self.quantile_metrics = metrics
+        logger.info(
+            f"Quantile training complete. Interval coverage {metrics['coverage']:.1%} "
+            f"(nominal {metrics['nominal_coverage']:.0%}), mean width {metrics['mean_width']:.2f}"
+        )
+        
+        return metrics
+    
+    def fit_direct(self, df: pd.DataFrame, periods: int = 12, test_size: float = 0.2,
+                   entity_columns: Sequence[str] = ('customer/vendor_code',)) -> Dict:
+        """
+        Train a multi-output booster, one output per horizon step, for the direct strategy.
+
+        Every row is a forecast origin: its input is the state the
+        recursive forecast starts from (as in ``forecast_future_batch``),
+        and the target of horizon ``h`` is the entity's total quantity in
+        the ``h``-th calendar month after the row's month, matching the
+        monthly dates forecasts are labelled with. Each output has its own
+        trees, fitted on its own known targets, and a forecast is one call
+        returning every step with no feedback between them. Rows are split
+        as in ``fit``.
+
+        Args:
+            df: Processed training data, with ``posting_date`` and entity columns
+            periods: Number of horizon steps
+            test_size: Proportion of origins to use for testing
+            entity_columns: Columns identifying a series; absent ones are ignored
+
+        Returns:
+            Test metrics pooled over horizons and per horizon
+        """
+        if 'posting_date' not in df.columns:
+            raise ValueError("Direct targets are monthly totals and need a 'posting_date' column")
+        logger.info(f"Training direct XGBoost model for {periods} horizons")
+        
+        X = self._batch_state(df)
+        Y = monthly_leads(
+            df, 'quantity', [col for col in entity_columns if col in df.columns],
+            'posting_date', leads=range(1, periods + 1)
+        ).to_numpy(dtype=np.float32)
+        _, test_rows = train_test_split(np.arange(len(df)), test_size=test_size, random_state=42)
+        train = np.ones(len(df), dtype=bool)
+        train[test_rows] = False
+        short = [h + 1 for h in range(periods) if not np.isfinite(Y[train, h]).any()]
+        if short:
+            raise ValueError(f"Not enough months of history to train horizons {short}")
+        
+        self.direct_booster = fit_multi_output(self.config, X[train], Y[train])
+        self.direct_periods = periods
+        
+        # Evaluate
+        pred = self._direct_forecast(X[~train], periods, record=False)
+        y_test = Y[~train]
+        horizons = []
+        for h in range(periods):
+            known = np.isfinite(y_test[:, h])
+            horizons.append({'horizon': h + 1, 'n_test': int(known.sum()),
+                             **self.calculate_metrics(y_test[known, h], pred[known, h])})
+        known = np.isfinite(y_test)
+        metrics = {'test': self.calculate_metrics(y_test[known], pred[known]), 'horizons': horizons}
+        
+        self.direct_metrics = metrics
+        logger.info(f"Direct training complete. Test MAE: {metrics['test']['mae']:.2f}")
+        
+        return metrics
+    
     def predict(self, df: pd.DataFrame) -> np.ndarray:
         """Generate predictions."""
         if self.feature_columns is None:
@@ -76,65 +360,418 @@ class XGBoostForecaster(BaseForecaster):
         
         return predictions
     
-    def forecast_future(self, last_known_data: pd.Series, periods: int = 6) -> pd.DataFrame:
-        """Forecast future periods."""
+    def forecast_future(self, last_known_data: pd.Series, periods: int = 6,
+                        quantiles: bool = False, strategy: str = 'recursive') -> pd.DataFrame:
+        """
+        Forecast future periods, with a column per quantile when ``quantiles`` is set.
+
+        ``strategy`` is ``recursive`` (each step feeds the next) or
+        ``direct`` (one model output per step, from ``fit_direct``).
+        """
         logger.info(f"Forecasting {periods} periods ahead")
         
-        predictions = []
-        current_data = last_known_data.copy()
-        
-        for i in range(periods):
-            # Prepare input features
-            input_features = pd.DataFrame({
-                'lag_1': [current_data['quantity']],
-                'lag_2': [current_data.get('lag_1', current_data['quantity'])],
-                'rolling_mean_3': [current_data['quantity']],
-                'posting_month': [(current_data['posting_month'] % 12) + 1],
-                'rate': [current_data.get('rate', 0)],
-                'u_frt': [current_data.get('u_frt', 0)],
-                'posting_quarter': [((current_data['posting_month'] % 12) // 3) + 1],
-                'lead_time': [current_data.get('lead_time', 7)]
-            })
-            
-            # Predict
-            pred = self.model.predict(input_features)[0]
-            predictions.append(pred)
-            
-            # Update for next iteration
-            current_data['lag_2'] = current_data.get('lag_1', current_data['quantity'])
-            current_data['lag_1'] = current_data['quantity']
-            current_data['quantity'] = pred
-            current_data['posting_month'] = (current_data['posting_month'] % 12) + 1
-        
-        # Create forecast dataframe
-        forecast_dates = pd.date_range(
-            start=pd.Timestamp.now().replace(day=1),
-            periods=periods,
-            freq='MS'
+        quantity = last_known_data['quantity']
+        state = self._initial_state(
+            quantity=quantity,
+            lag_1=last_known_data.get('lag_1', quantity),
+            posting_month=last_known_data['posting_month'],
+            rate=last_known_data.get('rate', 0),
+            u_frt=last_known_data.get('u_frt', 0),
+            lead_time=last_known_data.get('lead_time', 7)
         )
+        if quantiles:
+            self._check_strategy(strategy, quantiles)
+            predictions, quantile_predictions = self._recursive_forecast(state, periods, quantiles=True)
+            return self.to_forecast_frame(predictions[0], quantile_predictions[0])
+        predictions = self._multi_step_forecast(state, periods, strategy)[0]
         
+        return self.to_forecast_frame(predictions)
+    
+    def forecast_future_batch(self, last_known_data: pd.DataFrame, periods: int = 6,
+                              quantiles: bool = False, strategy: str = 'recursive') -> pd.DataFrame:
+        """Forecast future periods for many series at once.
+
+        Each row of ``last_known_data`` is the starting state of one series
+        (same fields as ``forecast_future``). All series are advanced
+        together, so every horizon step is a single booster call over an
+        N-row matrix. With ``quantiles``, the quantile model is evaluated
+        on the same matrix, adding one call per step for all quantiles.
+        With the ``direct`` strategy, all steps come from one call.
+        """
+        n_series = len(last_known_data)
+        logger.info(f"Forecasting {periods} periods ahead for {n_series} series")
+
+        state = self._batch_state(last_known_data)
+        quantile_predictions = None
+        if quantiles:
+            self._check_strategy(strategy, quantiles)
+            predictions, quantile_predictions = self._recursive_forecast(state, periods, quantiles=True)
+        else:
+            predictions = self._multi_step_forecast(state, periods, strategy)
+
         forecast_df = pd.DataFrame({
-            'date': forecast_dates,
+            'series': np.repeat(last_known_data.index.to_numpy(), periods),
+            'date': np.tile(self._forecast_dates(periods), n_series),
+            'predicted_quantity': predictions.ravel(),
+            'model': 'XGBoost'
+        })
+        if quantile_predictions is not None:
+            for j, q in enumerate(self.quantiles):
+                forecast_df[quantile_label(q)] = quantile_predictions[..., j].ravel()
+
+        return forecast_df
+    
+    def to_forecast_frame(self, predictions: np.ndarray,
+                          quantile_predictions: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Wrap predicted quantities, and optionally quantiles, in a dated forecast dataframe."""
+        forecast_df = pd.DataFrame({
+            'date': self._forecast_dates(len(predictions)),
             'predicted_quantity': predictions,
             'model': 'XGBoost'
         })
+        if quantile_predictions is not None:
+            for j, q in enumerate(self.quantiles):
+                forecast_df[quantile_label(q)] = quantile_predictions[:, j]
         
         return forecast_df
+
+    @staticmethod
+    def _forecast_dates(periods: int) -> pd.DatetimeIndex:
+        """Month-start dates for the forecast horizon."""
+        return pd.date_range(
+            start=pd.Timestamp.now().replace(day=1),
+            periods=periods,
+            freq='MS'
+        )
+
+    @staticmethod
+    def _batch_column(df: pd.DataFrame, column: str, default) -> np.ndarray:
+        """Return a column as a float array, falling back to a default."""
+        if column not in df.columns:
+            return np.broadcast_to(np.asarray(default, dtype=float), len(df)).copy()
+        return df[column].to_numpy(dtype=float)
+    
+    def _batch_state(self, last_known_data: pd.DataFrame) -> np.ndarray:
+        """Initial forecast state of every row of ``last_known_data``."""
+        quantity = last_known_data['quantity'].to_numpy(dtype=float)
+        return self._initial_state(
+            quantity=quantity,
+            lag_1=self._batch_column(last_known_data, 'lag_1', quantity),
+            posting_month=last_known_data['posting_month'].to_numpy(dtype=float),
+            rate=self._batch_column(last_known_data, 'rate', 0),
+            u_frt=self._batch_column(last_known_data, 'u_frt', 0),
+            lead_time=self._batch_column(last_known_data, 'lead_time', 7)
+        )
+    
+    @staticmethod
+    def _initial_state(quantity, lag_1, posting_month, rate, u_frt, lead_time) -> np.ndarray:
+        """
+        Build the rolling forecast state for the first horizon step.
+
+        The state is a preallocated float32 buffer laid out in
+        ``FEATURE_COLUMNS`` order, so it doubles as the booster input: the
+        ``lag_1`` column holds the latest quantity and ``lag_2`` the one
+        before it.
+        """
+        quantity = np.atleast_1d(np.asarray(quantity, dtype=np.float32))
+        posting_month = np.atleast_1d(np.asarray(posting_month, dtype=np.float32))
+        
+        state = np.empty((len(quantity), len(FEATURE_COLUMNS)), dtype=np.float32)
+        state[:, LAG_1] = quantity
+        state[:, LAG_2] = lag_1
+        state[:, ROLLING_MEAN_3] = quantity
+        state[:, POSTING_MONTH] = (posting_month % 12) + 1
+        state[:, RATE] = rate
+        state[:, U_FRT] = u_frt
+        state[:, POSTING_QUARTER] = ((posting_month % 12) // 3) + 1
+        state[:, LEAD_TIME] = lead_time
+        
+        return state
+    
+    @staticmethod
+    def _check_strategy(strategy: str, quantiles: bool = False):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}'. Use one of {STRATEGIES}")
+        if quantiles and strategy != 'recursive':
+            raise ValueError("Quantile forecasts are only available with the recursive strategy")
+    
+    def _multi_step_forecast(self, state: np.ndarray, periods: int, strategy: str) -> np.ndarray:
+        """Point forecasts of shape (n, periods) with the given strategy."""
+        self._check_strategy(strategy)
+        if strategy == 'recursive':
+            return self._recursive_forecast(state, periods)
+        return self._direct_forecast(state, periods)
+    
+    def _direct_forecast(self, state: np.ndarray, periods: int, record: bool = True) -> np.ndarray:
+        """All horizon steps from one call of the multi-output direct booster on the initial state."""
+        if self.direct_booster is None:
+            raise ValueError("No direct model. Call fit_direct() first.")
+        if periods > self.direct_periods:
+            raise ValueError(f"The direct model forecasts at most {self.direct_periods} periods")
+        
+        start = time.perf_counter()
+        predictions = self.direct_booster.inplace_predict(state, validate_features=False)
+        if record:
+            INFERENCE_CALLS.inc(backend='xgboost')
+            INFERENCE_ROWS.inc(len(state), backend='xgboost')
+            FORECAST_STEP_DURATION.observe(time.perf_counter() - start, step=1)
+        return predictions.reshape(len(state), self.direct_periods)[:, :periods].astype(np.float32)
+    
+    def _recursive_forecast(self, state: np.ndarray, periods: int, quantiles: bool = False,
+                            record: bool = True) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Advance every row of the state ``periods`` steps, updating it in place.
+
+        With ``quantiles``, also returns quantile forecasts of shape
+        (n, periods, n_quantiles). They are evaluated on the state of the
+        point forecast path, so they are one-step conditional quantiles
+        along that path; uncertainty is not compounded across steps.
+        Without ``record``, serving metrics are left untouched, e.g. for
+        offline table builds.
+        """
+        predictions = np.empty((len(state), periods), dtype=np.float32)
+        if quantiles:
+            if self.quantile_model is None:
+                raise ValueError("No quantile model. Call fit_quantiles() first.")
+            quantile_booster = self.quantile_model.get_booster()
+            quantile_predictions = np.empty((len(state), periods, len(self.quantiles)), dtype=np.float32)
+        
+        for i in range(periods):
+            start = time.perf_counter()
+            pred = self._predict_raw(state, record=record)
+            predictions[:, i] = pred
+            if quantiles:
+                # All quantiles in one call on the shared feature matrix; sorting removes crossings
+                quantile_predictions[:, i] = np.sort(
+                    self._predict_raw(state, quantile_booster, record=record).reshape(len(state), -1), axis=1
+                )
+            
+            # Shift lags and roll the calendar forward one month
+            state[:, LAG_2] = state[:, LAG_1]
+            state[:, LAG_1] = pred
+            state[:, ROLLING_MEAN_3] = pred
+            state[:, POSTING_QUARTER] = ((state[:, POSTING_MONTH] % 12) // 3) + 1
+            state[:, POSTING_MONTH] = (state[:, POSTING_MONTH] % 12) + 1
+            if record:
+                FORECAST_STEP_DURATION.observe(time.perf_counter() - start, step=i + 1)
+        
+        if quantiles:
+            return predictions, quantile_predictions
+        return predictions
+    
+    def _predict_raw(self, X: np.ndarray, booster: Optional[Booster] = None,
+                     record: bool = True) -> np.ndarray:
+        """
+        Run the booster directly on a float32 matrix in FEATURE_COLUMNS order.
+
+        ``booster`` overrides the point model, e.g. with the quantile model.
+        Calls are counted in the inference metrics when ``record`` is set.
+        """
+        if self.feature_columns is None:
+            raise ValueError("Model not trained. Call fit() first.")
+        
+        if list(self.feature_columns) != FEATURE_COLUMNS:
+            X = X[:, [FEATURE_COLUMNS.index(col) for col in self.feature_columns]]
+        
+        use_engine = booster is None and self.engine is not None and len(X) <= self.compiled_max_rows
+        if record:
+            backend = 'compiled' if use_engine else 'xgboost'
+            INFERENCE_CALLS.inc(backend=backend)
+            INFERENCE_ROWS.inc(len(X), backend=backend)
+        
+        if booster is not None:
+            return booster.inplace_predict(X, missing=self.model.missing, validate_features=False)
+        
+        if use_engine:
+            return self.engine.predict(X)
+        
+        return self.model.get_booster().inplace_predict(
+            X,
+            iteration_range=self._iteration_range(),
+            missing=self.model.missing,
+            validate_features=False
+        )
+    
+    def compile(self) -> CompiledTreeEnsemble:
+        """Export the trained booster to the array-backed inference engine."""
+        if self.feature_columns is None:
+            raise ValueError("Model not trained. Call fit() first.")
+        
+        self.engine = CompiledTreeEnsemble.from_booster(
+            self.model.get_booster(),
+            iteration_range=self._iteration_range(),
+            missing=self.model.missing
+        )
+        logger.info(f"Compiled {self.engine.n_trees} trees for NumPy inference")
+        
+        return self.engine
+    
+    def precompute(self, periods: int = 12, max_points: int = 512,
+                   max_cells: int = DEFAULT_MAX_CELLS) -> ForecastTable:
+        """
+        Build the forecast lookup table and measure its error against the model.
+
+        Args:
+            periods: Longest horizon answered from the table
+            max_points: Most split thresholds kept per table axis
+            max_cells: Most (month, quantity, rate, freight) cells in the table
+
+        Returns:
+            Forecast table, also stored in ``table``
+        """
+        table = ForecastTable.build(self, periods=periods, max_points=max_points, max_cells=max_cells)
+        bounds = table.evaluate(self)
+        logger.info(
+            f"Forecast table error: max {bounds['max_abs_error']:.2f}, "
+            f"mean {bounds['mean_abs_error']:.2f}, exact for {bounds['exact_fraction']:.1%} of requests"
+        )
+        self.table = table
+        
+        return table
+    
+    def _iteration_range(self) -> Tuple[int, int]:
+        """Trees to evaluate, honouring early stopping like XGBRegressor.predict."""
+        try:
+            return (0, self.model.best_iteration + 1)
+        except AttributeError:
+            return (0, 0)
+    
+    @staticmethod
+    def training_data_hash(X: pd.DataFrame, y: pd.Series) -> str:
+        """Hash of the training features and target."""
+        digest = hashlib.sha256()
+        digest.update(repr(list(X.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+        digest.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
     
     def save(self, path: str):
-        """Save model to disk."""
+        """Save model to disk; a ``.ubj`` path selects the native format."""
+        if Path(path).suffix == NATIVE_SUFFIX:
+            return self.save_native(path)
+        
         model_data = {
             'model': self.model,
             'feature_columns': self.feature_columns,
-            'config': self.config
+            'config': self.config,
+            'quantile_model': self.quantile_model,
+            'quantiles': self.quantiles,
+            'quantile_metrics': self.quantile_metrics,
+            'direct_booster': self.direct_booster,
+            'direct_periods': self.direct_periods,
+            'direct_metrics': self.direct_metrics
         }
         joblib.dump(model_data, path)
         logger.info(f"Model saved to {path}")
     
     def load(self, path: str):
-        """Load model from disk."""
+        """Load model from disk; ``.ubj`` files are read in the native format."""
+        if Path(path).suffix == NATIVE_SUFFIX:
+            return self.load_native(path)
+        
         model_data = joblib.load(path)
         self.model = model_data['model']
         self.feature_columns = model_data['feature_columns']
         self.config = model_data['config']
-        logger.info(f"Model loaded from {path}")
\ No newline at end of file
+        self.quantile_model = model_data.get('quantile_model')
+        self.quantiles = model_data.get('quantiles')
+        self.quantile_metrics = model_data.get('quantile_metrics')
+        self.direct_booster = model_data.get('direct_booster')
+        self.direct_periods = model_data.get('direct_periods')
+        self.direct_metrics = model_data.get('direct_metrics')
+        self.engine = None
+        self.table = None
+        self.version = hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+        logger.info(f"Model loaded from {path}")
+    
+    def save_native(self, path: str):
+        """
+        Save the booster as UBJSON and its metadata as a JSON manifest.
+
+        Unlike the pickle, neither file can execute code when loaded, and
+        the booster format is stable across XGBoost versions. The manifest
+        is written last, so a model file without one is incomplete.
+        """
+        if self.feature_columns is None:
+            raise ValueError("Model not trained. Call fit() first.")
+        
+        raw = self.model.get_booster().save_raw(raw_format='ubj')
+        quantile_raw = None
+        if self.quantile_model is not None:
+            quantile_raw = bytes(self.quantile_model.get_booster().save_raw(raw_format='ubj'))
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'model_type': 'xgboost',
+            'xgboost_version': xgboost.__version__,
+            'booster_sha256': hashlib.sha256(raw).hexdigest(),
+            'feature_columns': self.feature_columns,
+            'config': self.config,
+            'data_hash': self.data_hash,
+            'metrics': self.metrics
+        }
+        if quantile_raw is not None:
+            manifest.update({
+                'quantiles': list(self.quantiles),
+                'quantile_booster_sha256': hashlib.sha256(quantile_raw).hexdigest(),
+                'quantile_metrics': self.quantile_metrics
+            })
+            _write_atomic(quantile_path(path), quantile_raw)
+        if self.direct_booster is not None:
+            direct_raw = bytes(self.direct_booster.save_raw(raw_format='ubj'))
+            manifest.update({
+                'direct_periods': self.direct_periods,
+                'direct_booster_sha256': hashlib.sha256(direct_raw).hexdigest(),
+                'direct_metrics': self.direct_metrics
+            })
+            _write_atomic(direct_path(path), direct_raw)
+        
+        _write_atomic(Path(path), bytes(raw))
+        _write_atomic(manifest_path(path), json.dumps(manifest, indent=2, default=float).encode())
+        logger.info(f"Model saved to {path}")
+    
+    def load_native(self, path: str):
+        """
+        Load a model saved with ``save_native``.
+
+        Args:
+            path: Path of the ``.ubj`` booster file
+        """
+        manifest = json.loads(manifest_path(path).read_text())
+        if manifest.get('format_version') != FORMAT_VERSION or manifest.get('model_type') != 'xgboost':
+            raise ValueError(f"Unsupported model manifest for {path}")
+        
+        config = manifest['config']
+        raw, digest = _read_raw(path)
+        if digest != manifest['booster_sha256']:
+            raise ValueError(f"Model file {path} does not match its manifest")
+        
+        self.config = config
+        self.model = XGBRegressor(**config)
+        self.model.load_model(raw)
+        self.feature_columns = manifest['feature_columns']
+        self.data_hash = manifest.get('data_hash')
+        self.metrics = manifest.get('metrics')
+        self.quantile_model = None
+        self.quantiles = None
+        self.quantile_metrics = manifest.get('quantile_metrics')
+        if 'quantiles' in manifest:
+            quantile_raw, quantile_digest = _read_raw(str(quantile_path(path)))
+            if quantile_digest != manifest['quantile_booster_sha256']:
+                raise ValueError(f"Quantile model file for {path} does not match its manifest")
+            self.quantiles = tuple(manifest['quantiles'])
+            self.quantile_model = XGBRegressor(
+                **{**config, 'objective': 'reg:quantileerror', 'quantile_alpha': manifest['quantiles']}
+            )
+            self.quantile_model.load_model(quantile_raw)
+        self.direct_booster = None
+        self.direct_periods = manifest.get('direct_periods')
+        self.direct_metrics = manifest.get('direct_metrics')
+        if 'direct_periods' in manifest:
+            direct_booster, direct_digest = _read_booster(str(direct_path(path)), config.get('n_jobs'))
+            if direct_digest != manifest['direct_booster_sha256']:
+                raise ValueError(f"Direct model file for {path} does not match its manifest")
+            self.direct_booster = direct_booster
+        self.engine = None
+        self.table = None
+        self.version = digest[:16]
+        logger.info(f"Model loaded from {path}")
@@ -35,3 +35,54 @@ def sample_prediction_data():
         'u_frt': [500, 520, 510],
         'lead_time': [7, 8, 6]
     })
+
+
+@pytest.fixture
+def hierarchy_dataframe():
+    """Two years of transactions for customers in two regions."""
+    rng = np.random.default_rng(42)
+    n_rows = 600
+    customers = rng.integers(0, 6, n_rows)
+    return pd.DataFrame({
+        'posting_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D'),
+        'quantity': rng.integers(10, 500, n_rows),
+        'region': np.where(customers < 4, 'East', 'West'),
+        'lob': 'FMCG',
+        'customer/vendor_code': customers + 1000
+    })
+
+
+@pytest.fixture
+def series_dataframe():
+    """Three years of monthly orders for four customers with trend and seasonality."""
+    rng = np.random.default_rng(0)
+    months = pd.date_range('2021-01-01', periods=36, freq='MS')
+    frames = []
+    for customer in range(4):
+        level = 100 + 50 * customer + 2 * np.arange(36) + 20 * np.sin(np.arange(36) * np.pi / 6)
+        frames.append(pd.DataFrame({
+            'posting_date': months + pd.Timedelta(days=10),
+            'quantity': np.round(level + rng.normal(0, 5, 36)),
+            'customer/vendor_code': 1000 + customer
+        }))
+    # A customer with two orders only, too short to fit
+    frames.append(pd.DataFrame({
+        'posting_date': [months[-2], months[-1]],
+        'quantity': [30.0, 50.0],
+        'customer/vendor_code': 2000
+    }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def serve_model(tmp_path, monkeypatch):
+    """Serve a fitted forecaster from a fresh registry, as the API would load it from disk."""
+    from src.api import main
+    from src.api.registry import ModelRegistry
+
+    def serve(forecaster, filename: str):
+        forecaster.save(str(tmp_path / filename))
+        monkeypatch.setattr(main, 'registry', ModelRegistry(str(tmp_path), loader=main.load_model))
+        return forecaster
+
+    return serve
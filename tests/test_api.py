@@ -1,11 +1,27 @@
 """Tests for API endpoints."""
+import asyncio
+import io
+import subprocess
+import sys
+import threading
+import time
 import pytest
+import pandas as pd
 from fastapi.testclient import TestClient
 from src.api.main import app
 
 client = TestClient(app)
 
 
+@pytest.fixture
+def trained_model(sample_dataframe, serve_model):
+    """Serve a small forecaster trained on the sample data as the default model."""
+    from src.models.xgboost_forecaster import XGBoostForecaster
+    forecaster = XGBoostForecaster(config={'n_estimators': 10, 'random_state': 42})
+    forecaster.fit(sample_dataframe)
+    return serve_model(forecaster, 'xgboost_model.ubj')
+
+
 class TestAPIEndpoints:
     """Test cases for API endpoints."""
     
@@ -27,6 +43,29 @@ class TestAPIEndpoints:
         data = response.json()
         assert data['status'] == 'healthy'
         
+    def test_ready_endpoint_after_startup(self):
+        """Test readiness turns from loading to ready once startup loading ends."""
+        with TestClient(app) as started:
+            deadline = time.monotonic() + 30
+            response = started.get("/ready")
+            while response.json()['status'] == 'loading' and time.monotonic() < deadline:
+                time.sleep(0.05)
+                response = started.get("/ready")
+        
+        # Ready with a trained model, failed without one (expected in CI)
+        assert response.json()['status'] in ['ready', 'failed']
+        assert response.status_code == (200 if response.json()['status'] == 'ready' else 503)
+        
+    def test_import_defers_inference_stack(self):
+        """Test that importing the app does not import pandas, xgboost or scikit-learn."""
+        code = (
+            "import sys; import src.api.main; "
+            "print([m for m in ('pandas', 'xgboost', 'sklearn') if m in sys.modules])"
+        )
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        
+        assert output.stdout.strip() == '[]'
+        
     def test_predict_endpoint_requires_features(self):
         """Test predict endpoint validates input."""
         # Send empty request
@@ -35,7 +74,7 @@ class TestAPIEndpoints:
         # Should return validation error
         assert response.status_code == 422
         
-    def test_predict_endpoint_with_valid_data(self):
+    def test_predict_endpoint_with_valid_data(self, trained_model):
         """Test predict endpoint with valid prediction request."""
         request_data = {
             "periods": 6,
@@ -47,12 +86,282 @@ class TestAPIEndpoints:
         
         response = client.post("/predict", json=request_data)
         
-        # Note: This might fail if model isn't trained, which is expected in CI
-        assert response.status_code in [200, 500]
+        assert response.status_code == 200
+        assert len(response.json()) == 6
+        
+    def test_predict_batch_endpoint(self, trained_model):
+        """Test batch predict endpoint returns one forecast per series."""
+        request_data = {
+            "series": [
+                {"periods": 3, "last_quantity": 100, "current_month": 5},
+                {"periods": 6, "last_quantity": 250, "current_month": 11, "rate": 13.0}
+            ]
+        }
+        
+        response = client.post("/predict/batch", json=request_data)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['series'] for item in data] == [0, 1]
+        assert len(data[0]['forecast']) == 3
+        assert len(data[1]['forecast']) == 6
+            
+    def test_predict_batch_endpoint_rejects_empty_batch(self):
+        """Test batch predict endpoint validates input."""
+        response = client.post("/predict/batch", json={"series": []})
+        
+        assert response.status_code == 422
+        
+    def test_repeated_predict_hits_cache(self, trained_model):
+        """Test that a repeated request is answered from the forecast cache."""
+        request_data = {"periods": 6, "last_quantity": 321, "current_month": 7}
+        
+        first = client.post("/predict", json=request_data)
+        assert first.status_code == 200
+        hits_before = client.get("/cache/stats").json()['hits']
         
+        second = client.post("/predict", json={**request_data, "periods": 3})
+        
+        assert second.status_code == 200
+        assert second.json() == first.json()[:3]
+        assert client.get("/cache/stats").json()['hits'] == hits_before + 1
+        
+    def test_coalesced_predict_matches_batch(self, trained_model):
+        """Test that /predict, run through the coalescer, matches the batch forecast."""
+        request_data = {"periods": 4, "last_quantity": 487.5, "current_month": 2, "rate": 11.0}
+        requests_before = client.get("/coalescer/stats").json()['requests']
+        
+        single = client.post("/predict", json=request_data)
+        assert single.status_code == 200
+        batch = client.post("/predict/batch", json={"series": [request_data]})
+        
+        assert single.json() == batch.json()[0]['forecast']
+        stats = client.get("/coalescer/stats").json()
+        assert stats['requests'] == requests_before + 1
+        assert stats['batches'] >= 1
+        
+    def test_upload_and_predict_accepts_csv(self, sample_dataframe, trained_model):
+        """Test upload endpoint parses a CSV export."""
+        export = sample_dataframe[['posting_date', 'quantity', 'rate', 'u_frt']].rename(
+            columns={'posting_date': 'POSTING DATE', 'quantity': 'QUANTITY', 'rate': 'RATE', 'u_frt': 'U_Frt'}
+        )
+        buffer = io.BytesIO(export.to_csv(index=False).encode())
+        
+        response = client.post(
+            "/upload-and-predict?periods=3",
+            files={"file": ("export.csv", buffer, "text/csv")}
+        )
+        
+        assert response.status_code == 200
+        assert len(response.json()['forecast']) == 3
+            
+    @pytest.mark.parametrize("filename", ["export.txt", "export.xls"])
+    def test_upload_and_predict_rejects_unknown_format(self, filename):
+        """Test upload endpoint refuses unsupported file types, legacy xls included."""
+        response = client.post(
+            "/upload-and-predict",
+            files={"file": (filename, io.BytesIO(b"quantity\n1\n"), "application/octet-stream")}
+        )
+        
+        assert response.status_code == 415
+        
+    @pytest.mark.parametrize("periods", [0, 13])
+    def test_upload_and_predict_rejects_out_of_range_periods(self, periods):
+        """Test upload endpoint bounds periods like the other forecast endpoints."""
+        response = client.post(
+            f"/upload-and-predict?periods={periods}",
+            files={"file": ("export.csv", io.BytesIO(b"quantity\n1\n"), "text/csv")}
+        )
+        
+        assert response.status_code == 422
+        
+    def test_upload_and_predict_rejects_per_series_model(self, tmp_path, monkeypatch):
+        """Test that models without forecast_future are refused with 400, as on /predict."""
+        from src.api import main
+        from src.api.registry import ModelRegistry
+        (tmp_path / 'arima_model.pkl').write_bytes(b'model')
+        monkeypatch.setattr(main, 'registry', ModelRegistry(str(tmp_path), loader=lambda name, path: object()))
+        
+        response = client.post(
+            "/upload-and-predict?model=arima",
+            files={"file": ("export.csv", io.BytesIO(b"quantity\n1\n"), "text/csv")}
+        )
+        
+        assert response.status_code == 400
+        
+    def test_models_endpoint_lists_registry(self):
+        """Test models endpoint reports artifacts by name and version."""
+        response = client.get("/models")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['default_model'] == 'xgboost'
+        assert isinstance(data['available_models'], dict)
+        
+    def test_predict_unknown_model_version(self):
+        """Test that requesting a missing model version returns 404."""
+        response = client.post("/predict", json={
+            "last_quantity": 150.0,
+            "current_month": 3,
+            "version": "does-not-exist"
+        })
+        
+        assert response.status_code == 404
+        
+    def test_batch_returns_503_when_pool_is_full(self, sample_dataframe, serve_model, monkeypatch):
+        """Test backpressure: work is refused while the inference pool is saturated."""
+        from src.api import main
+        from src.api.executor import WorkerPool
+        from src.models.xgboost_forecaster import XGBoostForecaster
+        forecaster = XGBoostForecaster(config={'n_estimators': 10, 'random_state': 42})
+        forecaster.fit(sample_dataframe)
+        serve_model(forecaster, 'xgboost_model.ubj')
+        full_pool = WorkerPool(max_workers=1, max_queue=0)
+        monkeypatch.setattr(main, 'work_pool', full_pool)
+        release = threading.Event()
+        blocker = threading.Thread(target=asyncio.run, args=(full_pool.run(release.wait),))
+        blocker.start()
+        while full_pool.pending == 0:
+            time.sleep(0.01)
+        
+        try:
+            response = client.post("/predict/batch", json={"series": [{"last_quantity": 10.0, "current_month": 1}]})
+        finally:
+            release.set()
+            blocker.join()
+        
+        assert response.status_code == 503
+        assert response.headers['retry-after'] == '1'
+            
+    def test_hierarchy_forecast_endpoint(self, hierarchy_dataframe, serve_model):
+        """Test forecasting hierarchy nodes from a registered hierarchical model."""
+        from src.models.hierarchy import HierarchicalForecaster
+        forecaster = HierarchicalForecaster(config={'n_estimators': 10, 'random_state': 42})
+        forecaster.fit(hierarchy_dataframe)
+        serve_model(forecaster, 'hierarchical_model.pkl')
+        
+        response = client.get("/hierarchy/forecast", params={"node": "West", "periods": 3, "method": "bottom_up"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['level'] == 'region'
+        assert data['children'] == ['West|FMCG']
+        assert len(data['forecast']) == 3
+        assert client.get("/hierarchy/forecast", params={"node": "North"}).status_code == 404
+        assert client.get("/hierarchy/forecast", params={"method": "top_down"}).status_code == 422
+        
+    def test_series_forecast_endpoint(self, series_dataframe, serve_model):
+        """Test forecasting a customer series from a registered ARIMA model."""
+        from src.models.arima_forecaster import ARIMAForecaster
+        forecaster = ARIMAForecaster(n_jobs=1)
+        forecaster.fit(series_dataframe)
+        serve_model(forecaster, 'arima_model.pkl')
+        
+        response = client.get("/series/forecast", params={"series": "1001", "periods": 3})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'ok'
+        assert [item['model'] for item in data['forecast']] == ['ARIMA'] * 3
+        assert client.get("/series/forecast", params={"series": "9999"}).status_code == 404
+        assert client.get("/series/forecast", params={"series": "1001", "model": "prophet"}).status_code == 404
+        assert client.post("/predict", json={"last_quantity": 100, "current_month": 5, "model": "arima"}).status_code == 400
+        
+    def test_predict_quantiles(self, sample_dataframe, serve_model):
+        """Test quantile forecasts from /predict and /predict/batch."""
+        from src.models.xgboost_forecaster import XGBoostForecaster
+        forecaster = XGBoostForecaster(config={'n_estimators': 10, 'random_state': 42})
+        forecaster.fit(sample_dataframe)
+        serve_model(forecaster, 'xgboost_model.ubj')
+        request = {"periods": 3, "last_quantity": 120, "current_month": 5, "quantiles": True}
+        
+        assert client.post("/predict", json=request).status_code == 400
+        
+        forecaster.fit_quantiles(sample_dataframe)
+        serve_model(forecaster, 'xgboost_model.ubj')
+        response = client.post("/predict", json=request)
+        batch = client.post("/predict/batch", json={"series": [request, {**request, "quantiles": False}]})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 3
+        assert set(data[0]['quantiles']) == {'p10', 'p50', 'p90'}
+        assert data[0]['quantiles']['p10'] <= data[0]['quantiles']['p90']
+        assert batch.json()[0]['forecast'][0]['quantiles'] == data[0]['quantiles']
+        assert batch.json()[1]['forecast'][0]['quantiles'] is None
+
+    def test_predict_serves_new_version_without_models_call(self, sample_dataframe, tmp_path, monkeypatch):
+        """Test that a version dropped into the model directory reaches /predict on its own."""
+        import os
+        from src.api import main
+        from src.api.registry import ModelRegistry
+        from src.models.xgboost_forecaster import XGBoostForecaster
+        (tmp_path / 'xgboost').mkdir()
+        for version, n_estimators in (('v1', 5), ('v2', 50)):
+            forecaster = XGBoostForecaster(config={'n_estimators': n_estimators, 'random_state': 42})
+            forecaster.fit(sample_dataframe)
+            forecaster.save(str(tmp_path / 'xgboost' / f'{version}.ubj'))
+        os.rename(tmp_path / 'xgboost' / 'v2.ubj', tmp_path / 'v2.ubj')
+        monkeypatch.setattr(main, 'registry', ModelRegistry(str(tmp_path), refresh_interval=0, loader=main.load_model))
+        request = {"periods": 3, "last_quantity": 120, "current_month": 5}
+        first = client.post("/predict", json=request).json()
+        
+        os.rename(tmp_path / 'v2.ubj', tmp_path / 'xgboost' / 'v2.ubj')
+        os.utime(tmp_path / 'xgboost' / 'v2.ubj', (time.time() + 10, time.time() + 10))
+        deadline = time.monotonic() + 10
+        latest = first
+        while latest == first and time.monotonic() < deadline:
+            time.sleep(0.05)
+            latest = client.post("/predict", json=request).json()
+        
+        assert latest != first
+        assert latest == client.post("/predict", json={**request, "version": "v2"}).json()
+        assert client.post("/predict", json={**request, "version": "v1"}).json() == first
+
+    def test_predict_direct_strategy(self, sample_dataframe, serve_model):
+        """Test direct forecasts from /predict and a mixed /predict/batch."""
+        from src.models.xgboost_forecaster import XGBoostForecaster
+        forecaster = XGBoostForecaster(config={'n_estimators': 10, 'random_state': 42})
+        forecaster.fit(sample_dataframe)
+        serve_model(forecaster, 'xgboost_model.ubj')
+        request = {"periods": 2, "last_quantity": 120, "current_month": 5, "strategy": "direct"}
+
+        assert client.post("/predict", json=request).status_code == 400
+        assert client.post("/predict", json={**request, "strategy": "sideways"}).status_code == 422
+
+        forecaster.fit_direct(sample_dataframe, periods=3)
+        serve_model(forecaster, 'xgboost_model.ubj')
+        response = client.post("/predict", json=request)
+        recursive = client.post("/predict", json={**request, "strategy": "recursive"})
+        batch = client.post("/predict/batch", json={"series": [request, {**request, "strategy": "recursive"}]})
+
+        assert response.status_code == 200
+        direct_values = [item['predicted_quantity'] for item in response.json()]
+        recursive_values = [item['predicted_quantity'] for item in recursive.json()]
+        assert direct_values != recursive_values
+        assert [item['predicted_quantity'] for item in batch.json()[0]['forecast']] == pytest.approx(direct_values)
+        assert [item['predicted_quantity'] for item in batch.json()[1]['forecast']] == pytest.approx(recursive_values)
+        assert {item['quantity_basis'] for item in response.json()} == {'month_total'}
+        assert {item['quantity_basis'] for item in recursive.json()} == {'transaction'}
+        assert [series['forecast'][0]['quantity_basis'] for series in batch.json()] == ['month_total', 'transaction']
+        assert client.post("/predict", json={**request, "periods": 4}).status_code == 400
+        assert client.post("/predict", json={**request, "quantiles": True}).status_code == 400
+
     def test_metrics_endpoint(self):
         """Test metrics endpoint."""
         response = client.get("/metrics")
         
         # Should return metrics or appropriate error
         assert response.status_code in [200, 404, 500]
+        
+    def test_metrics_record_requests_by_route(self):
+        """Test that requests show up in the Prometheus exposition by route template."""
+        client.get("/health")
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/plain')
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+        assert '# TYPE http_request_duration_seconds histogram' in response.text
+        assert 'http_requests_in_flight' in response.text
@@ -0,0 +1,94 @@
+"""Tests for walk-forward backtesting."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.models import shared
+from src.models.backtest import WalkForwardBacktester
+
+
+@pytest.fixture
+def processed_data():
+    """Processed-style data over 24 months, in shuffled row order."""
+    rng = np.random.default_rng(5)
+    n = 480
+    dates = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 730, n), unit='D')
+    quantity = rng.integers(50, 300, n).astype(float)
+    return pd.DataFrame({
+        'posting_date': dates,
+        'quantity': quantity,
+        'lag_1': quantity + rng.normal(0, 10, n),
+        'lag_2': quantity + rng.normal(0, 20, n),
+        'rolling_mean_3': quantity + rng.normal(0, 5, n),
+        'posting_month': dates.month,
+        'rate': rng.uniform(1000, 2000, n),
+        'u_frt': rng.uniform(0, 50, n),
+        'posting_quarter': dates.quarter,
+        'lead_time': rng.integers(0, 30, n)
+    })
+
+
+class TestWalkForwardBacktester:
+    """Test cases for WalkForwardBacktester class."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.config = {'n_estimators': 20, 'max_depth': 3, 'random_state': 42}
+        
+    def test_reports_metrics_per_horizon(self, processed_data):
+        """Test the shape of the fold and horizon reports."""
+        backtester = WalkForwardBacktester(self.config, n_folds=4, horizon=2, n_workers=1)
+        
+        results = backtester.run(processed_data)
+        
+        assert set(results['folds']['cutoff']) == set(backtester.cutoffs(processed_data['posting_date']))
+        assert list(results['horizons']['horizon']) == [1, 2]
+        for metric in ['mae', 'rmse', 'mape', 'r2']:
+            assert results['horizons'][metric].notna().all()
+        assert results['horizons']['n_test'].sum() == results['folds']['n_test'].sum()
+        
+    def test_training_never_sees_the_future(self, processed_data):
+        """Test that every fold trains strictly before its cutoff and tests after it."""
+        backtester = WalkForwardBacktester(self.config, n_folds=4, horizon=2, window_months=6, n_workers=1)
+        df = processed_data.sort_values('posting_date')
+        dates = df['posting_date'].to_numpy()
+        
+        for fold in backtester._fold_slices(dates):
+            cutoff = np.datetime64(fold['cutoff'])
+            train_dates = dates[fold['train'][0]:fold['train'][1]]
+            test_dates = dates[fold['test'][0]:fold['test'][1]]
+            assert train_dates.max() < cutoff
+            assert train_dates.min() >= np.datetime64(fold['cutoff'] - pd.DateOffset(months=6))
+            assert test_dates.min() >= cutoff
+            assert test_dates.max() < np.datetime64(fold['cutoff'] + pd.DateOffset(months=2))
+            
+    def test_forecasts_ignore_post_cutoff_features(self, processed_data):
+        """Test that every horizon is forecast from the cutoff state, not realized later lags."""
+        backtester = WalkForwardBacktester(self.config, n_folds=1, horizon=2, n_workers=1)
+        cutoff = backtester.cutoffs(processed_data['posting_date'])[0]
+        changed = processed_data.copy()
+        after = changed['posting_date'] >= cutoff
+        changed.loc[after, ['lag_1', 'lag_2', 'rolling_mean_3']] = 0.0
+        
+        expected = backtester.run(processed_data)
+        result = backtester.run(changed)
+        
+        pd.testing.assert_frame_equal(result['horizons'], expected['horizons'])
+        
+    def test_parallel_matches_serial(self, processed_data):
+        """Test that folds fitted from shared memory give the in-process results."""
+        serial = WalkForwardBacktester(self.config, n_folds=3, n_workers=1).run(processed_data)
+        
+        parallel = WalkForwardBacktester(self.config, n_folds=3, n_workers=2).run(processed_data)
+        
+        pd.testing.assert_frame_equal(parallel['folds'], serial['folds'])
+        pd.testing.assert_frame_equal(parallel['horizons'], serial['horizons'])
+        assert shared.arrays == {}
+        
+    def test_skips_folds_without_enough_history(self, processed_data):
+        """Test that cutoffs with too little training data are dropped."""
+        backtester = WalkForwardBacktester(self.config, n_folds=3, min_train_rows=10_000, n_workers=1)
+        
+        results = backtester.run(processed_data)
+        
+        assert results['folds'].empty
+        assert results['horizons'].empty
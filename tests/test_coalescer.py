@@ -0,0 +1,76 @@
+"""Tests for the /predict micro-batching coalescer."""
+import asyncio
+import pytest
+from src.api.coalescer import RequestCoalescer
+
+
+class TestRequestCoalescer:
+    """Test cases for RequestCoalescer class."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.batches = []
+
+    async def double(self, key, items):
+        self.batches.append((key, list(items)))
+        await asyncio.sleep(0)
+        return [item * 2 for item in items]
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Test that requests within the window run as one batch, in order."""
+        coalescer = RequestCoalescer(self.double, max_batch_size=64, max_wait=0.01)
+
+        async def scenario():
+            return await asyncio.gather(*[coalescer.submit('model', i) for i in range(5)])
+
+        assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+        assert self.batches == [('model', [0, 1, 2, 3, 4])]
+
+    def test_full_batch_runs_without_waiting(self):
+        """Test that a batch is run as soon as it reaches max_batch_size."""
+        coalescer = RequestCoalescer(self.double, max_batch_size=2, max_wait=10.0)
+
+        async def scenario():
+            return await asyncio.wait_for(
+                asyncio.gather(*[coalescer.submit('model', i) for i in range(4)]), timeout=1.0
+            )
+
+        assert asyncio.run(scenario()) == [0, 2, 4, 6]
+        assert [items for _, items in self.batches] == [[0, 1], [2, 3]]
+
+    def test_keys_are_batched_separately(self):
+        """Test that requests for different models never share a batch."""
+        coalescer = RequestCoalescer(self.double, max_wait=0.01)
+
+        async def scenario():
+            return await asyncio.gather(
+                coalescer.submit('a', 1), coalescer.submit('b', 2), coalescer.submit('a', 3)
+            )
+
+        assert asyncio.run(scenario()) == [2, 4, 6]
+        assert sorted(self.batches) == [('a', [1, 3]), ('b', [2])]
+
+    def test_errors_reach_every_caller_and_stats(self):
+        """Test that a failing batch fails all its callers and is still counted."""
+        async def fail(key, items):
+            raise RuntimeError("booster failed")
+
+        coalescer = RequestCoalescer(fail, max_wait=0.01)
+
+        async def scenario():
+            return await asyncio.gather(
+                *[coalescer.submit('model', i) for i in range(3)], return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        stats = coalescer.stats()
+        assert stats['requests'] == 3
+        assert stats['batches'] == 1
+        assert stats['mean_batch_size'] == 3
+
+    def test_rejects_empty_batches(self):
+        """Test invalid batch size handling."""
+        with pytest.raises(ValueError):
+            RequestCoalescer(self.double, max_batch_size=0)
@@ -72,3 +72,35 @@ class TestDataProcessor:
         
         assert pd.api.types.is_datetime64_any_dtype(result['posting_date'])
         assert pd.isna(result['posting_date'].iloc[0])
+        
+    def test_compact_mode_shrinks_processed_frame(self):
+        """Test that compact mode downcasts and categorizes columns."""
+        rng = np.random.default_rng(0)
+        n = 300
+        df = pd.DataFrame({
+            'POSTING DATE': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+            'Customer/Vendor Code': rng.integers(10000000, 10000050, n),
+            'QUANTITY': rng.integers(1, 500, n),
+            'RATE': rng.integers(1000, 3000, n),
+            'Region': rng.choice(['East', 'West', 'North', 'South'], n),
+            'Vehicle Type': rng.choice(['19ft Vehicle', '32ft SXL'], n)
+        })
+        
+        regular = DataProcessor().process(df.copy())
+        compact = DataProcessor(compact=True).process(df.copy())
+        
+        assert compact['quantity'].dtype == np.int16
+        assert compact['rate'].dtype == np.float32
+        assert isinstance(compact['vehicle_type'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_integer_dtype(compact['posting_day_of_week'])
+        assert compact['is_posting_weekend'].dtype == bool
+        assert compact.memory_usage(deep=True).sum() * 3 < regular.memory_usage(deep=True).sum()
+        np.testing.assert_allclose(compact['lag_1'], regular['lag_1'])
+        
+    def test_compact_mode_keeps_precision_of_large_floats(self):
+        """Test that floats float32 cannot hold exactly stay float64."""
+        df = pd.DataFrame({'quantity': [1, 2], 'numatcard_id': [123456789.0, 987654321.0]})
+        
+        result = DataProcessor(compact=True).convert_datatypes(df)
+        
+        assert result['numatcard_id'].dtype == np.float64
@@ -0,0 +1,32 @@
+"""Tests for the direct multi-horizon booster."""
+import pytest
+import numpy as np
+from src.models.direct import fit_multi_output
+
+
+class TestDirectBooster:
+    """Test cases for multi-output fitting."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(200, 4)).astype(np.float32)
+        self.Y = np.column_stack([self.X[:, 0] * h + rng.normal(size=200) for h in (1, 2, 3)]).astype(np.float32)
+        self.config = {'n_estimators': 30, 'max_depth': 3, 'random_state': 42}
+
+    def test_one_call_returns_every_horizon(self):
+        """Test that one prediction call returns a column per horizon, each fitted to its own target."""
+        booster = fit_multi_output(self.config, self.X, self.Y)
+
+        predictions = booster.inplace_predict(self.X)
+
+        assert predictions.shape == (200, 3)
+        for h in (1, 2, 3):
+            assert np.polyfit(self.X[:, 0], predictions[:, h - 1], 1)[0] == pytest.approx(h, rel=0.25)
+
+    def test_unknown_targets_are_ignored(self):
+        """Test that NaN targets do not pull their horizon's output toward the fill value."""
+        self.Y[:100, 2] = np.nan
+
+        predictions = fit_multi_output(self.config, self.X, self.Y).inplace_predict(self.X)
+
+        assert np.polyfit(self.X[:100, 0], predictions[:100, 2], 1)[0] == pytest.approx(3, rel=0.25)
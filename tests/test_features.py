@@ -0,0 +1,103 @@
+"""Tests for grouped time series features."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.features import grouped_lag_features, grouped_leads, monthly_leads
+
+
+@pytest.fixture
+def transactions():
+    """Shuffled multi-customer transactions."""
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'customer': rng.integers(0, 20, n),
+        'item': rng.choice(['A', 'B'], n),
+        'posting_date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.permutation(n), unit='D'),
+        'quantity': rng.integers(1, 500, n).astype(float)
+    }, index=rng.permutation(n) * 3)
+
+
+def groupby_reference(df, keys):
+    """Per-group shift and rolling mean of the previous values, computed with pandas groupby."""
+    ordered = df.sort_values('posting_date', kind='stable')
+    grouped = ordered.groupby(keys)['quantity']
+    return pd.DataFrame({
+        'lag_1': grouped.shift(1),
+        'lag_2': grouped.shift(2),
+        'rolling_mean_3': grouped.transform(lambda s: s.shift(1).rolling(3).mean())
+    }).loc[df.index]
+
+
+class TestGroupedLagFeatures:
+    """Test cases for grouped_lag_features."""
+    
+    @pytest.mark.parametrize('keys', [['customer'], ['customer', 'item']])
+    def test_matches_groupby_reference(self, transactions, keys):
+        """Test parity with pandas groupby shift/rolling."""
+        result = grouped_lag_features(transactions, 'quantity', keys, 'posting_date')
+        
+        pd.testing.assert_frame_equal(result, groupby_reference(transactions, keys))
+        
+    def test_without_groups_matches_global_shift(self, transactions):
+        """Test that no keys and no ordering reproduce a plain shift/rolling."""
+        result = grouped_lag_features(transactions, 'quantity')
+        
+        np.testing.assert_array_equal(result['lag_1'], transactions['quantity'].shift(1))
+        np.testing.assert_allclose(result['rolling_mean_3'], transactions['quantity'].shift(1).rolling(3).mean())
+        
+    def test_result_is_independent_of_row_order(self, transactions):
+        """Test that shuffling input rows does not change features."""
+        shuffled = transactions.sample(frac=1, random_state=1)
+        
+        a = grouped_lag_features(transactions, 'quantity', ['customer'], 'posting_date')
+        b = grouped_lag_features(shuffled, 'quantity', ['customer'], 'posting_date')
+        
+        pd.testing.assert_frame_equal(a, b.loc[a.index])
+
+
+class TestGroupedLeads:
+    """Test cases for grouped_leads."""
+    
+    @pytest.mark.parametrize('keys', [['customer'], ['customer', 'item']])
+    def test_matches_groupby_reference(self, transactions, keys):
+        """Test parity with a negative pandas groupby shift."""
+        result = grouped_leads(transactions, 'quantity', keys, 'posting_date', leads=(1, 3))
+        
+        ordered = transactions.sort_values('posting_date', kind='stable')
+        grouped = ordered.groupby(keys)['quantity']
+        expected = pd.DataFrame({'lead_1': grouped.shift(-1), 'lead_3': grouped.shift(-3)}).loc[transactions.index]
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestMonthlyLeads:
+    """Test cases for monthly_leads."""
+    
+    @pytest.mark.parametrize('keys', [['customer'], ['customer', 'item']])
+    def test_matches_monthly_groupby_reference(self, transactions, keys):
+        """Test parity with entity-month totals reindexed over every month and shifted back."""
+        result = monthly_leads(transactions, 'quantity', keys, 'posting_date', leads=(1, 3))
+        
+        month = transactions['posting_date'].dt.to_period('M')
+        months = pd.period_range(month.min(), month.max(), freq='M')
+        totals = transactions.groupby(keys + [month])['quantity'].sum().unstack(fill_value=0.0)
+        totals = totals.reindex(columns=months, fill_value=0.0)
+        expected = {}
+        for k in (1, 3):
+            shifted = totals.shift(-k, axis=1).stack(future_stack=True).rename(f'lead_{k}')
+            keyed = transactions[keys].assign(posting_date=month)
+            expected[f'lead_{k}'] = keyed.join(shifted, on=keys + ['posting_date'])[f'lead_{k}']
+        pd.testing.assert_frame_equal(result, pd.DataFrame(expected))
+    
+    def test_months_without_rows_count_as_zero(self):
+        """Test that a gap month is a zero target and months past the data are unknown."""
+        df = pd.DataFrame({
+            'customer': [1, 1, 1, 2],
+            'posting_date': pd.to_datetime(['2024-01-05', '2024-01-20', '2024-03-02', '2024-02-10']),
+            'quantity': [10.0, 5.0, 7.0, 4.0]
+        })
+        
+        result = monthly_leads(df, 'quantity', ['customer'], leads=(1, 2))
+        
+        np.testing.assert_array_equal(result['lead_1'], [0.0, 0.0, np.nan, 0.0])
+        np.testing.assert_array_equal(result['lead_2'], [7.0, 7.0, np.nan, np.nan])
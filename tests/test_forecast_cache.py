@@ -0,0 +1,73 @@
+"""Tests for the forecast cache."""
+import pytest
+import numpy as np
+from src.api.cache import ForecastCache
+from src.api.schemas import PredictionRequest
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+    
+    def __init__(self):
+        self.now = 0.0
+        
+    def __call__(self):
+        return self.now
+
+
+class TestForecastCache:
+    """Test cases for ForecastCache class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = ForecastCache(max_size=2, ttl=60.0, clock=self.clock)
+        
+    def test_make_key_ignores_periods_and_normalizes_numbers(self):
+        """Test that equivalent requests share one key."""
+        a = PredictionRequest(periods=3, last_quantity=100, current_month=5, rate=12.5)
+        b = PredictionRequest(periods=12, last_quantity=100.0, current_month=5, rate=12.5, freight_cost=-0.0)
+        
+        assert ForecastCache.make_key(a, 'v1') == ForecastCache.make_key(b, 'v1')
+        assert ForecastCache.make_key(a, 'v1') != ForecastCache.make_key(a, 'v2')
+        
+    def test_longer_horizon_answers_shorter_request(self):
+        """Test prefix reuse of a cached horizon."""
+        self.cache.put('key', np.arange(12, dtype=float))
+        
+        np.testing.assert_array_equal(self.cache.get('key', 4), np.arange(4))
+        assert self.cache.get('key', 12) is not None
+        assert self.cache.stats()['hits'] == 2
+        
+    def test_shorter_horizon_misses_longer_request(self):
+        """Test that a short cached horizon does not answer a longer request."""
+        self.cache.put('key', np.arange(3, dtype=float))
+        
+        assert self.cache.get('key', 6) is None
+        assert self.cache.stats()['misses'] == 1
+        
+    def test_put_keeps_longer_horizon(self):
+        """Test that storing a shorter result does not truncate the entry."""
+        self.cache.put('key', np.arange(12, dtype=float))
+        self.cache.put('key', np.arange(3, dtype=float))
+        
+        assert len(self.cache.get('key', 12)) == 12
+        
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test LRU eviction once the cache is full."""
+        self.cache.put('a', np.ones(3))
+        self.cache.put('b', np.ones(3))
+        self.cache.get('a', 3)
+        self.cache.put('c', np.ones(3))
+        
+        assert self.cache.get('b', 3) is None
+        assert self.cache.get('a', 3) is not None
+        assert self.cache.stats()['evictions'] == 1
+        
+    def test_expired_entry_is_a_miss(self):
+        """Test TTL expiry."""
+        self.cache.put('key', np.ones(3))
+        self.clock.now = 61.0
+        
+        assert self.cache.get('key', 3) is None
+        assert self.cache.stats()['size'] == 0
@@ -0,0 +1,78 @@
+"""Tests for the precomputed forecast table."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.forecast_table import ForecastTable
+from src.models.xgboost_forecaster import XGBoostForecaster
+
+
+class TestForecastTable:
+    """Test cases for ForecastTable class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.forecaster = XGBoostForecaster({'n_estimators': 20, 'max_depth': 3, 'random_state': 42})
+
+    def test_full_table_matches_forecast_future(self, sample_dataframe):
+        """Test that a table keeping every threshold reproduces exact inference."""
+        self.forecaster.fit(sample_dataframe)
+        table = self.forecaster.precompute(periods=6)
+        last_known = pd.Series({'quantity': 137.0, 'lag_1': 137.0, 'posting_month': 4, 'rate': 12.2, 'u_frt': 480.0})
+
+        expected = self.forecaster.forecast_future(last_known, periods=6)['predicted_quantity'].to_numpy()
+
+        np.testing.assert_array_equal(table.lookup(4, 137.0, 12.2, 480.0, 6), expected)
+        assert table.error_bounds['max_abs_error'] == 0
+        assert table.error_bounds['exact_fraction'] == 1
+        assert self.forecaster.table is table
+
+    def test_thinned_table_reports_error_bounds(self, sample_dataframe):
+        """Test that thinning the axes shrinks the table and is measured."""
+        self.forecaster.fit(sample_dataframe)
+        full = ForecastTable.build(self.forecaster, periods=3)
+        thinned = ForecastTable.build(self.forecaster, periods=3, max_points=2)
+
+        bounds = thinned.evaluate(self.forecaster, n_samples=200)
+
+        assert thinned.values.size < full.values.size
+        assert len(thinned.quantity_edges) <= 2
+        assert bounds['max_abs_error'] >= bounds['p99_abs_error'] >= 0
+        assert bounds['n_samples'] == 200
+
+    def test_cell_budget_thins_axes_before_building(self, sample_dataframe):
+        """Test that the table never exceeds its cell budget."""
+        self.forecaster.fit(sample_dataframe)
+        full = ForecastTable.build(self.forecaster, periods=3)
+
+        table = ForecastTable.build(self.forecaster, periods=3, max_cells=full.values[..., 0].size // 4)
+
+        assert table.values[..., 0].size <= full.values[..., 0].size // 4
+        with pytest.raises(ValueError):
+            ForecastTable.build(self.forecaster, periods=3, max_cells=1)
+
+    def test_build_leaves_serving_metrics_untouched(self, sample_dataframe):
+        """Test that precomputing the table is not counted as served inference."""
+        from src.monitoring.metrics import FORECAST_STEP_DURATION, INFERENCE_CALLS
+        self.forecaster.fit(sample_dataframe)
+        calls = INFERENCE_CALLS.value(backend='xgboost')
+        steps = FORECAST_STEP_DURATION.count(step=1)
+
+        self.forecaster.precompute(periods=3)
+
+        assert INFERENCE_CALLS.value(backend='xgboost') == calls
+        assert FORECAST_STEP_DURATION.count(step=1) == steps
+
+    def test_requests_outside_table_fall_back(self, sample_dataframe):
+        """Test that longer horizons and missing inputs are not answered."""
+        self.forecaster.fit(sample_dataframe)
+        table = ForecastTable.build(self.forecaster, periods=3)
+
+        assert table.lookup(5, 100.0, 12.0, 500.0, 6) is None
+        assert table.lookup(5, 100.0, None, 500.0, 3) is None
+        assert table.lookup(5, float('nan'), 12.0, 500.0, 3) is None
+        assert table.lookup(5, 100.0, 12.0, 500.0, 3).shape == (3,)
+
+    def test_requires_trained_model(self):
+        """Test building from an untrained model."""
+        with pytest.raises(ValueError):
+            ForecastTable.build(self.forecaster)
@@ -0,0 +1,86 @@
+"""Tests for hierarchical forecasting and reconciliation."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.hierarchy import (
+    RECONCILIATION_METHODS, HierarchicalForecaster, reconcile, summing_matrix
+)
+
+
+class TestReconciliation:
+    """Test cases for the summing matrix and reconcile."""
+
+    def setup_method(self):
+        """Set up a two-level hierarchy: two regions over three leaves."""
+        leaves = pd.DataFrame({'region': ['East', 'East', 'West'], 'customer': ['a', 'b', 'c']})
+        self.S, self.node_ids, self.depths = summing_matrix(leaves)
+
+    def test_summing_matrix(self):
+        """Test node order and membership."""
+        assert self.node_ids == ['total', 'East', 'West', 'East|a', 'East|b', 'West|c']
+        assert self.depths == [0, 1, 1, 2, 2, 2]
+        np.testing.assert_array_equal(self.S.toarray(), [
+            [1, 1, 1], [1, 1, 0], [0, 0, 1], [1, 0, 0], [0, 1, 0], [0, 0, 1]
+        ])
+
+    @pytest.mark.parametrize('method', RECONCILIATION_METHODS)
+    def test_reconciled_forecasts_are_coherent(self, method):
+        """Test that every aggregate equals the sum of its leaves after reconciliation."""
+        base = np.array([[100.0, 90.0], [50.0, 40.0], [45.0, 60.0], [20.0, 25.0], [20.0, 10.0], [40.0, 50.0]])
+
+        reconciled = reconcile(base, self.S, method, variances=np.arange(1.0, 7.0))
+
+        np.testing.assert_allclose(self.S @ reconciled[3:], reconciled)
+
+    def test_coherent_forecasts_are_unchanged(self):
+        """Test that reconciliation is a projection: coherent input passes through."""
+        coherent = self.S @ np.array([[1.0], [2.0], [3.0]])
+
+        np.testing.assert_allclose(reconcile(coherent, self.S, 'mint', np.ones(6) * 3), coherent)
+
+    def test_rejects_unknown_method(self):
+        """Test invalid method handling."""
+        with pytest.raises(ValueError):
+            reconcile(np.zeros((6, 1)), self.S, 'top_down')
+
+
+class TestHierarchicalForecaster:
+    """Test cases for HierarchicalForecaster class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.forecaster = HierarchicalForecaster(config={'n_estimators': 20, 'max_depth': 3, 'random_state': 42})
+
+    def test_history_of_aggregates_sums_leaves(self, hierarchy_dataframe):
+        """Test that the monthly history of the root is the monthly total."""
+        history = self.forecaster.build(hierarchy_dataframe)
+        monthly = hierarchy_dataframe.groupby(hierarchy_dataframe['posting_date'].dt.to_period('M'))['quantity'].sum()
+
+        np.testing.assert_allclose(history[0], monthly.to_numpy())
+        assert history.shape == (1 + 2 + 2 + 6, 24)
+
+    def test_forecast_node(self, hierarchy_dataframe):
+        """Test a node forecast, its level and children."""
+        metrics = self.forecaster.fit(hierarchy_dataframe)
+        forecast = self.forecaster.forecast_node('East', periods=4, method='mint')
+
+        assert 'mae' in metrics['test']
+        assert len(forecast) == 4
+        assert forecast['date'].iloc[0] == pd.Timestamp('2024-01-01')
+        assert self.forecaster.level_of('East') == 'region'
+        assert self.forecaster.children('East') == ['East|FMCG']
+        assert len(self.forecaster.children('East|FMCG')) == 4
+        with pytest.raises(KeyError):
+            self.forecaster.forecast_node('North')
+
+    def test_save_and_load(self, hierarchy_dataframe, tmp_path):
+        """Test that a loaded model serves the same forecasts."""
+        self.forecaster.fit(hierarchy_dataframe)
+        path = str(tmp_path / 'hierarchical_model.pkl')
+        self.forecaster.save(path)
+
+        loaded = HierarchicalForecaster()
+        loaded.load(path)
+
+        np.testing.assert_allclose(loaded.forecasts('ols'), self.forecaster.forecasts('ols'))
+        assert loaded.version is not None
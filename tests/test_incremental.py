@@ -0,0 +1,97 @@
+"""Tests for incremental processing."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.incremental import IncrementalProcessor
+from src.data.processor import DataProcessor
+
+
+@pytest.fixture
+def raw_history():
+    """Raw multi-customer export in posting order, re-sending the latest row of the second batch."""
+    rng = np.random.default_rng(7)
+    n = 120
+    df = pd.DataFrame({
+        'POSTING DATE': np.sort(pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 300, n), unit='D')),
+        'Customer/Vendor Code': rng.integers(1, 8, n),
+        'ItemCode': rng.choice(['A01', 'B02'], n),
+        'QUANTITY': rng.integers(10, 400, n),
+        'RATE': rng.integers(1000, 2500, n)
+    })
+    return pd.concat([df, df.iloc[[99]]], ignore_index=True)
+
+
+def as_plain(df):
+    """Categoricals as objects, since a batch only sees its own categories."""
+    return df.astype({col: object for col in df.columns if df[col].dtype == 'category'})
+
+
+class TestIncrementalProcessor:
+    """Test cases for IncrementalProcessor class."""
+    
+    @pytest.mark.parametrize('entity_columns', [
+        ('customer/vendor_code',),
+        ('customer/vendor_code', 'itemcode')
+    ])
+    def test_update_matches_full_recompute(self, raw_history, entity_columns):
+        """Test that appended batches give the same rows as a full recompute."""
+        incremental = IncrementalProcessor(DataProcessor(entity_columns=entity_columns))
+        full = DataProcessor(entity_columns=entity_columns).process(raw_history.copy())
+        
+        parts = [incremental.fit(raw_history.iloc[:60].copy())]
+        parts.append(incremental.update(raw_history.iloc[60:100].copy()))
+        parts.append(incremental.update(raw_history.iloc[100:].copy()))
+        combined = pd.concat(parts)
+        
+        # Earlier batches were flagged with the statistics known at the time
+        pd.testing.assert_frame_equal(
+            as_plain(combined.drop(columns='volatility_flag')),
+            as_plain(full.drop(columns='volatility_flag'))
+        )
+        pd.testing.assert_frame_equal(as_plain(parts[-1]), as_plain(full.loc[parts[-1].index]))
+        
+        current = full['customer/vendor_code'].map(incremental.volatility_flags())
+        pd.testing.assert_series_equal(current, full['volatility_flag'], check_names=False)
+        
+    def test_duplicates_of_history_are_dropped(self, raw_history):
+        """Test that re-sent rows within the overlap window are not processed twice."""
+        incremental = IncrementalProcessor()
+        incremental.fit(raw_history.copy())
+        
+        result = incremental.update(raw_history.iloc[110:120].copy())
+        
+        assert result.empty
+        
+    def test_dedup_state_is_bounded(self, raw_history):
+        """Test that only recent row hashes are kept, and older re-sent rows raise."""
+        incremental = IncrementalProcessor(overlap='31D')
+        incremental.fit(raw_history.copy())
+        
+        dates = incremental.recent_rows['posting_date']
+        assert len(incremental.recent_rows) < len(raw_history) // 2
+        assert dates.min() < dates.max() - pd.Timedelta('31D')
+        with pytest.raises(ValueError):
+            incremental.update(raw_history.iloc[:10].copy())
+        
+    def test_out_of_order_rows_are_rejected(self, raw_history):
+        """Test that rows predating their entity's history raise."""
+        incremental = IncrementalProcessor()
+        incremental.fit(raw_history.iloc[60:].copy())
+        
+        with pytest.raises(ValueError):
+            incremental.update(raw_history.iloc[:60].copy())
+            
+    def test_state_round_trip(self, raw_history, tmp_path):
+        """Test that a saved state continues where it left off."""
+        incremental = IncrementalProcessor()
+        incremental.fit(raw_history.iloc[:80].copy())
+        incremental.save(tmp_path / 'state.pkl')
+        
+        restored = IncrementalProcessor()
+        restored.load(tmp_path / 'state.pkl')
+        
+        pd.testing.assert_frame_equal(
+            as_plain(restored.update(raw_history.iloc[80:].copy())),
+            as_plain(incremental.update(raw_history.iloc[80:].copy()))
+        )
+        pd.testing.assert_series_equal(restored.volatility_flags(), incremental.volatility_flags())
@@ -0,0 +1,62 @@
+"""Tests for the metrics module."""
+import pytest
+from src.monitoring.metrics import Counter, Gauge, Histogram, Metric, MetricsRegistry
+
+
+class TestMetrics:
+    """Test cases for metric types and text exposition."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.registry = MetricsRegistry()
+        
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counting, including values on a bucket bound."""
+        histogram = self.registry.register(Histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0)))
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value, route='/predict')
+            
+        text = self.registry.render()
+        
+        assert 'latency_seconds_bucket{route="/predict",le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{route="/predict",le="1.0"} 3' in text
+        assert 'latency_seconds_bucket{route="/predict",le="+Inf"} 4' in text
+        assert 'latency_seconds_sum{route="/predict"} 2.65' in text
+        assert 'latency_seconds_count{route="/predict"} 4' in text
+        assert '# TYPE latency_seconds histogram' in text
+        
+    def test_counter_and_gauge(self):
+        """Test counter increments and gauge tracking."""
+        counter = self.registry.register(Counter('calls_total', 'Calls.', ('backend',)))
+        gauge = self.registry.register(Gauge('in_flight', 'In flight.'))
+        counter.inc(backend='xgboost')
+        counter.inc(3, backend='xgboost')
+        
+        with gauge.track():
+            assert gauge.value() == 1
+            
+        assert counter.value(backend='xgboost') == 4
+        assert gauge.value() == 0
+        assert 'calls_total{backend="xgboost"} 4.0' in self.registry.render()
+        
+    def test_histogram_time_records_duration(self):
+        """Test the timing context manager, also when the block raises."""
+        histogram = Histogram('stage_seconds', 'Stage.', ('stage',))
+        
+        with pytest.raises(RuntimeError):
+            with histogram.time(stage='clean'):
+                raise RuntimeError
+                
+        assert histogram.count(stage='clean') == 1
+        
+    def test_duplicate_registration(self):
+        """Test that metric names are unique within a registry."""
+        self.registry.register(Counter('calls_total', 'Calls.'))
+        
+        with pytest.raises(ValueError):
+            self.registry.register(Counter('calls_total', 'Calls.'))
+            
+    def test_metric_requires_samples(self):
+        """Test that the base class cannot be used without a samples implementation."""
+        with pytest.raises(TypeError):
+            Metric('calls_total', 'Calls.')
@@ -0,0 +1,127 @@
+"""Tests for the model registry."""
+import os
+import pytest
+from src.api.registry import ModelRegistry
+
+
+class FakeModel:
+    """Stand-in forecaster recording the artifact it was loaded from."""
+    
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+
+
+class TestModelRegistry:
+    """Test cases for ModelRegistry class."""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Setup a model directory with a legacy and two versioned artifacts."""
+        self.model_dir = tmp_path
+        (tmp_path / 'xgboost').mkdir()
+        self.write('xgboost_model.pkl', mtime=100)
+        self.write('xgboost/v1.pkl', mtime=200)
+        self.write('xgboost/v2.pkl', mtime=300)
+        self.loads = []
+        self.now = 0.0
+        
+    def write(self, relative_path, mtime):
+        path = self.model_dir / relative_path
+        path.write_bytes(b'model')
+        os.utime(path, (mtime, mtime))
+        
+    def loader(self, name, path):
+        self.loads.append(path.name)
+        return FakeModel(name, path)
+        
+    def make_registry(self, **kwargs):
+        return ModelRegistry(
+            str(self.model_dir), loader=self.loader, clock=lambda: self.now, **kwargs
+        )
+        
+    def test_lists_versions_oldest_first(self):
+        """Test artifact discovery, including the flat legacy file."""
+        registry = self.make_registry()
+        
+        assert registry.available() == {'xgboost': ['default', 'v1', 'v2']}
+        
+    def test_loads_lazily_and_once(self):
+        """Test that models are loaded on first use only."""
+        registry = self.make_registry()
+        assert self.loads == []
+        
+        latest = registry.get()
+        
+        assert latest.path.name == 'v2.pkl'
+        assert registry.get() is latest
+        assert registry.get('xgboost', 'v2') is latest
+        assert registry.get(version='default').path.name == 'xgboost_model.pkl'
+        assert self.loads == ['v2.pkl', 'xgboost_model.pkl']
+        
+    def test_unknown_model_or_version(self):
+        """Test that missing artifacts raise LookupError."""
+        registry = self.make_registry()
+        
+        with pytest.raises(LookupError):
+            registry.get('prophet')
+        with pytest.raises(LookupError):
+            registry.get(version='v9')
+            
+    def test_evicts_least_recently_used_but_keeps_latest(self):
+        """Test LRU eviction of cold versions."""
+        registry = self.make_registry(max_loaded=2)
+        registry.get()
+        registry.get(version='v1')
+        
+        registry.get(version='default')
+        
+        assert registry.loaded() == ['xgboost:v2', 'xgboost:default']
+        
+    def test_hot_swaps_new_artifact(self):
+        """Test that a new artifact replaces the latest model after a rescan."""
+        registry = self.make_registry(refresh_interval=30)
+        previous = registry.get()
+        self.write('xgboost/v3.pkl', mtime=400)
+        
+        self.now = 10
+        assert registry.get() is previous
+        
+        self.now = 40
+        registry.refresh(block=True)
+        
+        assert registry.get().path.name == 'v3.pkl'
+        assert previous.path.name == 'v2.pkl'
+        assert registry.get(version='v2') is previous
+        
+    def test_prefers_native_artifact(self):
+        """Test that a version saved in both formats resolves to the native file."""
+        self.write('xgboost/v2.ubj', mtime=300)
+        self.write('xgboost/v2.manifest.json', mtime=300)
+        registry = self.make_registry()
+        
+        assert registry.available() == {'xgboost': ['default', 'v1', 'v2']}
+        assert registry.get().path.name == 'v2.ubj'
+        
+    def test_skips_native_artifact_without_manifest(self):
+        """Test that a native file is only registered once its manifest is written."""
+        self.write('xgboost/v3.ubj', mtime=400)
+        registry = self.make_registry()
+        
+        assert registry.available() == {'xgboost': ['default', 'v1', 'v2']}
+        
+        self.write('xgboost/v3.manifest.json', mtime=400)
+        self.now += 60
+        
+        assert registry.available() == {'xgboost': ['default', 'v1', 'v2', 'v3']}
+        
+    def test_eviction_drops_load_locks(self):
+        """Test that per-version load locks do not outlive their models."""
+        registry = self.make_registry(max_loaded=1)
+        registry.get()
+        
+        registry.get(version='v1')
+        registry.get(version='default')
+        
+        assert registry.loaded() == ['xgboost:v2']
+        assert set(registry._load_locks) == {('xgboost', 'v2')}
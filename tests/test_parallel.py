@@ -0,0 +1,54 @@
+"""Tests for partitioned multi-process processing."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.parallel import ParallelProcessor
+from src.data.processor import DataProcessor
+from src.data.synthetic import scale_export
+
+
+@pytest.fixture
+def raw_export():
+    """Raw export with duplicates, a missing key and a shuffled index."""
+    rng = np.random.default_rng(11)
+    n = 200
+    df = pd.DataFrame({
+        'POSTING DATE': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+        'Customer/Vendor Code': rng.integers(1, 15, n).astype(float),
+        'ItemCode': rng.choice(['A01', 'B02', 'C03'], n),
+        'Region': rng.choice(['East', 'West'], n),
+        'QUANTITY': rng.integers(10, 400, n),
+        'RATE': rng.integers(1000, 2500, n)
+    })
+    df.loc[3, 'Customer/Vendor Code'] = np.nan
+    df = pd.concat([df, df.iloc[[10, 20]]])
+    df.index = rng.permutation(len(df)) + 1000
+    return df
+
+
+class TestParallelProcessor:
+    """Test cases for ParallelProcessor class."""
+    
+    @pytest.mark.parametrize('options', [{}, {'compact': True}])
+    def test_matches_single_process(self, raw_export, options):
+        """Test that partitioned processing reproduces DataProcessor.process."""
+        expected = DataProcessor(**options).process(raw_export.copy())
+        
+        result = ParallelProcessor(DataProcessor(**options), n_workers=2).process(raw_export.copy())
+        
+        pd.testing.assert_frame_equal(result, expected)
+        
+    def test_falls_back_without_partition_key(self, raw_export):
+        """Test that data without the entity column is processed in-process."""
+        df = raw_export.drop(columns='Customer/Vendor Code')
+        
+        result = ParallelProcessor(n_workers=2).process(df.copy())
+        
+        pd.testing.assert_frame_equal(result, DataProcessor().process(df.copy()))
+        
+    def test_scale_export_multiplies_rows_and_customers(self, raw_export):
+        """Test the synthetic benchmark data generator."""
+        scaled = scale_export(raw_export, scale=3)
+        
+        assert len(scaled) == 3 * len(raw_export)
+        assert scaled['Customer/Vendor Code'].nunique() == 3 * raw_export['Customer/Vendor Code'].nunique()
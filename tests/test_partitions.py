@@ -0,0 +1,59 @@
+"""Tests for Parquet partitions and out-of-core training inputs."""
+import pytest
+import numpy as np
+from src.data.partitions import iter_batches, partition_paths, write_partitions
+from src.models.base import BaseForecaster
+from src.models.external import StreamingMetrics, iter_split, split_mask
+
+
+class TestPartitions:
+    """Test cases for writing and streaming partitions."""
+
+    def test_write_and_stream_batches(self, sample_dataframe, tmp_path):
+        """Test that files and batches are bounded and keep row order."""
+        paths = write_partitions(sample_dataframe, str(tmp_path), rows_per_file=40)
+
+        assert [path.name for path in paths] == ['part-00000.parquet', 'part-00001.parquet', 'part-00002.parquet']
+        assert partition_paths(str(tmp_path)) == paths
+
+        batches = list(iter_batches(paths, ['quantity', 'lag_1'], batch_size=16))
+        assert max(len(batch) for batch in batches) == 16
+        assert list(batches[0].columns) == ['quantity', 'lag_1']
+        np.testing.assert_array_equal(
+            np.concatenate([batch['quantity'].to_numpy() for batch in batches]),
+            sample_dataframe['quantity'].to_numpy()
+        )
+
+    def test_partition_paths_rejects_empty_directory(self, tmp_path):
+        """Test that an empty directory is an error, not an empty dataset."""
+        with pytest.raises(ValueError):
+            partition_paths(str(tmp_path))
+
+
+class TestStreamingSplit:
+    """Test cases for the per-batch split and streaming metrics."""
+
+    def test_split_is_deterministic(self, sample_dataframe, tmp_path):
+        """Test that every pass assigns the same rows to the test split."""
+        paths = write_partitions(sample_dataframe, str(tmp_path), rows_per_file=40)
+
+        first = [is_test for _, _, is_test in iter_split(paths, ['lag_1'], 0.25, 42, 16)]
+        second = [is_test for _, _, is_test in iter_split(paths, ['lag_1'], 0.25, 42, 16)]
+
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a, b)
+        assert not np.array_equal(split_mask(16, 0.5, 42, 0, 0), split_mask(16, 0.5, 42, 0, 1))
+
+    def test_streaming_metrics_match_calculate_metrics(self):
+        """Test that metrics accumulated over batches equal the in-memory ones."""
+        rng = np.random.default_rng(0)
+        y_true = rng.integers(0, 200, 1000).astype(np.float64)
+        y_pred = y_true + rng.normal(0, 10, 1000)
+
+        metrics = StreamingMetrics()
+        for start in range(0, 1000, 128):
+            metrics.update(y_true[start:start + 128], y_pred[start:start + 128])
+        expected = BaseForecaster.calculate_metrics(None, y_true, y_pred)
+
+        for name in ('mae', 'rmse', 'mape', 'r2'):
+            assert metrics.result()[name] == pytest.approx(expected[name])
@@ -0,0 +1,115 @@
+"""Tests for the pipeline stage cache."""
+import pytest
+import pandas as pd
+from src.data.cache import PipelineCache
+from src.data.processor import DataProcessor
+
+
+@pytest.fixture
+def raw_export():
+    """Small raw export with the original column names."""
+    return pd.DataFrame({
+        'POSTING DATE': pd.date_range('2024-01-01', periods=8, freq='W'),
+        'Customer/Vendor Code': [1, 2, 1, 2, 1, 2, 1, 2],
+        'QUANTITY': [100, 200, 120, 180, 90, 210, 110, 190],
+        'RATE': [10, 11, 10, 12, 10, 11, 10, 12],
+        'Region': ['East', 'North'] * 4,
+        'Comments': ['a', 1, 'b', 2, None, 'c', 3, 'd']
+    })
+
+
+class TestPipelineCache:
+    """Test cases for PipelineCache class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.processor = DataProcessor()
+        
+    def test_cached_process_matches_uncached(self, tmp_path, raw_export):
+        """Test that cold and warm cached runs reproduce the plain pipeline."""
+        cache = PipelineCache(tmp_path)
+        expected = self.processor.process(raw_export.copy())
+        
+        cold = self.processor.process(raw_export.copy(), cache=cache)
+        warm = self.processor.process(raw_export.copy(), cache=cache)
+        
+        pd.testing.assert_frame_equal(cold, expected)
+        pd.testing.assert_frame_equal(warm, expected)
+        
+    def test_warm_run_skips_stages(self, tmp_path, raw_export, monkeypatch):
+        """Test that no stage runs when every output is cached."""
+        cache = PipelineCache(tmp_path)
+        self.processor.process(raw_export.copy(), cache=cache)
+        
+        stored = []
+        monkeypatch.setattr(cache, 'store', lambda name, key, df: stored.append(name))
+        self.processor.process(raw_export.copy(), cache=cache)
+        
+        assert stored == []
+        
+    def test_changed_setting_reruns_stages(self, tmp_path, raw_export, monkeypatch):
+        """Test that processor settings are part of the cache key."""
+        cache = PipelineCache(tmp_path)
+        self.processor.process(raw_export.copy(), cache=cache)
+        
+        stored = []
+        monkeypatch.setattr(cache, 'store', lambda name, key, df: stored.append(name))
+        self.processor.some_setting = True
+        self.processor.process(raw_export.copy(), cache=cache)
+        
+        assert stored == ['clean', 'dtypes', 'features', 'volatility']
+        
+    def test_changed_input_misses(self, tmp_path, raw_export):
+        """Test that a different input is not served from the cache."""
+        cache = PipelineCache(tmp_path)
+        self.processor.process(raw_export.copy(), cache=cache)
+        
+        changed = raw_export.copy()
+        changed.loc[0, 'QUANTITY'] = 999
+        result = self.processor.process(changed, cache=cache)
+        
+        assert 999 in result['quantity'].to_numpy()
+        
+    def test_read_raw_reuses_file(self, tmp_path, raw_export):
+        """Test that a raw export is parsed once and then loaded from Parquet."""
+        cache = PipelineCache(tmp_path / 'cache')
+        path = tmp_path / 'export.csv'
+        raw_export.to_csv(path, index=False)
+        
+        first = cache.read_raw(str(path))
+        second = cache.read_raw(str(path))
+        
+        pd.testing.assert_frame_equal(first, second)
+        assert len(list((tmp_path / 'cache').glob('raw-*.parquet'))) == 1
+        
+    def test_code_version_follows_classes(self, monkeypatch):
+        """Test that editing a class a stage uses changes the stage's code version."""
+        import inspect
+        from src.data.volatility import StreamingMoments
+        before = PipelineCache.code_version(self.processor.add_volatility_flag)
+        
+        getsource = inspect.getsource
+        monkeypatch.setattr(inspect, 'getsource', lambda obj: getsource(obj) + ('#' if obj is StreamingMoments else ''))
+        
+        assert PipelineCache.code_version(self.processor.add_volatility_flag) != before
+        
+    def test_cold_and_warm_runs_agree_on_mixed_columns(self, tmp_path, raw_export):
+        """Test that a cold run returns mixed-type columns as they are stored."""
+        cache = PipelineCache(tmp_path)
+        raw_export['Warehouse'] = ['W1', 2, 'W3', 4, 'W1', 2, 'W3', 4]
+        
+        cold = self.processor.process(raw_export.copy(), cache=cache)
+        warm = self.processor.process(raw_export.copy(), cache=cache)
+        
+        pd.testing.assert_frame_equal(cold, warm)
+        
+    def test_warm_run_records_stage_durations(self, tmp_path, raw_export):
+        """Test that a reused stage output is still timed."""
+        from src.monitoring.metrics import STAGE_DURATION
+        cache = PipelineCache(tmp_path)
+        self.processor.process(raw_export.copy(), cache=cache)
+        before = STAGE_DURATION.count(stage='volatility_cached')
+        
+        self.processor.process(raw_export.copy(), cache=cache)
+        
+        assert STAGE_DURATION.count(stage='volatility_cached') == before + 1
@@ -0,0 +1,188 @@
+"""Tests for the per-series ARIMA and Prophet forecasters."""
+import os
+import subprocess
+import time
+import pytest
+import pandas as pd
+import numpy as np
+from src.models.arima_forecaster import ARIMAForecaster
+from src.models.prophet_forecaster import ProphetForecaster
+from src.models.statistical import StatisticalForecaster
+
+
+def slow_fit(values, config, start_params, periods):
+    """Fit function that never finishes in time."""
+    time.sleep(5)
+
+
+def spawning_fit(values, config, start_params, periods):
+    """Fit function that hangs in a child process, as Prophet does in cmdstan."""
+    child = subprocess.Popen(['sleep', '30'])
+    with open(os.path.join(config['pid_dir'], str(child.pid)), 'w'):
+        pass
+    child.wait()
+
+
+def process_alive(pid: int) -> bool:
+    """Whether a process exists and is not a zombie."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+class SpawningForecaster(StatisticalForecaster):
+    """Forecaster whose every fit hangs in a child process."""
+
+    @staticmethod
+    def default_config():
+        return {}
+
+    @staticmethod
+    def fit_function():
+        return spawning_fit
+
+
+class SlowForecaster(StatisticalForecaster):
+    """Forecaster whose every fit hangs."""
+
+    @staticmethod
+    def default_config():
+        return {}
+
+    @staticmethod
+    def fit_function():
+        return slow_fit
+
+
+class TestARIMAForecaster:
+    """Test cases for ARIMAForecaster class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.forecaster = ARIMAForecaster(n_jobs=1)
+
+    def test_build_starts_series_at_first_order(self, series_dataframe):
+        """Test the monthly history of each series."""
+        series = self.forecaster.build(series_dataframe)
+
+        assert list(series) == ['1000', '1001', '1002', '1003', '2000']
+        assert len(series['1000']) == 36
+        np.testing.assert_array_equal(series['2000'], [30.0, 50.0])
+
+    def test_fit_and_forecast(self, series_dataframe):
+        """Test metrics, fallback of short series, and forecasts."""
+        metrics = self.forecaster.fit(series_dataframe)
+        forecast = self.forecaster.forecast_series('1001', periods=3)
+
+        assert metrics['status'] == {'ok': 4, 'short': 1}
+        assert metrics['test']['mae'] < 30
+        assert forecast['date'].iloc[0] == pd.Timestamp('2024-01-01')
+        assert (forecast['predicted_quantity'] > 100).all()
+        np.testing.assert_allclose(self.forecaster.forecast_series('2000', 2)['predicted_quantity'], 40.0)
+        with pytest.raises(KeyError):
+            self.forecaster.forecast_series('9999')
+
+    def test_predict_by_series_and_date(self, series_dataframe):
+        """Test that predict reads the precomputed forecasts."""
+        self.forecaster.fit(series_dataframe)
+        rows = pd.DataFrame({
+            'customer/vendor_code': [1001, 1003],
+            'posting_date': pd.to_datetime(['2024-01-15', '2024-03-01'])
+        })
+
+        predictions = self.forecaster.predict(rows)
+
+        assert predictions[0] == self.forecaster.fits['1001'].forecast[0]
+        assert predictions[1] == self.forecaster.fits['1003'].forecast[2]
+        with pytest.raises(ValueError):
+            self.forecaster.predict(rows.assign(posting_date=pd.Timestamp('2023-06-01')))
+
+    def test_refit_reuses_unchanged_series(self, series_dataframe):
+        """Test that only series with new data are refitted, from their previous parameters."""
+        self.forecaster.fit(series_dataframe)
+        before = dict(self.forecaster.fits)
+        changed = series_dataframe.copy()
+        changed.loc[changed['customer/vendor_code'] == 1000, 'quantity'] += 1
+
+        self.forecaster.fit(changed)
+
+        assert self.forecaster.fits['1001'] is before['1001']
+        assert self.forecaster.fits['1000'] is not before['1000']
+
+    def test_refit_when_fit_parameters_change(self, series_dataframe):
+        """Test that fits are not reused under a different horizon or holdout."""
+        self.forecaster.fit(series_dataframe)
+        before = dict(self.forecaster.fits)
+
+        self.forecaster.fit(series_dataframe, test_size=0.3)
+        assert self.forecaster.fits['1001'] is not before['1001']
+
+        before = dict(self.forecaster.fits)
+        self.forecaster.max_periods = 6
+        self.forecaster.fit(series_dataframe, test_size=0.3)
+        assert self.forecaster.fits['1001'] is not before['1001']
+        assert len(self.forecaster.fits['1001'].forecast) == 6
+
+    def test_pool_matches_in_process_fit(self, series_dataframe):
+        """Test that fitting across worker processes gives the same forecasts."""
+        self.forecaster.fit(series_dataframe)
+        pooled = ARIMAForecaster(n_jobs=2)
+        pooled.fit(series_dataframe)
+
+        np.testing.assert_allclose(pooled.forecasts(), self.forecaster.forecasts())
+
+    def test_save_and_load(self, series_dataframe, tmp_path):
+        """Test that a loaded model serves the same forecasts."""
+        self.forecaster.fit(series_dataframe)
+        path = str(tmp_path / 'arima_model.pkl')
+        self.forecaster.save(path)
+
+        loaded = ARIMAForecaster()
+        loaded.load(path)
+
+        np.testing.assert_allclose(loaded.forecasts(), self.forecaster.forecasts())
+        assert loaded.version is not None
+
+
+class TestSeriesTimeout:
+    """Test cases for the per-series time limit."""
+
+    @pytest.mark.parametrize('n_jobs', [1, 2])
+    def test_hanging_series_fall_back(self, series_dataframe, n_jobs):
+        """Test that series exceeding the limit get the naive forecast instead of stalling the fit."""
+        forecaster = SlowForecaster(n_jobs=n_jobs, timeout=0.1)
+
+        start = time.perf_counter()
+        metrics = forecaster.fit(series_dataframe)
+
+        assert time.perf_counter() - start < 4
+        assert metrics['status'] == {'timeout': 4, 'short': 1}
+        assert np.isfinite(forecaster.forecasts()).all()
+
+    def test_timeout_stops_child_processes(self, series_dataframe, tmp_path):
+        """Test that processes started by a hung fit are killed with its worker."""
+        forecaster = SpawningForecaster(config={'pid_dir': str(tmp_path)}, n_jobs=2, timeout=0.5)
+
+        metrics = forecaster.fit(series_dataframe)
+        time.sleep(0.2)
+
+        assert metrics['status'] == {'timeout': 4, 'short': 1}
+        children = [int(path.name) for path in tmp_path.iterdir()]
+        assert children
+        assert not any(process_alive(pid) for pid in children)
+
+
+class TestProphetForecaster:
+    """Test cases for ProphetForecaster class."""
+
+    def test_fit_and_forecast(self, series_dataframe):
+        """Test a Prophet fit per series."""
+        pytest.importorskip('prophet')
+        forecaster = ProphetForecaster(n_jobs=1)
+
+        metrics = forecaster.fit(series_dataframe)
+
+        assert metrics['status']['ok'] == 4
+        assert len(forecaster.forecast_series('1001', periods=3)) == 3
@@ -0,0 +1,67 @@
+"""Tests for the compiled tree inference engine."""
+import pytest
+import pandas as pd
+import numpy as np
+from xgboost import XGBRegressor
+from src.models.tree_engine import CompiledTreeEnsemble
+from src.models.xgboost_forecaster import XGBoostForecaster
+
+
+class TestCompiledTreeEnsemble:
+    """Test cases for CompiledTreeEnsemble class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.forecaster = XGBoostForecaster()
+        
+    def test_matches_xgboost_predict(self, sample_dataframe, sample_prediction_data):
+        """Test parity with XGBRegressor.predict, including missing values."""
+        self.forecaster.fit(sample_dataframe)
+        engine = self.forecaster.compile()
+        
+        X = sample_prediction_data[self.forecaster.feature_columns].astype(float)
+        X.iloc[1, 2] = np.nan
+        
+        expected = self.forecaster.model.predict(X)
+        actual = engine.predict(X.to_numpy())
+        
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-3)
+        
+    def test_matches_xgboost_predict_on_training_rows(self, sample_dataframe):
+        """Test parity over a larger batch spanning several chunks."""
+        self.forecaster.fit(sample_dataframe)
+        engine = self.forecaster.compile()
+        engine.chunk_size = 16
+        
+        X = sample_dataframe[self.forecaster.feature_columns]
+        
+        np.testing.assert_allclose(
+            engine.predict(X.to_numpy()), self.forecaster.model.predict(X), rtol=1e-5, atol=1e-3
+        )
+        
+    def test_compiled_forecast_matches_booster_forecast(self, sample_dataframe):
+        """Test that forecast_future gives the same result on either backend."""
+        self.forecaster.fit(sample_dataframe)
+        last_known = pd.Series({'quantity': 120.0, 'posting_month': 11, 'rate': 12.5, 'u_frt': 510.0})
+        
+        expected = self.forecaster.forecast_future(last_known, periods=6)['predicted_quantity']
+        self.forecaster.compile()
+        actual = self.forecaster.forecast_future(last_known, periods=6)['predicted_quantity']
+        
+        np.testing.assert_allclose(actual, expected, rtol=1e-5)
+        
+    def test_rejects_wrong_feature_count(self, sample_dataframe):
+        """Test that inputs with the wrong width are rejected."""
+        self.forecaster.fit(sample_dataframe)
+        engine = self.forecaster.compile()
+        
+        with pytest.raises(ValueError):
+            engine.predict(np.zeros((2, 3)))
+            
+    def test_rejects_unsupported_objective(self, sample_dataframe):
+        """Test that non-identity objectives are refused."""
+        model = XGBRegressor(n_estimators=5, objective='reg:gamma')
+        model.fit(sample_dataframe[['lag_1', 'rate']], sample_dataframe['quantity'])
+        
+        with pytest.raises(ValueError):
+            CompiledTreeEnsemble.from_booster(model.get_booster())
@@ -0,0 +1,87 @@
+"""Tests for hyperparameter search."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.models import tuning
+from src.models.tuning import HyperparameterSearch
+
+
+@pytest.fixture
+def processed_data():
+    """Processed-style data with a learnable target."""
+    rng = np.random.default_rng(8)
+    n = 300
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    lag_1 = rng.uniform(50, 300, n)
+    return pd.DataFrame({
+        'posting_date': dates,
+        'quantity': lag_1 * 0.8 + rng.normal(0, 10, n),
+        'lag_1': lag_1,
+        'lag_2': rng.uniform(50, 300, n),
+        'rolling_mean_3': rng.uniform(50, 300, n),
+        'posting_month': dates.month,
+        'rate': rng.uniform(1000, 2000, n),
+        'u_frt': rng.uniform(0, 50, n),
+        'posting_quarter': dates.quarter,
+        'lead_time': rng.integers(0, 30, n)
+    })
+
+
+class TestHyperparameterSearch:
+    """Test cases for HyperparameterSearch class."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.options = {'n_trials': 6, 'min_estimators': 10, 'max_estimators': 40, 'early_stopping_rounds': 5}
+        
+    def test_random_search_picks_best_validation_mae(self, processed_data, tmp_path):
+        """Test that the best config comes from the lowest validation MAE."""
+        search = HyperparameterSearch(**self.options, n_workers=1, cache_dir=str(tmp_path))
+        
+        results = search.run(processed_data)
+        
+        assert len(results) == 6
+        assert results['mae'].is_monotonic_increasing
+        assert (results['best_n_estimators'] <= 40).all()
+        assert search.best_config['n_estimators'] == results.iloc[0]['best_n_estimators']
+        assert search.best_config['max_depth'] == results.iloc[0]['max_depth']
+        
+    def test_halving_narrows_candidates_per_rung(self, processed_data, tmp_path):
+        """Test successive-halving budgets and survivors."""
+        search = HyperparameterSearch(
+            **self.options, method='halving', reduction_factor=2, n_workers=1, cache_dir=str(tmp_path)
+        )
+        
+        results = search.run(processed_data)
+        
+        assert search.budgets() == [10, 20, 40]
+        assert results.groupby('rung').size().to_dict() == {0: 6, 1: 3, 2: 2}
+        assert set(results.loc[results['rung'] == 2, 'trial']) <= set(results.loc[results['rung'] == 1, 'trial'])
+        
+    def test_rerun_resumes_from_cache(self, processed_data, tmp_path, monkeypatch):
+        """Test that evaluated trials are not fitted again."""
+        first = HyperparameterSearch(**self.options, n_workers=1, cache_dir=str(tmp_path)).run(processed_data)
+        calls = []
+        evaluate = tuning._evaluate_trial
+        monkeypatch.setattr(tuning, '_evaluate_trial', lambda *args: calls.append(args) or evaluate(*args))
+        
+        second = HyperparameterSearch(**self.options, n_workers=1, cache_dir=str(tmp_path)).run(processed_data)
+        larger = HyperparameterSearch(**{**self.options, 'n_trials': 8}, n_workers=1, cache_dir=str(tmp_path))
+        larger.run(processed_data)
+        
+        pd.testing.assert_frame_equal(second, first)
+        assert len(calls) == 2
+        
+    def test_parallel_matches_serial(self, processed_data, tmp_path):
+        """Test that trials evaluated on a process pool give the same results."""
+        serial = HyperparameterSearch(**self.options, n_workers=1, cache_dir=None).run(processed_data)
+        
+        parallel = HyperparameterSearch(**self.options, n_workers=2, cache_dir=str(tmp_path)).run(processed_data)
+        
+        pd.testing.assert_frame_equal(parallel, serial)
+        assert len(list(tmp_path.glob('trial-*.json'))) == 6
+        
+    def test_invalid_method(self):
+        """Test that unknown search methods are rejected."""
+        with pytest.raises(ValueError):
+            HyperparameterSearch(method='grid')
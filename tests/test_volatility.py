@@ -0,0 +1,73 @@
+"""Tests for streaming volatility aggregation."""
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.volatility import StreamingMoments
+from src.data.processor import DataProcessor
+
+
+@pytest.fixture
+def quantities():
+    """Quantities for a handful of customers, one with a single row."""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'customer/vendor_code': rng.integers(0, 10, 400),
+        'quantity': rng.gamma(2.0, 50.0, 400)
+    })
+    df.loc[0, 'customer/vendor_code'] = 99
+    return df
+
+
+class TestStreamingMoments:
+    """Test cases for StreamingMoments class."""
+    
+    @pytest.mark.parametrize('chunk_size', [1, 37, 400])
+    def test_chunked_moments_match_groupby(self, quantities, chunk_size):
+        """Test that any chunking reproduces groupby mean/std."""
+        moments = StreamingMoments()
+        for start in range(0, len(quantities), chunk_size):
+            chunk = quantities.iloc[start:start + chunk_size]
+            moments.update(chunk['customer/vendor_code'], chunk['quantity'])
+        
+        expected = quantities.groupby('customer/vendor_code')['quantity'].agg(['mean', 'std'])
+        
+        np.testing.assert_allclose(moments.state['mean'].sort_index(), expected['mean'])
+        np.testing.assert_allclose(moments.std().sort_index(), expected['std'])
+        
+    def test_flags_count_exceeded_thresholds(self):
+        """Test multi-threshold volatility levels."""
+        moments = StreamingMoments().update(
+            pd.Series(['a', 'a', 'b', 'b', 'c']),
+            pd.Series([100.0, 100.0, 10.0, 190.0, 5.0])
+        )
+        
+        flags = moments.flags(thresholds=(0.5, 1.0))
+        
+        assert flags.to_dict() == {'a': 0, 'b': 2, 'c': 0}
+        
+    def test_missing_keys_are_skipped(self):
+        """Test that rows without a key are ignored."""
+        moments = StreamingMoments().update(pd.Series([1.0, np.nan, 1.0]), pd.Series([10.0, 99.0, 30.0]))
+        
+        assert moments.state['count'].to_dict() == {1.0: 2.0}
+
+
+class TestVolatilityFlag:
+    """Test cases for DataProcessor.add_volatility_flag."""
+    
+    def test_flag_matches_groupby_and_keeps_row_order(self, quantities):
+        """Test that flags equal the groupby definition without reordering rows."""
+        df = quantities.sample(frac=1, random_state=0)
+        
+        result = DataProcessor().add_volatility_flag(df.copy())
+        
+        stats = df.groupby('customer/vendor_code')['quantity'].agg(['mean', 'std'])
+        expected = df['customer/vendor_code'].map((stats['std'] / stats['mean'] > 0.5).astype(int))
+        assert result.index.equals(df.index)
+        pd.testing.assert_series_equal(result['volatility_flag'], expected, check_names=False)
+        
+    def test_thresholds_are_configurable(self, quantities):
+        """Test that a high threshold flags nobody."""
+        result = DataProcessor(volatility_thresholds=(10.0,)).add_volatility_flag(quantities.copy())
+        
+        assert (result['volatility_flag'] == 0).all()
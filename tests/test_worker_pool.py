@@ -0,0 +1,75 @@
+"""Tests for the bounded inference pool."""
+import asyncio
+import threading
+import pytest
+from src.api.executor import PoolFullError, WorkerPool, WorkTimeoutError
+
+
+class TestWorkerPool:
+    """Test cases for WorkerPool class."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.release = threading.Event()
+        
+    def blocked(self):
+        self.release.wait(5)
+        return 'done'
+        
+    def test_runs_work_off_the_event_loop(self):
+        """Test that results come back from a pool thread."""
+        pool = WorkerPool(max_workers=2, max_queue=0)
+        
+        result = asyncio.run(pool.run(threading.current_thread))
+        
+        assert result is not threading.main_thread()
+        assert pool.pending == 0
+        
+    def test_rejects_when_queue_is_full(self):
+        """Test backpressure once running plus queued work reaches the limit."""
+        pool = WorkerPool(max_workers=1, max_queue=1)
+        
+        async def scenario():
+            running = asyncio.ensure_future(pool.run(self.blocked))
+            queued = asyncio.ensure_future(pool.run(self.blocked))
+            await asyncio.sleep(0.05)
+            with pytest.raises(PoolFullError):
+                await pool.run(self.blocked)
+            self.release.set()
+            return await asyncio.gather(running, queued)
+            
+        assert asyncio.run(scenario()) == ['done', 'done']
+        assert pool.pending == 0
+        
+    def test_timeout_keeps_slot_until_work_finishes(self):
+        """Test that timed-out running work still counts against the limit."""
+        pool = WorkerPool(max_workers=1, max_queue=0, timeout=0.05)
+        
+        async def scenario():
+            with pytest.raises(WorkTimeoutError):
+                await pool.run(self.blocked)
+            assert pool.pending == 1
+            with pytest.raises(PoolFullError):
+                await pool.run(self.blocked)
+            self.release.set()
+            await asyncio.sleep(0.05)
+            
+        asyncio.run(scenario())
+        assert pool.pending == 0
+        
+    def test_timeout_cancels_queued_work(self):
+        """Test that work timing out before it starts never runs."""
+        pool = WorkerPool(max_workers=1, max_queue=1)
+        calls = []
+        
+        async def scenario():
+            running = asyncio.ensure_future(pool.run(self.blocked))
+            await asyncio.sleep(0.05)
+            with pytest.raises(WorkTimeoutError):
+                await pool.run(lambda: calls.append(1), timeout=0.05)
+            assert pool.pending == 1
+            self.release.set()
+            await running
+            
+        asyncio.run(scenario())
+        assert calls == []
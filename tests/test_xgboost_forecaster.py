@@ -1,10 +1,50 @@
 """Tests for XGBoost forecaster module."""
+import time
 import pytest
 import pandas as pd
 import numpy as np
+from xgboost import XGBRegressor
+from src.data.partitions import write_partitions
 from src.models.xgboost_forecaster import XGBoostForecaster
 
 
+def pandas_forecast_reference(forecaster, last_known_data, periods):
+    """Original DataFrame-per-step recursion, kept as the parity/speed baseline."""
+    predictions = []
+    current_data = last_known_data.copy()
+    
+    for i in range(periods):
+        input_features = pd.DataFrame({
+            'lag_1': [current_data['quantity']],
+            'lag_2': [current_data.get('lag_1', current_data['quantity'])],
+            'rolling_mean_3': [current_data['quantity']],
+            'posting_month': [(current_data['posting_month'] % 12) + 1],
+            'rate': [current_data.get('rate', 0)],
+            'u_frt': [current_data.get('u_frt', 0)],
+            'posting_quarter': [((current_data['posting_month'] % 12) // 3) + 1],
+            'lead_time': [current_data.get('lead_time', 7)]
+        })
+        pred = forecaster.model.predict(input_features)[0]
+        predictions.append(pred)
+        
+        current_data['lag_2'] = current_data.get('lag_1', current_data['quantity'])
+        current_data['lag_1'] = current_data['quantity']
+        current_data['quantity'] = pred
+        current_data['posting_month'] = (current_data['posting_month'] % 12) + 1
+    
+    return np.array(predictions)
+
+
+def best_time(func, repeats=5):
+    """Best wall-clock time of several runs, to damp scheduler noise."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
 class TestXGBoostForecaster:
     """Test cases for XGBoostForecaster class."""
     
@@ -101,3 +141,249 @@ class TestXGBoostForecaster:
         
         assert len(predictions) == 2
         assert all(predictions >= 0)
+        
+    def test_forecast_future_batch_matches_single_series(self, sample_dataframe):
+        """Test that batch forecasting matches per-series forecasting."""
+        self.forecaster.fit(sample_dataframe)
+        
+        last_known = pd.DataFrame({
+            'quantity': [100.0, 150.0, 80.0],
+            'lag_1': [90.0, 140.0, 85.0],
+            'posting_month': [5, 12, 1],
+            'rate': [12.5, 13.0, 11.0],
+            'u_frt': [500.0, 520.0, 480.0]
+        })
+        
+        batch = self.forecaster.forecast_future_batch(last_known, periods=4)
+        
+        assert len(batch) == 12
+        for series, row in last_known.iterrows():
+            single = self.forecaster.forecast_future(row, periods=4)
+            expected = single['predicted_quantity'].to_numpy()
+            actual = batch.loc[batch['series'] == series, 'predicted_quantity'].to_numpy()
+            np.testing.assert_allclose(actual, expected, rtol=1e-6)
+        
+    def test_forecast_future_matches_pandas_reference(self, sample_dataframe):
+        """Test that the NumPy recursion reproduces the pandas recursion."""
+        self.forecaster.fit(sample_dataframe)
+        
+        for month in [1, 3, 11, 12]:
+            last_known = pd.Series({
+                'quantity': 120.0,
+                'lag_1': 95.0,
+                'posting_month': month,
+                'rate': 12.5,
+                'u_frt': 510.0
+            })
+            
+            forecast = self.forecaster.forecast_future(last_known, periods=12)
+            expected = pandas_forecast_reference(self.forecaster, last_known, periods=12)
+            
+            np.testing.assert_array_equal(forecast['predicted_quantity'].to_numpy(), expected)
+            
+    def test_forecast_future_requires_trained_model(self):
+        """Test that forecasting before training raises a clear error."""
+        last_known = pd.Series({'quantity': 100.0, 'posting_month': 5})
+        
+        with pytest.raises(ValueError):
+            self.forecaster.forecast_future(last_known, periods=3)
+            
+    def test_forecast_future_is_faster_than_pandas_reference(self, sample_dataframe):
+        """Micro-benchmark guarding the speedup of the NumPy recursion."""
+        self.forecaster.fit(sample_dataframe)
+        last_known = pd.Series({
+            'quantity': 120.0,
+            'lag_1': 95.0,
+            'posting_month': 5,
+            'rate': 12.5,
+            'u_frt': 510.0
+        })
+        
+        fast = best_time(lambda: self.forecaster.forecast_future(last_known, periods=12))
+        slow = best_time(lambda: pandas_forecast_reference(self.forecaster, last_known, periods=12))
+        
+        assert fast * 2 < slow
+        
+    def test_native_format_round_trip(self, sample_dataframe, tmp_path):
+        """Test that the UBJSON + manifest format reproduces the model."""
+        metrics = self.forecaster.fit(sample_dataframe)
+        path = tmp_path / 'model.ubj'
+        
+        self.forecaster.save(str(path))
+        loaded = XGBoostForecaster()
+        loaded.load(str(path))
+        
+        np.testing.assert_array_equal(loaded.predict(sample_dataframe), self.forecaster.predict(sample_dataframe))
+        assert loaded.feature_columns == self.forecaster.feature_columns
+        assert loaded.config == self.forecaster.config
+        assert loaded.version == self.forecaster.version
+        assert loaded.data_hash == self.forecaster.data_hash
+        assert loaded.metrics['test']['mae'] == pytest.approx(metrics['test']['mae'])
+        
+    def test_native_format_rejects_modified_booster(self, sample_dataframe, tmp_path):
+        """Test that a booster file not matching its manifest is refused."""
+        self.forecaster.fit(sample_dataframe)
+        path = tmp_path / 'model.ubj'
+        self.forecaster.save(str(path))
+        other = XGBoostForecaster(config={'n_estimators': 5, 'random_state': 1})
+        other.fit(sample_dataframe)
+        path.write_bytes(other.model.get_booster().save_raw(raw_format='ubj'))
+        
+        with pytest.raises(ValueError):
+            XGBoostForecaster().load(str(path))
+
+    def test_fit_partitions_matches_in_memory_training(self, sample_dataframe, tmp_path):
+        """Test that streamed training grows the same trees as an in-memory fit."""
+        write_partitions(sample_dataframe, str(tmp_path))
+
+        self.forecaster.fit_partitions(str(tmp_path), test_size=0.0)
+        reference = XGBRegressor(**self.forecaster.config)
+        reference.fit(sample_dataframe[self.forecaster.feature_columns], sample_dataframe['quantity'])
+
+        np.testing.assert_allclose(
+            self.forecaster.predict(sample_dataframe),
+            reference.predict(sample_dataframe[self.forecaster.feature_columns]),
+            rtol=1e-6
+        )
+
+    def test_fit_partitions_external_memory(self, sample_dataframe, tmp_path):
+        """Test external memory training from several partitions."""
+        write_partitions(sample_dataframe, str(tmp_path / 'data'), rows_per_file=30)
+
+        metrics = self.forecaster.fit_partitions(
+            str(tmp_path / 'data'), batch_size=16, external_memory=True, cache_dir=str(tmp_path / 'cache')
+        )
+
+        assert metrics['test']['mae'] > 0
+        assert self.forecaster.data_hash is not None
+        assert len(self.forecaster.predict(sample_dataframe)) == len(sample_dataframe)
+
+    def test_fit_quantiles(self, sample_dataframe):
+        """Test quantile training metrics."""
+        self.forecaster.fit(sample_dataframe)
+
+        metrics = self.forecaster.fit_quantiles(sample_dataframe)
+
+        assert self.forecaster.quantiles == (0.1, 0.5, 0.9)
+        assert set(metrics['pinball']) == {'p10', 'p50', 'p90'}
+        assert 0 <= metrics['coverage'] <= 1
+        assert metrics['mean_width'] > 0
+        with pytest.raises(ValueError):
+            self.forecaster.fit_quantiles(sample_dataframe, quantiles=(0.5, 1.5))
+
+    def test_fit_quantiles_uses_point_model_features(self, sample_dataframe):
+        """Test that the quantile model is trained on the point model's columns, not the new frame's."""
+        with pytest.raises(ValueError):
+            self.forecaster.fit_quantiles(sample_dataframe)
+        self.forecaster.fit(sample_dataframe.drop(columns=['lead_time']))
+        columns = list(self.forecaster.feature_columns)
+
+        self.forecaster.fit_quantiles(sample_dataframe)
+
+        assert self.forecaster.feature_columns == columns
+        assert self.forecaster.quantile_model.get_booster().num_features() == len(columns)
+        with pytest.raises(ValueError):
+            self.forecaster.fit_quantiles(sample_dataframe.drop(columns=['rate']))
+
+    def test_forecast_quantiles_in_one_call_per_step(self, sample_dataframe, monkeypatch):
+        """Test that all quantiles come from one batched call per step, beside an unchanged point forecast."""
+        self.forecaster.fit(sample_dataframe)
+        self.forecaster.fit_quantiles(sample_dataframe)
+        last_known = sample_dataframe.iloc[:5][['quantity', 'lag_1', 'posting_month', 'rate', 'u_frt']]
+        point = self.forecaster.forecast_future_batch(last_known, periods=4)
+
+        calls = []
+        predict_raw = self.forecaster._predict_raw
+        monkeypatch.setattr(self.forecaster, '_predict_raw', lambda X, booster=None, **kwargs: calls.append(len(X)) or predict_raw(X, booster, **kwargs))
+        forecast = self.forecaster.forecast_future_batch(last_known, periods=4, quantiles=True)
+
+        assert calls == [5] * 8
+        np.testing.assert_array_equal(forecast['predicted_quantity'], point['predicted_quantity'])
+        assert (forecast['p10'] <= forecast['p50']).all() and (forecast['p50'] <= forecast['p90']).all()
+
+    def test_forecast_quantiles_requires_quantile_model(self, sample_dataframe):
+        """Test that quantiles before fit_quantiles raise a clear error."""
+        self.forecaster.fit(sample_dataframe)
+
+        with pytest.raises(ValueError):
+            self.forecaster.forecast_future(sample_dataframe.iloc[0], periods=2, quantiles=True)
+
+    def test_native_format_round_trip_with_quantiles(self, sample_dataframe, tmp_path):
+        """Test that the quantile booster is saved and verified beside the point booster."""
+        self.forecaster.fit(sample_dataframe)
+        self.forecaster.fit_quantiles(sample_dataframe, quantiles=(0.05, 0.95))
+        path = str(tmp_path / 'model.ubj')
+        self.forecaster.save(path)
+
+        loaded = XGBoostForecaster()
+        loaded.load(path)
+        last_known = sample_dataframe.iloc[0]
+
+        assert loaded.quantiles == (0.05, 0.95)
+        columns = ['predicted_quantity', 'p5', 'p95']
+        pd.testing.assert_frame_equal(
+            loaded.forecast_future(last_known, periods=3, quantiles=True)[columns],
+            self.forecaster.forecast_future(last_known, periods=3, quantiles=True)[columns]
+        )
+
+    def test_direct_forecast_in_one_call(self, sample_dataframe, monkeypatch):
+        """Test that the direct strategy returns every step from a single booster call."""
+        self.forecaster.fit(sample_dataframe)
+        metrics = self.forecaster.fit_direct(sample_dataframe, periods=3)
+
+        assert [h['horizon'] for h in metrics['horizons']] == [1, 2, 3]
+        assert metrics['test']['mae'] >= 0
+
+        calls = []
+        inplace_predict = self.forecaster.direct_booster.inplace_predict
+        monkeypatch.setattr(self.forecaster.direct_booster, 'inplace_predict',
+                            lambda X, **kwargs: calls.append(len(X)) or inplace_predict(X, **kwargs))
+        last_known = sample_dataframe.iloc[:5][['quantity', 'lag_1', 'posting_month', 'rate', 'u_frt']]
+        forecast = self.forecaster.forecast_future_batch(last_known, periods=2, strategy='direct')
+
+        assert calls == [5]
+        assert len(forecast) == 10
+        single = self.forecaster.forecast_future(last_known.iloc[1], periods=2, strategy='direct')
+        np.testing.assert_allclose(single['predicted_quantity'], forecast['predicted_quantity'][2:4], rtol=1e-6)
+
+    def test_fit_direct_needs_months_of_history(self, sample_dataframe):
+        """Test that horizons past the months in the data cannot be trained."""
+        self.forecaster.fit(sample_dataframe)
+
+        with pytest.raises(ValueError):
+            self.forecaster.fit_direct(sample_dataframe, periods=4)
+        with pytest.raises(ValueError):
+            self.forecaster.fit_direct(sample_dataframe.drop(columns=['posting_date']), periods=2)
+
+    def test_direct_forecast_rejects_invalid_requests(self, sample_dataframe):
+        """Test the errors for a missing direct model, a long horizon, and quantiles."""
+        self.forecaster.fit(sample_dataframe)
+        last_known = sample_dataframe.iloc[0]
+
+        with pytest.raises(ValueError):
+            self.forecaster.forecast_future(last_known, periods=2, strategy='direct')
+        self.forecaster.fit_direct(sample_dataframe, periods=3)
+        with pytest.raises(ValueError):
+            self.forecaster.forecast_future(last_known, periods=4, strategy='direct')
+        with pytest.raises(ValueError):
+            self.forecaster.forecast_future(last_known, periods=2, strategy='sideways')
+        self.forecaster.fit_quantiles(sample_dataframe)
+        with pytest.raises(ValueError):
+            self.forecaster.forecast_future(last_known, periods=2, quantiles=True, strategy='direct')
+
+    def test_native_format_round_trip_with_direct(self, sample_dataframe, tmp_path):
+        """Test that the direct booster is saved and verified beside the point booster."""
+        self.forecaster.fit(sample_dataframe)
+        self.forecaster.fit_direct(sample_dataframe, periods=3)
+        path = str(tmp_path / 'model.ubj')
+        self.forecaster.save(path)
+
+        loaded = XGBoostForecaster()
+        loaded.load(path)
+        last_known = sample_dataframe.iloc[0]
+
+        assert loaded.direct_periods == 3
+        np.testing.assert_array_equal(
+            loaded.forecast_future(last_known, periods=3, strategy='direct')['predicted_quantity'],
+            self.forecaster.forecast_future(last_known, periods=3, strategy='direct')['predicted_quantity']
+        )